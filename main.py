@@ -12,25 +12,38 @@ load_dotenv(BASE_DIR / ".env")
 
 # Import pipelines
 from src.pipeline_geo import geo
-from src.grid import make_predata_and_meta_csv
+from src.grid import CELL_SIZE_M, make_predata_and_meta_csv
 from src.make_features import make_features
+from src.feature_store import STORE_DIR
 from src.train_rf import train_rf
 from src.predict_rf import predict_rf
 from src.reverse_geocode_top10 import reverse_geocode_top10
 from src.viz_grid_map import make_grid_heatmap_html, make_grid_error_heatmap_html
+from src.storage import read_table
+from src.cellkey import CELL_COL, with_cell
+from src.dag import Stage, run_dag
+from src.boundary import SEOUL_BOUNDARY, SEOUL_BUFFER_M
+from src.event_cube import CUBE_PATH, ROLLUPS, make_event_cube, rollup_path
+
+
+MONTHS = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11)
+REAL_CSV = "data/predata_12.csv"
+PRED_CSV = "data/pred_12.csv"
+GRID_KIND = "square"   # "hex" for axial hexagon cells
 
 
 # Evaluate prediction error (MAE / RMSE)
 def error_check(
-    real_csv="data/predata_12.csv",
-    pred_csv="data/pred_12.csv",
+    real_csv=REAL_CSV,
+    pred_csv=PRED_CSV,
 ):
     print("\n=== ERROR CHECK (MAE / RMSE) ===")
 
-    df_real = pd.read_csv(real_csv)[["grid_id", "count"]].rename(columns={"count": "real"})
-    df_pred = pd.read_csv(pred_csv)[["grid_id", "count"]].rename(columns={"count": "pred"})
+    df_real = read_table(real_csv, columns=["grid_id", "count"]).rename(columns={"count": "real"})
+    df_pred = read_table(pred_csv, columns=["grid_id", "count"]).rename(columns={"count": "pred"})
 
-    df = df_real.merge(df_pred, on="grid_id", how="inner")
+    # Join on packed cell keys instead of grid_id strings
+    df = with_cell(df_real).merge(with_cell(df_pred).drop(columns="grid_id"), on=CELL_COL, how="inner")
     df = df.dropna(subset=["real", "pred"])
 
     y_true = df["real"].values
@@ -63,7 +76,7 @@ def grid_pipeline():
 # Run training and prediction pipeline
 def ml_pipeline():
     print("\n=== ML PIPELINE ===")
-    make_features()
+    make_features(store_dir=STORE_DIR)
     train_rf()
     predict_rf()
 
@@ -73,17 +86,17 @@ def map_pipeline():
     print("\n=== MAP PIPELINE ===")
 
     # Render monthly actual maps
-    for m in [1,2,3,4,5,6,7, 8, 9, 10, 11]:
+    for m in MONTHS:
         make_grid_heatmap_html(
             month=m,
             out_html=f"map/grid_heatmap_200m_{m}.html",
         )
 
-    real_csv = "data/predata_12.csv"
-    pred_csv = "data/pred_12.csv"
+    real_csv = REAL_CSV
+    pred_csv = PRED_CSV
 
-    df_real = pd.read_csv(real_csv)[["grid_id", "count"]].rename(columns={"count": "real"})
-    df_pred = pd.read_csv(pred_csv)[["grid_id", "count"]].rename(columns={"count": "pred"})
+    df_real = read_table(real_csv, columns=["grid_id", "count"]).rename(columns={"count": "real"})
+    df_pred = read_table(pred_csv, columns=["grid_id", "count"]).rename(columns={"count": "pred"})
 
     combined = pd.concat([df_real["real"], df_pred["pred"]], axis=0).dropna()
     scale_vmin = float(combined.min())
@@ -128,6 +141,50 @@ def analysis_pipeline():
     reverse_geocode_top10()
 
 
+# HTML files written by map_pipeline
+def map_outputs():
+    monthly = [f"map/grid_heatmap_200m_{m}.html" for m in MONTHS]
+    return monthly + ["map/real_12.html", "map/pred_12.html", "map/error_12.html"]
+
+
+# Pipeline stages with their inputs / outputs / parameters
+def build_dag():
+    raw = [f"original_data/{m}.csv" for m in MONTHS]
+    after, predata, meta = "data/after.parquet", "data/predata.parquet", "data/grid_meta.parquet"
+    features, model = "data/features.parquet", "model_rf.pkl"
+    grid_env = {"CELL_SIZE_M": CELL_SIZE_M}
+
+    return [
+        Stage("geo", geo, inputs=raw, outputs=[after],
+              params={"months": MONTHS, "out_path": after}),
+        Stage("grid", make_predata_and_meta_csv, inputs=[after], outputs=[predata, meta],
+              params={"input_csv": after, "predata_csv": predata, "meta_csv": meta, "kind": GRID_KIND},
+              env={**grid_env, "SEOUL_BOUNDARY": SEOUL_BOUNDARY, "SEOUL_BUFFER_M": SEOUL_BUFFER_M}),
+        # Falls back to the raw month files when `after` predates 신고일/구정보/유형
+        Stage("cube", make_event_cube, inputs=[after, *raw], outputs=[CUBE_PATH, *(rollup_path(CUBE_PATH, f) for f in ROLLUPS)],
+              params={"input_path": after, "cube_path": CUBE_PATH, "raw_dir": "original_data", "months": MONTHS,
+                      "kind": GRID_KIND},
+              env={**grid_env, "SEOUL_BOUNDARY": SEOUL_BOUNDARY, "SEOUL_BUFFER_M": SEOUL_BUFFER_M}),
+        Stage("features", make_features, inputs=[predata], outputs=[features],
+              params={"in_path": predata, "out_path": features, "store_dir": STORE_DIR}),
+        Stage("train", train_rf, inputs=[features], outputs=[model],
+              params={"data_path": features, "model_path": model}),
+        Stage("predict", predict_rf, inputs=[features, model], outputs=[PRED_CSV],
+              params={"data_path": features, "model_path": model, "out_path": PRED_CSV}),
+        Stage("analysis", reverse_geocode_top10, inputs=[PRED_CSV, meta], outputs=["data/top10_with_address.csv"],
+              params={"pred_path": PRED_CSV, "meta_path": meta, "out_path": "data/top10_with_address.csv"},
+              env=grid_env),
+        Stage("maps", map_pipeline, inputs=[predata, meta, REAL_CSV, PRED_CSV], outputs=map_outputs(),
+              env=grid_env),
+        Stage("error", error_check, inputs=[REAL_CSV, PRED_CSV]),
+    ]
+
+
+# Run all stages; unchanged stages are skipped
+def all_pipeline(force=()):
+    run_dag(build_dag(), force=force)
+
+
 # CLI entry point
 if __name__ == "__main__":
 
@@ -169,12 +226,7 @@ if __name__ == "__main__":
             error_check()
             command = printing()
         elif command == "7":
-            geo_pipeline()
-            grid_pipeline()
-            ml_pipeline()
-            analysis_pipeline()
-            map_pipeline()
-            error_check()
+            all_pipeline()
             command = printing()
         else:
             print("please enter the right number of the command")
@@ -0,0 +1,448 @@
+# src/bench.py
+from __future__ import annotations
+
+import argparse
+import inspect
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from src.io_loader import load_months
+from src.preprocess import clean_address, clean_address_series
+
+
+# Best-of-N wall time
+def _timeit(fn: Callable, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _report(name: str, rows: int, sec: float, base: float | None = None):
+    speed = f" | x{base / sec:.1f}" if base else ""
+    print(f"  {name:<28} {sec * 1000:9.1f} ms  {rows / sec:12,.0f} rows/s{speed}")
+
+
+# Original per-row normalizer (baseline)
+def _clean_address_legacy(addr) -> str:
+    if pd.isna(addr):
+        return ""
+    addr = str(addr).strip()
+    addr = re.sub(r"\(.*?\)", "", addr)
+    addr = re.sub(r"\s+", " ", addr)
+    return addr.strip()
+
+
+# 1) Address normalization
+def bench_clean_address(input_dir: str = "original_data", scale: int = 1, repeat: int = 3):
+    s = load_months(input_dir, months=tuple(range(1, 13)), usecols=["주소"], verbose=False)["주소"]
+    if scale > 1:
+        s = pd.concat([s] * scale, ignore_index=True)
+
+    print(f"[BENCH] clean_address rows={len(s)} unique={s.nunique()}")
+    base = _timeit(lambda: s.apply(_clean_address_legacy), repeat)
+    _report("apply(legacy clean_address)", len(s), base)
+    _report("apply(clean_address)", len(s), _timeit(lambda: s.apply(clean_address), repeat), base)
+    _report("clean_address_series", len(s), _timeit(lambda: clean_address_series(s), repeat), base)
+
+    old_keys = s.apply(_clean_address_legacy).nunique()
+    new_keys = clean_address_series(s).nunique()
+    print(f"  unique keys: legacy={old_keys} canonical={new_keys} (-{old_keys - new_keys})")
+
+
+# 2) End-to-end geo() against the local mock server
+def bench_geo_mock(
+    input_dir: str = "original_data",
+    months=(1,),
+    engine: str = "concurrent",
+    workers: int = 32,
+    rps: float = 400.0,
+    latency_ms: float = 30.0,
+    error_rate: float = 0.0,
+    rps_limit: float = 0.0,
+):
+    from src.mock_geocode_server import mock_env, start_mock_server
+    from src.pipeline_geo import geo
+
+    # Addresses geo() resolves: unique cleaned addresses (server hit counts miss retried failures)
+    raw = load_months(input_dir, tuple(months), usecols=["주소"], verbose=False)["주소"]
+    n_addr = len(clean_address_series(raw).unique())
+
+    server, base = start_mock_server(latency_ms=latency_ms, error_rate=error_rate, rps_limit=rps_limit)
+    saved = {k: os.environ.get(k) for k in mock_env(base)}
+    os.environ.update(mock_env(base))
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = str(Path(tmp) / "bench_cache.sqlite")
+            t0 = time.perf_counter()
+            geo(
+                input_dir=input_dir,
+                months=tuple(months),
+                out_path=str(Path(tmp) / "after.csv"),
+                cache_path=cache_path,
+                sleep_sec=0.0,
+                engine=engine,
+                max_in_flight=workers,
+                google_rps=rps,
+                juso_rps=rps,
+                local_resolver=False,
+            )
+            elapsed = time.perf_counter() - t0
+    finally:
+        server.shutdown()
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+    counts = server.RequestHandlerClass.config.counts
+    print(f"[BENCH] geo_mock engine={engine} workers={workers} rps={rps} latency={latency_ms}ms")
+    print(f"  server calls: {counts}")
+    print(f"  {n_addr} addresses in {elapsed:.1f}s = {n_addr / elapsed if elapsed else 0:.1f} addr/s (end-to-end)")
+
+
+# 3) Monthly CSV ingestion
+def bench_load_months(input_dir: str = "original_data", months=tuple(range(1, 13)), repeat: int = 3):
+    months = tuple(months)
+
+    def legacy():
+        dfs = [pd.read_csv(os.path.join(input_dir, f"{m}.csv")) for m in months]
+        return pd.concat(dfs, ignore_index=True)
+
+    rows = len(legacy())
+    print(f"[BENCH] load_months files={len(months)} rows={rows}")
+    base = _timeit(legacy, repeat)
+    _report("serial read_csv (all cols)", rows, base)
+    _report("load_months (all cols)", rows, _timeit(lambda: load_months(input_dir, months, verbose=False), repeat), base)
+    _report("load_months (주소 only)", rows, _timeit(
+        lambda: load_months(input_dir, months, usecols=["주소"], verbose=False), repeat), base)
+    _report("load_months (+신고일 dates)", rows, _timeit(
+        lambda: load_months(input_dir, months, usecols=["주소", "구정보", "유형"], parse_dates=["신고일"], verbose=False),
+        repeat), base)
+
+
+# 4) Materialized geo()+grid vs streaming aggregation (time / peak Python memory)
+def bench_stream_grid(input_dir: str = "original_data", months=tuple(range(1, 12)), scale: int = 1, chunksize: int = 20_000):
+    import tracemalloc
+
+    from src.geocode_cache import LEGACY_CSV_CACHES, import_csv_caches
+    from src.grid import make_predata_and_meta_csv
+    from src.pipeline_geo import geo
+    from src.stream_grid import stream_predata_and_meta
+
+    def measure(fn):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        fn()
+        sec = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return sec, peak
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t = Path(tmp)
+        raw = t / "raw"
+        raw.mkdir()
+        for m in months:
+            src = pd.read_csv(os.path.join(input_dir, f"{m}.csv"), usecols=["주소"])
+            pd.concat([src] * scale, ignore_index=True).to_csv(raw / f"{m}.csv", index=False)
+        cache = str(t / "cache.sqlite")
+        import_csv_caches([p for p in LEGACY_CSV_CACHES if os.path.exists(p)], db_path=cache)
+
+        def materialized():
+            geo(str(raw), tuple(months), out_path=str(t / "after.parquet"), cache_path=cache, offline=True)
+            make_predata_and_meta_csv(str(t / "after.parquet"), str(t / "a_pre.parquet"), str(t / "a_meta.parquet"))
+
+        def streaming():
+            stream_predata_and_meta(str(raw), tuple(months), cache, str(t / "b_pre.parquet"), str(t / "b_meta.parquet"),
+                                    chunksize=chunksize)
+
+        base = measure(materialized)
+        stream = measure(streaming)
+        same = pd.read_parquet(t / "a_pre.parquet").equals(pd.read_parquet(t / "b_pre.parquet"))
+
+    print(f"[BENCH] stream_grid months={len(months)} scale={scale} chunksize={chunksize}")
+    for name, (sec, peak) in (("geo + grid (materialized)", base), ("stream_predata_and_meta", stream)):
+        print(f"  {name:<28} {sec * 1000:9.1f} ms  peak {peak / 2 ** 20:8.1f} MiB")
+    print(f"  identical predata: {same}")
+
+
+# 5) String grid_id vs packed int64 cell keys (groupby / merge / shift)
+def bench_cell_keys(after_path: str = "data/after.parquet", scale: int = 10, repeat: int = 3):
+    from src.cellkey import cell_to_grid_id, encode_cell
+    from src.grid import project_to_grid
+    from src.storage import read_table
+
+    after = read_table(after_path, schema="after").dropna(subset=["lat", "lon"])
+    if scale > 1:
+        after = pd.concat([after] * scale, ignore_index=True)
+    _, _, gx, gy = project_to_grid(after["lat"], after["lon"])
+    df = pd.DataFrame({"month": after["month"].to_numpy(), "grid_x": gx, "grid_y": gy})
+    df["grid_id"] = df["grid_x"].astype(str) + "_" + df["grid_y"].astype(str)
+    df["cell"] = encode_cell(gx, gy)
+    rows = len(df)
+    print(f"[BENCH] cell_keys rows={rows} cells={df['cell'].nunique()}")
+
+    base = _timeit(lambda: df["grid_x"].astype(str) + "_" + df["grid_y"].astype(str), repeat)
+    _report("build grid_id (per row)", rows, base)
+    _report("encode_cell + ids per unique", rows, _timeit(lambda: cell_to_grid_id(encode_cell(gx, gy)), repeat), base)
+
+    base = _timeit(lambda: df.groupby(["month", "grid_id"]).size(), repeat)
+    _report("groupby(month, grid_id)", rows, base)
+    _report("groupby(month, cell)", rows, _timeit(lambda: df.groupby(["month", "cell"]).size(), repeat), base)
+
+    meta = df.drop_duplicates("cell")[["grid_id", "cell", "grid_x", "grid_y"]]
+    base = _timeit(lambda: df[["grid_id"]].merge(meta.drop(columns="cell"), on="grid_id", how="left"), repeat)
+    _report("merge on grid_id", rows, base)
+    _report("merge on cell", rows, _timeit(
+        lambda: df[["cell"]].merge(meta.drop(columns="grid_id"), on="cell", how="left"), repeat), base)
+
+    counts = df.groupby(["month", "grid_id", "cell"]).size().reset_index(name="count")
+    counts = pd.concat([counts] * scale, ignore_index=True)
+    base = _timeit(lambda: counts.groupby("grid_id")["count"].shift(1), repeat)
+    _report(f"shift by grid_id ({len(counts)})", len(counts), base)
+    _report("shift by cell", len(counts), _timeit(lambda: counts.groupby("cell", sort=False)["count"].shift(1), repeat), base)
+
+
+# 6) Calendar lag lookup: long-table self-merge vs CellTensor slicing
+def bench_cell_tensor(predata_path: str = "data/predata.parquet", scale: int = 1, repeat: int = 5):
+    from src.cell_tensor import CellTensor
+    from src.storage import read_table
+
+    pre = read_table(predata_path, schema="predata")[["month", "grid_id", "count", "cell"]]
+    if scale > 1:
+        # Extra years of history: same cells, later months
+        span = int(pre["month"].max())
+        pre = pd.concat([pre.assign(month=pre["month"] + span * i) for i in range(scale)], ignore_index=True)
+    rows = len(pre)
+    print(f"[BENCH] cell_tensor rows={rows} months={pre['month'].nunique()}")
+
+    def merge_lag():
+        prev = pre[["month", "cell", "count"]].assign(month=pre["month"] + 1).rename(columns={"count": "lag1"})
+        return pre.merge(prev, on=["month", "cell"], how="left")["lag1"].fillna(0).to_numpy()
+
+    build = _timeit(lambda: CellTensor.from_predata(pre, bounds="seoul"), repeat)
+    tensor = CellTensor.from_predata(pre, bounds="seoul")
+    base = _timeit(merge_lag, repeat)
+    _report("merge on (month-1, cell)", rows, base)
+    _report("CellTensor build", rows, build, base)
+    _report("CellTensor.values_at(m-1)", rows, _timeit(
+        lambda: tensor.values_at(pre["month"].to_numpy() - 1, pre["cell"].to_numpy()), repeat), base)
+    dense = tensor.data
+    _report("dense slice data[:-1]", rows, _timeit(lambda: dense[:-1].sum(), repeat), base)
+    print(f"  tensor shape={tensor.shape} {tensor.nbytes / 2 ** 20:.1f} MiB vs long {pre.memory_usage(deep=True).sum() / 2 ** 20:.1f} MiB")
+
+
+# 7) Multi-resolution grids: re-bin raw points per level vs one-pass pyramid
+def bench_pyramid(after_path: str = "data/after.parquet", scale: int = 1, repeat: int = 3):
+    from src.grid import add_grid_columns, build_predata
+    from src.pyramid import PYRAMID_LEVELS, build_pyramid
+    from src.storage import read_table
+
+    after = read_table(after_path, schema="after")
+    if scale > 1:
+        after = pd.concat([after] * scale, ignore_index=True)
+    rows = len(after)
+    print(f"[BENCH] pyramid rows={rows} levels={list(PYRAMID_LEVELS)}")
+
+    base = _timeit(lambda: [build_predata(add_grid_columns(after, cell_size_m=s)) for s in PYRAMID_LEVELS], repeat)
+    _report("project + bin per level", rows, base)
+    _report("build_pyramid (one pass)", rows, _timeit(lambda: build_pyramid(after, PYRAMID_LEVELS), repeat), base)
+
+
+# 8) Binning throughput: square floor-divide vs hexagonal axial rounding
+def bench_hexgrid(after_path: str = "data/after.parquet", scale: int = 10, repeat: int = 5):
+    import numpy as np
+
+    from src.grid import CELL_SIZE_M, add_grid_columns, build_predata, project_to_grid
+    from src.hexgrid import hex_axial
+    from src.storage import read_table
+
+    after = read_table(after_path, schema="after").dropna(subset=["lat", "lon"])
+    if scale > 1:
+        after = pd.concat([after] * scale, ignore_index=True)
+    x_m, y_m, _, _ = project_to_grid(after["lat"], after["lon"])
+    rows = len(after)
+    print(f"[BENCH] hexgrid rows={rows} cell_size_m={CELL_SIZE_M}")
+
+    def square():
+        return np.floor(x_m / CELL_SIZE_M).astype(np.int64), np.floor(y_m / CELL_SIZE_M).astype(np.int64)
+
+    base = _timeit(square, repeat)
+    _report("square floor-divide", rows, base)
+    _report("hex_axial", rows, _timeit(lambda: hex_axial(x_m, y_m, CELL_SIZE_M), repeat), base)
+
+    base = _timeit(lambda: build_predata(add_grid_columns(after)), repeat)
+    _report("square predata (end-to-end)", rows, base)
+    _report("hex predata (end-to-end)", rows, _timeit(lambda: build_predata(add_grid_columns(after, kind="hex")), repeat), base)
+
+
+# 9) Boundary filter: exact point-in-polygon vs bbox + cell lookup table
+def bench_boundary(after_path: str = "data/after.parquet", scale: int = 20, repeat: int = 3):
+    from src.boundary import BoundaryIndex
+    from src.grid import project_to_grid
+    from src.storage import read_table
+
+    after = read_table(after_path, schema="after").dropna(subset=["lat", "lon"])
+    if scale > 1:
+        after = pd.concat([after] * scale, ignore_index=True)
+    x_m, y_m, _, _ = project_to_grid(after["lat"], after["lon"])
+    rows = len(after)
+
+    build = _timeit(BoundaryIndex.seoul, repeat)
+    index = BoundaryIndex.seoul()
+    mixed = float((index.lut == BoundaryIndex.MIXED).mean())
+    print(f"[BENCH] boundary rows={rows} lut={index.ny}x{index.nx} mixed={mixed * 100:.1f}% build={build * 1000:.1f} ms")
+
+    base = _timeit(lambda: index._classify_exact(x_m, y_m), repeat)
+    _report("exact point-in-polygon", rows, base)
+    _report("bbox + lookup table", rows, _timeit(lambda: index.region_xy(x_m, y_m), repeat), base)
+
+
+# 10) Spatial neighbor features: offset self-joins vs raster convolution
+def bench_neighbors(predata_path: str = "data/predata.parquet", scale: int = 1, repeat: int = 3):
+    from src.cellkey import decode_cell, encode_cell
+    from src.neighbor_features import add_neighbor_features
+    from src.storage import read_table
+
+    pre = read_table(predata_path, schema="predata")[["month", "grid_id", "count", "cell"]]
+    if scale > 1:
+        span = int(pre["month"].max())
+        pre = pd.concat([pre.assign(month=pre["month"] + span * i) for i in range(scale)], ignore_index=True)
+    rows = len(pre)
+    print(f"[BENCH] neighbors rows={rows} months={pre['month'].nunique()}")
+
+    def self_join():
+        gx, gy = decode_cell(pre["cell"].to_numpy())
+        parts = []
+        for dx in range(-2, 3):
+            for dy in range(-2, 3):
+                if dx or dy:
+                    parts.append(pd.DataFrame({"month": pre["month"].to_numpy(), "cell": encode_cell(gx - dx, gy - dy),
+                                               "count": pre["count"].to_numpy(), "ring": max(abs(dx), abs(dy))}))
+        nb = pd.concat(parts, ignore_index=True)
+        r1 = nb[nb["ring"] == 1].groupby(["month", "cell"])["count"].agg(["sum", "max"])
+        r2 = nb.groupby(["month", "cell"])["count"].agg(["sum", "max"])
+        return pre.join(r1, on=["month", "cell"]).join(r2, on=["month", "cell"], rsuffix="2")
+
+    base = _timeit(self_join, repeat)
+    _report("self-join ring 1/2 sum+max", rows, base)
+    _report("convolution ring 1/2 + kde", rows, _timeit(lambda: add_neighbor_features(pre, pre), repeat), base)
+
+
+# 11) Lag / target features: sort + groupby().shift() vs zero-filled panel slicing
+def bench_panel(predata_path: str = "data/predata.parquet", scale: int = 10, repeat: int = 3):
+    from src.make_features import make_lag_features
+    from src.storage import read_table
+
+    pre = read_table(predata_path, schema="predata")[["month", "grid_id", "count", "cell"]]
+    if scale > 1:
+        # More grids: same history on shifted cell keys
+        pre = pd.concat([pre.assign(cell=pre["cell"] + (i << 20), grid_id=pre["grid_id"].astype(str) + f"_{i}")
+                         for i in range(scale)], ignore_index=True)
+    rows = len(pre)
+    print(f"[BENCH] panel rows={rows} cells={pre['cell'].nunique()} months={pre['month'].nunique()}")
+
+    def legacy():
+        df = pre.sort_values(["grid_id", "month"]).copy()
+        df["count_t"] = df["count"].astype(float)
+        by_cell = df.groupby("cell", sort=False)["count_t"]
+        for lag in (1, 2):
+            df[f"count_t-{lag}"] = by_cell.shift(lag)
+        df["y"] = by_cell.shift(-1)
+        return df.dropna(subset=["count_t-1", "count_t-2"])
+
+    base = _timeit(legacy, repeat)
+    _report("groupby().shift() lags+target", rows, base)
+    _report("panel lags+target", rows, _timeit(lambda: make_lag_features(pre), repeat), base)
+
+
+# 12) Window features: groupby().rolling() / ewm() vs panel prefix sums
+def bench_rolling(predata_path: str = "data/predata.parquet", scale: int = 10, repeat: int = 3):
+    from src.make_features import make_lag_features
+    from src.panel import CellPanel
+    from src.storage import read_table
+
+    pre = read_table(predata_path, schema="predata")[["month", "grid_id", "count", "cell"]]
+    if scale > 1:
+        pre = pd.concat([pre.assign(cell=pre["cell"] + (i << 20), grid_id=pre["grid_id"].astype(str) + f"_{i}")
+                         for i in range(scale)], ignore_index=True)
+    rows = len(pre)
+    print(f"[BENCH] rolling rows={rows} cells={pre['cell'].nunique()} windows=(3, 6) stats=mean/std/max + ewm")
+
+    # Baseline on the zero-filled long table so both sides compute the same values
+    panel = CellPanel.from_predata(pre)
+    ci, ti = panel.all_index()
+    full = pd.DataFrame({"cell": panel.cells[ci], "month": panel.months[ti], "count": panel.values[ci, ti]})
+
+    def legacy():
+        by_cell = full.groupby("cell", sort=False)["count"]
+        out = {}
+        for w in (3, 6):
+            roll = by_cell.rolling(w, min_periods=1)
+            out[f"mean{w}"], out[f"std{w}"], out[f"max{w}"] = roll.mean(), roll.std(ddof=0), roll.max()
+        out["ewm3"] = by_cell.ewm(span=3, adjust=False).mean()
+        return out
+
+    def panel_path():
+        p = CellPanel.from_predata(pre)
+        out = {f"{s}{w}": p.rolling(w, s) for w in (3, 6) for s in ("mean", "std", "max")}
+        out["ewm3"] = p.ewm(3)
+        return out
+
+    base = _timeit(legacy, repeat)
+    _report("groupby rolling/ewm", rows, base)
+    _report("panel prefix sums", rows, _timeit(panel_path, repeat), base)
+    _report("make_lag_features (all)", rows, _timeit(
+        lambda: make_lag_features(pre, windows=(3, 6), stats=("mean", "std", "max", "slope"), ewm_spans=(3,), since_last=True),
+        repeat), base)
+
+
+BENCHMARKS = {
+    "rolling": bench_rolling,
+    "panel": bench_panel,
+    "neighbors": bench_neighbors,
+    "boundary": bench_boundary,
+    "pyramid": bench_pyramid,
+    "hexgrid": bench_hexgrid,
+    "cell_tensor": bench_cell_tensor,
+    "cell_keys": bench_cell_keys,
+    "clean_address": bench_clean_address,
+    "load_months": bench_load_months,
+    "stream_grid": bench_stream_grid,
+    "geo_mock": bench_geo_mock,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pipeline micro-benchmarks")
+    parser.add_argument("name", choices=sorted(BENCHMARKS) + ["all"])
+    parser.add_argument("--scale", type=int, help="replicate input rows N times")
+    parser.add_argument("--months", type=int, nargs="+", help="month files to read")
+    parser.add_argument("--chunksize", type=int, help="rows per streamed chunk")
+    parser.add_argument("--engine", choices=["serial", "concurrent"])
+    parser.add_argument("--workers", type=int, help="max in-flight requests")
+    parser.add_argument("--rps", type=float, help="client requests/sec per provider")
+    parser.add_argument("--latency-ms", type=float, help="mock server latency")
+    parser.add_argument("--error-rate", type=float, help="mock server HTTP 500 rate")
+    parser.add_argument("--rps-limit", type=float, help="mock server 429 threshold")
+    args = vars(parser.parse_args())
+
+    names = sorted(BENCHMARKS) if args["name"] == "all" else [args["name"]]
+    for name in names:
+        fn = BENCHMARKS[name]
+        params = inspect.signature(fn).parameters
+        fn(**{k: v for k, v in args.items() if k in params and v is not None})
+
+
+if __name__ == "__main__":
+    main()
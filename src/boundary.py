@@ -0,0 +1,249 @@
+# src/boundary.py
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pyproj import Transformer
+
+from src.grid import CELL_SIZE_M, DST_CRS, SRC_CRS
+
+
+# Approximate Seoul city boundary, (lon, lat) clockwise from the west tip
+# Simplified outline (~1 km accuracy); the buffer absorbs the simplification
+SEOUL_BOUNDARY = (
+    (126.764, 37.579), (126.795, 37.603), (126.848, 37.615), (126.877, 37.628),
+    (126.902, 37.651), (126.925, 37.665), (126.949, 37.680), (126.975, 37.695),
+    (126.995, 37.706), (127.017, 37.718), (127.045, 37.717), (127.070, 37.700),
+    (127.094, 37.693), (127.110, 37.665), (127.118, 37.640), (127.120, 37.610),
+    (127.118, 37.585), (127.140, 37.586), (127.165, 37.584), (127.180, 37.575),
+    (127.186, 37.560), (127.185, 37.545), (127.170, 37.525), (127.165, 37.505),
+    (127.150, 37.480), (127.128, 37.463), (127.100, 37.455), (127.075, 37.440),
+    (127.048, 37.428), (127.020, 37.440), (126.990, 37.452), (126.960, 37.440),
+    (126.933, 37.432), (126.905, 37.430), (126.888, 37.425), (126.878, 37.455),
+    (126.862, 37.478), (126.830, 37.475), (126.815, 37.490), (126.812, 37.520),
+    (126.795, 37.540), (126.775, 37.560),
+)
+SEOUL_BUFFER_M = 500.0   # keep points this close to the outline
+
+
+def _to_xy(lon, lat):
+    t = Transformer.from_crs(SRC_CRS, DST_CRS, always_xy=True)
+    return t.transform(np.asarray(lon, dtype=float), np.asarray(lat, dtype=float))
+
+
+# Ring list -> edge arrays (x0, y0, x1, y1) in projected meters
+def _edges(rings: Sequence[Sequence[Tuple[float, float]]]) -> np.ndarray:
+    parts = []
+    for ring in rings:
+        lon, lat = np.asarray(ring, dtype=float).T
+        x, y = _to_xy(lon, lat)
+        parts.append(np.column_stack([x, y, np.roll(x, -1), np.roll(y, -1)]))
+    return np.concatenate(parts)
+
+
+# Even-odd point-in-polygon, one pass per edge over all points
+def _inside(x: np.ndarray, y: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    inside = np.zeros(len(x), dtype=bool)
+    for x0, y0, x1, y1 in edges:
+        crosses = (y0 > y) != (y1 > y)
+        if not crosses.any():
+            continue
+        xs = x0 + (y - y0) * (x1 - x0) / (y1 - y0 if y1 != y0 else 1e-12)
+        inside ^= crosses & (x < xs)
+    return inside
+
+
+# Distance from each point to the nearest edge
+def _edge_distance(x: np.ndarray, y: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    best = np.full(len(x), np.inf)
+    for x0, y0, x1, y1 in edges:
+        dx, dy = x1 - x0, y1 - y0
+        t = np.clip(((x - x0) * dx + (y - y0) * dy) / max(dx * dx + dy * dy, 1e-12), 0.0, 1.0)
+        np.minimum(best, np.hypot(x - (x0 + t * dx), y - (y0 + t * dy)), out=best)
+    return best
+
+
+# Region polygons + bbox + cell-level inside/outside lookup table
+class BoundaryIndex:
+    OUTSIDE = -1
+    MIXED = -2   # lookup cell crossed by an outline: points need the exact test
+
+    def __init__(
+        self,
+        regions: Dict[str, List[Sequence[Tuple[float, float]]]],
+        buffer_m: float = 0.0,
+        lut_cell_m: int = CELL_SIZE_M,
+    ):
+        if not regions:
+            raise ValueError("경계 폴리곤이 비어 있습니다.")
+        self.names = list(regions)
+        self.buffer_m = float(buffer_m)
+        self.lut_cell_m = int(lut_cell_m)
+        self._edges = [_edges(rings) for rings in regions.values()]
+
+        allx = np.concatenate([e[:, [0, 2]].ravel() for e in self._edges])
+        ally = np.concatenate([e[:, [1, 3]].ravel() for e in self._edges])
+        pad = self.buffer_m + self.lut_cell_m
+        self.bbox = (allx.min() - pad, ally.min() - pad, allx.max() + pad, ally.max() + pad)
+        self._build_lut()
+
+    # Label of each lookup cell: region index, OUTSIDE or MIXED
+    def _build_lut(self):
+        x0, y0, x1, y1 = self.bbox
+        size = self.lut_cell_m
+        self.nx = int(np.ceil((x1 - x0) / size))
+        self.ny = int(np.ceil((y1 - y0) / size))
+
+        # Cells touched by any outline, dilated to cover the buffer band
+        mixed = np.zeros((self.ny, self.nx), dtype=bool)
+        for edges in self._edges:
+            for ex0, ey0, ex1, ey1 in edges:
+                n = int(np.ceil(np.hypot(ex1 - ex0, ey1 - ey0) / (size / 4))) + 1
+                t = np.linspace(0.0, 1.0, n)
+                ix = ((ex0 + t * (ex1 - ex0) - x0) // size).astype(np.int64)
+                iy = ((ey0 + t * (ey1 - ey0) - y0) // size).astype(np.int64)
+                mixed[iy, ix] = True
+        for _ in range(int(np.ceil(self.buffer_m / size)) + 1):
+            grown = mixed.copy()
+            grown[1:, :] |= mixed[:-1, :]
+            grown[:-1, :] |= mixed[1:, :]
+            grown[:, 1:] |= mixed[:, :-1]
+            grown[:, :-1] |= mixed[:, 1:]
+            mixed = grown
+
+        # Every other cell lies wholly inside one region or outside all: its center decides
+        iy, ix = np.indices((self.ny, self.nx))
+        cx = x0 + (ix.ravel() + 0.5) * size
+        cy = y0 + (iy.ravel() + 0.5) * size
+        lut = self._classify_exact(cx, cy).reshape(self.ny, self.nx)
+        lut[mixed] = self.MIXED
+        self.lut = lut.astype(np.int16)
+
+    # Exact region index per point (first matching region wins)
+    def _classify_exact(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        out = np.full(len(x), self.OUTSIDE, dtype=np.int64)
+        for i, edges in enumerate(self._edges):
+            todo = np.flatnonzero(out == self.OUTSIDE)
+            if not len(todo):
+                break
+            hit = _inside(x[todo], y[todo], edges)
+            if self.buffer_m > 0 and not hit.all():
+                near = _edge_distance(x[todo[~hit]], y[todo[~hit]], edges) <= self.buffer_m
+                hit[np.flatnonzero(~hit)[near]] = True
+            out[todo[hit]] = i
+        return out
+
+    # Projected meters -> region index (-1 outside)
+    def region_xy(self, x_m, y_m) -> np.ndarray:
+        x = np.asarray(x_m, dtype=float)
+        y = np.asarray(y_m, dtype=float)
+        x0, y0, x1, y1 = self.bbox
+        out = np.full(len(x), self.OUTSIDE, dtype=np.int64)
+
+        # bbox prefilter (NaN compares False -> outside)
+        box = np.flatnonzero((x >= x0) & (x < x1) & (y >= y0) & (y < y1))
+        ix = ((x[box] - x0) // self.lut_cell_m).astype(np.int64).clip(0, self.nx - 1)
+        iy = ((y[box] - y0) // self.lut_cell_m).astype(np.int64).clip(0, self.ny - 1)
+        label = self.lut[iy, ix].astype(np.int64)
+
+        mixed = label == self.MIXED
+        if mixed.any():
+            label[mixed] = self._classify_exact(x[box[mixed]], y[box[mixed]])
+        out[box] = label
+        return out
+
+    def contains_xy(self, x_m, y_m) -> np.ndarray:
+        return self.region_xy(x_m, y_m) != self.OUTSIDE
+
+    def region_of(self, lat, lon) -> np.ndarray:
+        x, y = _to_xy(lon, lat)
+        return self.region_xy(x, y)
+
+    def contains(self, lat, lon) -> np.ndarray:
+        return self.region_of(lat, lon) != self.OUTSIDE
+
+    # Region index -> name (None outside)
+    def region_names(self, region: np.ndarray) -> np.ndarray:
+        names = np.array(self.names + [None], dtype=object)
+        return names[np.where(region == self.OUTSIDE, len(self.names), region)]
+
+    @classmethod
+    def seoul(cls, buffer_m: float = SEOUL_BUFFER_M, lut_cell_m: int = CELL_SIZE_M) -> "BoundaryIndex":
+        return cls({"서울특별시": [SEOUL_BOUNDARY]}, buffer_m=buffer_m, lut_cell_m=lut_cell_m)
+
+    # GeoJSON (Polygon / MultiPolygon features, lon/lat), e.g. per-구 boundaries
+    @classmethod
+    def from_geojson(cls, path: str, name_prop: str = "name", buffer_m: float = 0.0, lut_cell_m: int = CELL_SIZE_M):
+        with open(path, encoding="utf-8") as f:
+            gj = json.load(f)
+        features = gj["features"] if gj.get("type") == "FeatureCollection" else [gj]
+
+        regions: Dict[str, list] = {}
+        for i, feat in enumerate(features):
+            geom = feat.get("geometry") or {}
+            name = str((feat.get("properties") or {}).get(name_prop, i))
+            if geom.get("type") == "Polygon":
+                rings = geom["coordinates"]
+            elif geom.get("type") == "MultiPolygon":
+                rings = [ring for poly in geom["coordinates"] for ring in poly]
+            else:
+                continue
+            regions.setdefault(name, []).extend([[tuple(p[:2]) for p in ring] for ring in rings])
+        return cls(regions, buffer_m=buffer_m, lut_cell_m=lut_cell_m)
+
+
+@lru_cache(maxsize=4)
+def _load_boundary(spec: str) -> BoundaryIndex:
+    if spec == "seoul":
+        return BoundaryIndex.seoul()
+    return BoundaryIndex.from_geojson(spec)
+
+
+# "seoul" | GeoJSON path | BoundaryIndex | None
+def get_boundary(boundary: Union[None, str, BoundaryIndex]) -> Optional[BoundaryIndex]:
+    if boundary is None or isinstance(boundary, BoundaryIndex):
+        return boundary
+    return _load_boundary(str(boundary))
+
+
+# Per-month counts of points rejected by the filter
+def rejection_report(month, keep: np.ndarray) -> pd.DataFrame:
+    df = pd.DataFrame({"month": np.asarray(month), "rejected": ~np.asarray(keep, dtype=bool)})
+    rep = df.groupby("month").agg(total=("rejected", "size"), rejected=("rejected", "sum")).reset_index()
+    rep["ratio"] = rep["rejected"] / rep["total"]
+    return rep
+
+
+def print_rejections(rep: pd.DataFrame):
+    for r in rep[rep["rejected"] > 0].itertuples():
+        print(f"[INFO] 경계 밖 좌표 제외: {r.month}월 {r.rejected}/{r.total} ({r.ratio * 100:.2f}%)")
+    print(f"[INFO] 경계 밖 좌표 합계: {int(rep['rejected'].sum())}/{int(rep['total'].sum())}")
+
+
+# Drop projected points (x_m / y_m) outside the boundary; optionally label regions
+def clip_to_boundary(
+    df_grid: pd.DataFrame,
+    boundary: Union[str, BoundaryIndex] = "seoul",
+    month_col: str = "month",
+    region_col: Optional[str] = None,
+    verbose: bool = True,
+) -> pd.DataFrame:
+    for c in ["x_m", "y_m"]:
+        if c not in df_grid.columns:
+            raise KeyError(f"입력 df에 '{c}' 컬럼이 필요합니다.")
+
+    index = get_boundary(boundary)
+    region = index.region_xy(df_grid["x_m"], df_grid["y_m"])
+    keep = region != BoundaryIndex.OUTSIDE
+
+    if verbose and month_col in df_grid.columns:
+        print_rejections(rejection_report(df_grid[month_col], keep))
+
+    out = df_grid[keep]
+    if region_col:
+        out = out.assign(**{region_col: index.region_names(region[keep])})
+    return out
@@ -0,0 +1,136 @@
+# src/cache_journal.py
+from __future__ import annotations
+
+import json
+import os
+
+import pandas as pd
+
+
+# Row format of the address cache (CSV file, journal lines and SQLite table)
+CACHE_COLUMNS = ["주소_clean", "roadAddr", "lat", "lon", "status", "attempts", "updated_at", "confidence", "source"]
+
+
+# CSV cache file
+def load_csv(cache_path: str) -> pd.DataFrame:
+    if os.path.exists(cache_path):
+        cache = pd.read_csv(cache_path)
+
+        # Backfill missing columns
+        for col in CACHE_COLUMNS:
+            if col not in cache.columns:
+                cache[col] = pd.NA
+
+        cache = cache.drop_duplicates("주소_clean", keep="last")
+    else:
+        cache = pd.DataFrame(columns=CACHE_COLUMNS)
+
+    return cache
+
+
+def save_csv(cache: pd.DataFrame, cache_path: str):
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+
+    # Write to a temp file first so a crash never leaves a half-written cache
+    tmp_path = cache_path + ".tmp"
+    cache.to_csv(tmp_path, index=False, encoding="utf-8-sig")
+    os.replace(tmp_path, cache_path)
+
+
+# Append-only JSONL journal next to a CSV cache: every geocoded row is fsynced
+# before the next checkpoint, and folded into the CSV on the next open
+def journal_path_for(cache_path: str) -> str:
+    return cache_path + ".journal.jsonl"
+
+
+class CacheJournal:
+    def __init__(self, path: str, flush_every: int = 50):
+        self.path = path
+        self.flush_every = max(1, int(flush_every))
+        self._buf = []
+        self._fh = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def append(self, row: dict):
+        self._buf.append(row)
+        if len(self._buf) >= self.flush_every:
+            self.flush()
+
+    # Append buffered rows and fsync (cost = new rows only)
+    def flush(self):
+        if not self._buf:
+            return
+        if self._fh is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._fh = open(self.path, "a", encoding="utf-8")
+        for row in self._buf:
+            self._fh.write(json.dumps(_json_row(row), ensure_ascii=False) + "\n")
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._buf = []
+
+    def close(self):
+        self.flush()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+def _json_row(row: dict) -> dict:
+    out = {}
+    for k, v in row.items():
+        if v is None or (isinstance(v, float) and v != v) or v is pd.NA:
+            out[k] = None
+        elif hasattr(v, "item"):
+            out[k] = v.item()
+        else:
+            out[k] = v
+    return out
+
+
+def read_journal(path: str) -> pd.DataFrame:
+    rows = []
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Torn final line from an interrupted write
+                    break
+    return pd.DataFrame(rows, columns=CACHE_COLUMNS) if rows else pd.DataFrame(columns=CACHE_COLUMNS)
+
+
+def merge_rows(cache: pd.DataFrame, rows) -> pd.DataFrame:
+    new = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+    if new.empty:
+        return cache
+    if cache.empty:
+        return new.drop_duplicates("주소_clean", keep="last").reset_index(drop=True)
+    cache = pd.concat([cache, new], ignore_index=True)
+    return cache.drop_duplicates("주소_clean", keep="last")
+
+
+# Fold a leftover journal into the main cache
+def compact_journal(cache_path: str, cache: pd.DataFrame | None = None) -> pd.DataFrame:
+    jpath = journal_path_for(cache_path)
+    if cache is None:
+        cache = load_csv(cache_path)
+
+    pending = read_journal(jpath)
+    if not pending.empty:
+        print(f"[INFO] journal 복구: {len(pending)}건 ({jpath})")
+        cache = merge_rows(cache, pending)
+        save_csv(cache, cache_path)
+
+    if os.path.exists(jpath):
+        os.remove(jpath)
+    return cache
@@ -0,0 +1,64 @@
+# src/cache_policy.py
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pandas as pd
+
+
+# Negative-cache policy: days before a failed lookup is retried
+FAILURE_TTL_DAYS = {
+    "zero_results": 180,   # permanent: address does not resolve
+    "invalid": 365,        # permanent: empty / malformed query
+    "quota": 0,            # transient: retry next run
+    "timeout": 0,
+    "http_error": 0,
+    "unknown": 0,          # legacy rows without a recorded reason
+}
+LOCAL_STATUS = "local"     # approximated offline by src.local_geocoder
+
+# Which query produced a row's coordinates ("source" column; empty on legacy rows)
+SOURCE_ROAD = "road"       # Google on the JUSO roadAddr
+SOURCE_JIBUN = "jibun"     # Google on the raw jibun address (roadAddr failed or missing)
+SOURCE_LOCAL = "local"     # local resolver
+MAX_TRANSIENT_ATTEMPTS = 5
+EXHAUSTED_TTL_DAYS = 30
+
+
+# UTC timestamp stored in updated_at / created_at columns
+def now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# Failure priority: transient classes win so the address gets retried
+_FAILURE_RANK = ["quota", "timeout", "http_error", "unknown", "zero_results", "invalid"]
+
+
+def worse_failure(a: str, b: str) -> str:
+    ra = _FAILURE_RANK.index(a) if a in _FAILURE_RANK else len(_FAILURE_RANK)
+    rb = _FAILURE_RANK.index(b) if b in _FAILURE_RANK else len(_FAILURE_RANK)
+    return a if ra <= rb else b
+
+
+# Boolean mask of cache rows whose failure has expired
+def due_for_retry(cache: pd.DataFrame, now: datetime | None = None, refine_local: bool = False) -> pd.Series:
+    if cache.empty:
+        return pd.Series(False, index=cache.index)
+
+    failed = cache["lat"].isna()
+    status = cache["status"].where(cache["status"].notna(), "unknown").astype(str)
+    attempts = pd.to_numeric(cache["attempts"], errors="coerce").fillna(0)
+
+    ttl_days = status.map(FAILURE_TTL_DAYS).fillna(0)
+    transient = ttl_days == 0
+    ttl_days = ttl_days.where(~(transient & (attempts >= MAX_TRANSIENT_ATTEMPTS)), EXHAUSTED_TTL_DAYS)
+
+    now = pd.Timestamp(now or datetime.now(timezone.utc))
+    updated = pd.to_datetime(cache["updated_at"], errors="coerce", utc=True)
+    age_days = (now - updated).dt.total_seconds() / 86400
+    expired = age_days.isna() | (age_days >= ttl_days)
+
+    due = failed & expired
+    if refine_local:
+        due |= (status == LOCAL_STATUS) & (pd.to_numeric(cache["confidence"], errors="coerce").fillna(0) < 1.0)
+    return due
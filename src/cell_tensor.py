@@ -0,0 +1,193 @@
+# src/cell_tensor.py
+from __future__ import annotations
+
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pyproj import Transformer
+
+from src.cellkey import CELL_COL, cell_to_grid_id, decode_cell, encode_cell, with_cell
+from src.grid import CELL_SIZE_M, DST_CRS, SRC_CRS, order_predata
+
+
+# Seoul bounding box (lat/lon) used for the "seoul" extent
+SEOUL_BBOX = (37.41, 126.76, 37.72, 127.19)   # (lat_min, lon_min, lat_max, lon_max)
+MAX_DENSE_CELLS = 50_000_000                   # months * ny * nx above this -> sparse
+
+
+# Seoul bbox -> inclusive grid bounds (x0, y0, x1, y1)
+def seoul_bounds(cell_size_m: int = CELL_SIZE_M) -> Tuple[int, int, int, int]:
+    t = Transformer.from_crs(SRC_CRS, DST_CRS, always_xy=True)
+    lat0, lon0, lat1, lon1 = SEOUL_BBOX
+    xs, ys = t.transform([lon0, lon1, lon0, lon1], [lat0, lat0, lat1, lat1])
+    return (
+        int(np.floor(min(xs) / cell_size_m)),
+        int(np.floor(min(ys) / cell_size_m)),
+        int(np.floor(max(xs) / cell_size_m)),
+        int(np.floor(max(ys) / cell_size_m)),
+    )
+
+
+def _sparse():
+    try:
+        import scipy.sparse as sp
+    except ImportError as e:
+        raise ImportError("sparse CellTensor에는 scipy가 필요합니다.") from e
+    return sp
+
+
+# Counts as (months, ny, nx): dense ndarray or one scipy.sparse CSR matrix per month
+class CellTensor:
+    def __init__(self, data, months: Sequence[int], x0: int, y0: int, nx: int, ny: int):
+        self.data = data
+        self.months = np.asarray(months, dtype=np.int64)
+        self.x0, self.y0, self.nx, self.ny = int(x0), int(y0), int(nx), int(ny)
+        self._month_pos = {int(m): i for i, m in enumerate(self.months)}
+
+    @property
+    def is_sparse(self) -> bool:
+        return not isinstance(self.data, np.ndarray)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return len(self.months), self.ny, self.nx
+
+    @property
+    def nbytes(self) -> int:
+        if not self.is_sparse:
+            return int(self.data.nbytes)
+        return int(sum(m.data.nbytes + m.indices.nbytes + m.indptr.nbytes for m in self.data))
+
+    # Long predata (month, grid_id/cell, count) -> tensor
+    @classmethod
+    def from_predata(
+        cls,
+        predata: pd.DataFrame,
+        months: Optional[Sequence[int]] = None,
+        value_col: str = "count",
+        bounds: Union[None, str, Tuple[int, int, int, int]] = None,
+        sparse: Union[bool, str] = "auto",
+        dtype=np.float32,
+    ) -> "CellTensor":
+        df = with_cell(predata)
+        gx, gy = decode_cell(df[CELL_COL].to_numpy())
+        month = df["month"].to_numpy(dtype=np.int64)
+        value = df[value_col].to_numpy(dtype=dtype)
+
+        if bounds == "seoul":
+            bounds = seoul_bounds()
+        if bounds is None:
+            bounds = (int(gx.min()), int(gy.min()), int(gx.max()), int(gy.max())) if len(df) else (0, 0, 0, 0)
+        x0, y0, x1, y1 = bounds
+        inside = (gx >= x0) & (gx <= x1) & (gy >= y0) & (gy <= y1)
+        if not inside.all():
+            print(f"[INFO] CellTensor: 범위 밖 {int((~inside).sum())}행 제외 (bounds={bounds})")
+
+        months = np.asarray(sorted(set(month.tolist())) if months is None else list(months), dtype=np.int64)
+        pos = pd.Index(months).get_indexer(month)
+        keep = inside & (pos >= 0)
+
+        nx, ny = x1 - x0 + 1, y1 - y0 + 1
+        t, iy, ix = pos[keep], gy[keep] - y0, gx[keep] - x0
+        v = value[keep]
+
+        if sparse == "auto":
+            sparse = len(months) * nx * ny > MAX_DENSE_CELLS
+        if sparse:
+            sp = _sparse()
+            data = []
+            for i in range(len(months)):
+                sel = t == i
+                data.append(sp.csr_matrix((v[sel], (iy[sel], ix[sel])), shape=(ny, nx), dtype=dtype))
+        else:
+            data = np.zeros((len(months), ny, nx), dtype=dtype)
+            np.add.at(data, (t, iy, ix), v)
+        return cls(data, months, x0, y0, nx, ny)
+
+    def month_index(self, month: int) -> int:
+        try:
+            return self._month_pos[int(month)]
+        except KeyError:
+            raise KeyError(f"CellTensor에 {month}월이 없습니다.") from None
+
+    # (ny, nx) slice for one month
+    def frame(self, month: int):
+        return self.data[self.month_index(month)]
+
+    def to_dense(self) -> np.ndarray:
+        if not self.is_sparse:
+            return self.data
+        return np.stack([m.toarray() for m in self.data])
+
+    # Array positions for packed cell keys (-1 where outside the extent)
+    def positions(self, cells) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        gx, gy = decode_cell(cells)
+        ix, iy = gx - self.x0, gy - self.y0
+        ok = (ix >= 0) & (ix < self.nx) & (iy >= 0) & (iy < self.ny)
+        return np.where(ok, iy, -1), np.where(ok, ix, -1), ok
+
+    # Vectorized lookup of values for (month, cell) pairs; missing -> fill
+    def values_at(self, months, cells, fill: float = 0.0) -> np.ndarray:
+        months = np.broadcast_to(np.asarray(months, dtype=np.int64), np.shape(cells))
+        iy, ix, ok = self.positions(cells)
+        t = pd.Index(self.months).get_indexer(months)
+        ok &= t >= 0
+
+        out = np.full(len(ok), fill, dtype=np.float64)
+        if not self.is_sparse:
+            out[ok] = self.data[t[ok], iy[ok], ix[ok]]
+            return out
+        for i in np.unique(t[ok]):
+            sel = ok & (t == i)
+            out[sel] = np.asarray(self.data[i][iy[sel], ix[sel]]).ravel()
+        return out
+
+    # Shift along the month axis: result[t] = self[t - k], zero-filled
+    def lag(self, k: int = 1) -> "CellTensor":
+        if self.is_sparse:
+            sp = _sparse()
+            empty = sp.csr_matrix((self.ny, self.nx), dtype=self.data[0].dtype if self.data else np.float32)
+            data = [self.data[i - k] if 0 <= i - k < len(self.data) else empty for i in range(len(self.data))]
+        else:
+            data = np.zeros_like(self.data)
+            if k >= 0:
+                data[k:] = self.data[:len(self.data) - k]
+            else:
+                data[:k] = self.data[-k:]
+        return CellTensor(data, self.months, self.x0, self.y0, self.nx, self.ny)
+
+    # Tensor -> long (month, grid_id, count, cell) in predata order
+    def to_long(self, value_col: str = "count", drop_zero: bool = True) -> pd.DataFrame:
+        if self.is_sparse and not drop_zero:
+            return self.to_dense_tensor().to_long(value_col, drop_zero=False)
+
+        if self.is_sparse:
+            coos = [m.tocoo() for m in self.data]
+            t = np.concatenate([np.full(c.nnz, i) for i, c in enumerate(coos)] or [[]])
+            iy = np.concatenate([c.row for c in coos] or [[]])
+            ix = np.concatenate([c.col for c in coos] or [[]])
+            v = np.concatenate([c.data for c in coos] or [[]])
+            nz = v != 0
+            t, iy, ix, v = t[nz], iy[nz], ix[nz], v[nz]
+        else:
+            if drop_zero:
+                t, iy, ix = np.nonzero(self.data)
+            else:
+                t, iy, ix = np.indices(self.data.shape).reshape(3, -1)
+            v = self.data[t, iy, ix]
+
+        cells = encode_cell(np.asarray(ix, dtype=np.int64) + self.x0, np.asarray(iy, dtype=np.int64) + self.y0)
+        df = pd.DataFrame({
+            "month": self.months[np.asarray(t, dtype=np.int64)],
+            "grid_id": cell_to_grid_id(cells),
+            value_col: np.asarray(v),
+            CELL_COL: cells,
+        })
+        if value_col == "count":
+            df["count"] = df["count"].round().astype(np.int64)
+            return order_predata(df)
+        return df.sort_values(["month", CELL_COL]).reset_index(drop=True)
+
+    def to_dense_tensor(self) -> "CellTensor":
+        return CellTensor(self.to_dense(), self.months, self.x0, self.y0, self.nx, self.ny)
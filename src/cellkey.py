@@ -0,0 +1,54 @@
+# src/cellkey.py
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+# Packed grid cell key: (grid_x << 32) | (grid_y & 0xFFFFFFFF) as int64
+# grid_id strings ("<grid_x>_<grid_y>") are only built at output boundaries
+CELL_COL = "cell"
+_LOW = np.int64(0xFFFFFFFF)
+
+
+def encode_cell(grid_x, grid_y) -> np.ndarray:
+    gx = np.asarray(grid_x, dtype=np.int64)
+    gy = np.asarray(grid_y, dtype=np.int64)
+    return (gx << 32) | (gy & _LOW)
+
+
+def decode_cell(cell):
+    cell = np.asarray(cell, dtype=np.int64)
+    grid_x = cell >> 32
+    grid_y = (cell & _LOW).astype(np.uint32).view(np.int32).astype(np.int64)
+    return grid_x, grid_y
+
+
+# Packed keys -> "gx_gy" strings (formatted once per unique key)
+def cell_to_grid_id(cell) -> np.ndarray:
+    codes, uniques = pd.factorize(np.asarray(cell, dtype=np.int64))
+    gx, gy = decode_cell(uniques)
+    ids = np.array([f"{x}_{y}" for x, y in zip(gx.tolist(), gy.tolist())], dtype=object)
+    return ids.take(codes) if len(ids) else np.array([], dtype=object)
+
+
+# "gx_gy" strings -> packed keys (parsed once per unique id)
+def grid_id_to_cell(grid_id) -> np.ndarray:
+    codes, uniques = pd.factorize(pd.Series(grid_id).astype(str))
+    parts = pd.Series(uniques).str.split("_", n=1, expand=True)
+    if len(uniques) and parts.shape[1] != 2:
+        raise ValueError("grid_id는 '<grid_x>_<grid_y>' 형식이어야 합니다.")
+    keys = encode_cell(parts[0].astype(np.int64), parts[1].astype(np.int64)) if len(uniques) else np.array([], np.int64)
+    return keys.take(codes)
+
+
+# Add the packed key to a frame that only carries grid_id
+def with_cell(df: pd.DataFrame) -> pd.DataFrame:
+    if CELL_COL in df.columns or "grid_id" not in df.columns:
+        return df
+    df = df.copy()
+    if {"grid_x", "grid_y"} <= set(df.columns):
+        df[CELL_COL] = encode_cell(df["grid_x"], df["grid_y"])
+    else:
+        df[CELL_COL] = grid_id_to_cell(df["grid_id"])
+    return df
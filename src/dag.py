@@ -0,0 +1,246 @@
+# src/dag.py
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Sequence
+
+from src.cache_policy import now_iso
+from src.hashing import FileHasher, code_hash, jsonable
+
+
+CACHE_DIR = "data/.stage_cache"
+KEEP_PER_STAGE = 3   # cached output sets kept per stage (oldest pruned)
+
+
+# One pipeline step: fn(**params) reads `inputs` and writes `outputs`
+class Stage:
+    def __init__(
+        self,
+        name: str,
+        fn: Callable,
+        inputs: Sequence[str] = (),
+        outputs: Sequence[str] = (),
+        params: Optional[dict] = None,
+        env: Optional[dict] = None,
+        after: Sequence[str] = (),
+    ):
+        self.name = name
+        self.fn = fn
+        self.inputs = [str(p) for p in inputs]
+        self.outputs = [str(p) for p in outputs]
+        self.env = dict(env or {})
+        self.after = list(after)
+
+        # Hash defaults too, so editing a default invalidates the stage
+        sig = inspect.signature(fn)
+        bound = sig.bind_partial(**(params or {}))
+        bound.apply_defaults()
+        self.params = dict(bound.arguments)
+
+    def run(self):
+        return self.fn(**self.params)
+
+
+# Stage key = hash(name, params, env, code, input contents)
+def stage_key(stage: Stage, hasher: FileHasher) -> str:
+    payload = {
+        "name": stage.name,
+        "params": jsonable(stage.params),
+        "env": jsonable(stage.env),
+        "code": code_hash(stage.fn),
+        "inputs": {p: hasher(p) for p in stage.inputs},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+# Content-addressed store of stage outputs: <cache_dir>/<stage>/<key>/
+class StageCache:
+    def __init__(self, cache_dir: str = CACHE_DIR, keep: int = KEEP_PER_STAGE):
+        self.dir = Path(cache_dir)
+        self.keep = keep
+        self.state_path = self.dir / "state.json"
+        self.state = {"stages": {}, "files": {}}
+        if self.state_path.exists():
+            with open(self.state_path, encoding="utf-8") as f:
+                self.state.update(json.load(f))
+        self.hasher = FileHasher(self.state.get("files"))
+        self._lock = threading.Lock()
+
+    def _entry_dir(self, stage: Stage, key: str) -> Path:
+        return self.dir / stage.name / key[:16]
+
+    # True when outputs on disk already are the ones produced for `key`
+    def is_current(self, stage: Stage, key: str) -> bool:
+        rec = self.state["stages"].get(stage.name)
+        if not rec or rec.get("key") != key:
+            return False
+        return all(self.hasher(p) == rec["outputs"].get(p) for p in stage.outputs)
+
+    # Restore outputs of an earlier run with the same key (e.g. a reverted parameter)
+    def restore(self, stage: Stage, key: str) -> bool:
+        entry = self._entry_dir(stage, key)
+        if not stage.outputs or not (entry / "manifest.json").exists():
+            return False
+        with open(entry / "manifest.json", encoding="utf-8") as f:
+            files = json.load(f)["files"]
+        if set(files) != set(stage.outputs):
+            return False
+        for out, stored in files.items():
+            os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+            shutil.copy2(entry / stored, out)
+        self.record(stage, key, store=False)
+        return True
+
+    def record(self, stage: Stage, key: str, store: bool = True):
+        outputs = {p: self.hasher(p) for p in stage.outputs}
+        if store and stage.outputs and all(v != "missing" for v in outputs.values()):
+            entry = self._entry_dir(stage, key)
+            entry.mkdir(parents=True, exist_ok=True)
+            files = {}
+            for i, p in enumerate(stage.outputs):
+                stored = f"{i}_{Path(p).name}"
+                shutil.copy2(p, entry / stored)
+                files[p] = stored
+            with open(entry / "manifest.json", "w", encoding="utf-8") as f:
+                json.dump({"key": key, "files": files, "created_at": now_iso()}, f, ensure_ascii=False, indent=2)
+            self._prune(stage)
+
+        with self._lock:
+            self.state["stages"][stage.name] = {"key": key, "outputs": outputs, "updated_at": now_iso()}
+
+    def _prune(self, stage: Stage):
+        entries = sorted((self.dir / stage.name).iterdir(), key=lambda e: e.stat().st_mtime, reverse=True)
+        for old in entries[self.keep:]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    def save(self):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self.state["files"] = self.hasher.known
+            tmp = str(self.state_path) + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.state_path)
+
+
+# Stage -> stages it depends on (producers of its inputs + explicit `after`)
+def build_deps(stages: Sequence[Stage]) -> Dict[str, set]:
+    producer = {}
+    for s in stages:
+        for out in s.outputs:
+            if out in producer:
+                raise ValueError(f"출력 파일이 두 stage에서 생성됩니다: {out} ({producer[out]}, {s.name})")
+            producer[out] = s.name
+
+    names = {s.name for s in stages}
+    deps = {}
+    for s in stages:
+        d = {producer[p] for p in s.inputs if p in producer and producer[p] != s.name}
+        unknown = set(s.after) - names
+        if unknown:
+            raise KeyError(f"{s.name}: 알 수 없는 stage {sorted(unknown)}")
+        deps[s.name] = d | set(s.after)
+    return deps
+
+
+def _check_acyclic(deps: Dict[str, set]):
+    state = {}
+
+    def visit(n, path):
+        if state.get(n) == 1:
+            raise ValueError(f"stage 순환 의존: {' -> '.join(path + [n])}")
+        if state.get(n) == 2:
+            return
+        state[n] = 1
+        for d in deps[n]:
+            visit(d, path + [n])
+        state[n] = 2
+
+    for n in deps:
+        visit(n, [])
+
+
+# Run stages in dependency order; independent stages run concurrently
+def run_dag(
+    stages: Sequence[Stage],
+    targets: Optional[Iterable[str]] = None,
+    force: Iterable[str] = (),
+    max_workers: int = 4,
+    cache_dir: str = CACHE_DIR,
+) -> Dict[str, str]:
+    by_name = {s.name: s for s in stages}
+    deps = build_deps(stages)
+    _check_acyclic(deps)
+
+    # Limit to targets and everything upstream of them
+    if targets is not None:
+        wanted, todo = set(), list(targets)
+        while todo:
+            n = todo.pop()
+            if n not in wanted:
+                wanted.add(n)
+                todo.extend(deps[n])
+        by_name = {n: s for n, s in by_name.items() if n in wanted}
+
+    force = set(force)
+    cache = StageCache(cache_dir)
+    status: Dict[str, str] = {}
+    pending = dict(by_name)
+    running = {}
+    t_all = time.perf_counter()
+
+    def execute(stage: Stage) -> str:
+        key = stage_key(stage, cache.hasher)
+        if stage.name not in force and stage.outputs:
+            if cache.is_current(stage, key):
+                return "skipped"
+            if cache.restore(stage, key):
+                return "restored"
+
+        t0 = time.perf_counter()
+        print(f"\n=== {stage.name.upper()} ===")
+        stage.run()
+        cache.record(stage, key)
+        print(f"[INFO] stage {stage.name}: {time.perf_counter() - t0:.1f}s")
+        return "ran"
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            while pending or running:
+                for name in list(pending):
+                    up = deps[name] & set(by_name)
+                    if any(status.get(d) in ("failed", "blocked") for d in up):
+                        status[name] = "blocked"
+                        del pending[name]
+                    elif all(status.get(d) in ("ran", "skipped", "restored") for d in up):
+                        running[ex.submit(execute, pending.pop(name))] = name
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    try:
+                        status[name] = fut.result()
+                    except Exception as e:
+                        status[name] = "failed"
+                        print(f"[ERROR] stage {name} 실패: {type(e).__name__}: {e}")
+    finally:
+        cache.save()
+
+    print(f"\n[DONE] DAG {time.perf_counter() - t_all:.1f}s")
+    for name in by_name:
+        print(f"  {name:<12} {status.get(name, 'blocked')}")
+
+    failed = [n for n, s in status.items() if s == "failed"]
+    if failed:
+        raise RuntimeError(f"실패한 stage: {failed}")
+    return status
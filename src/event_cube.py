@@ -0,0 +1,175 @@
+# src/event_cube.py
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.boundary import clip_to_boundary
+from src.cellkey import CELL_COL, cell_to_grid_id
+from src.grid import CELL_SIZE_M, add_grid_columns
+from src.storage import read_table, table_exists, write_table
+
+
+# Daily counts keyed by (date, cell, 구정보, 유형); rollups replace the date key
+CUBE_PATH = "data/event_cube.parquet"
+DIMENSIONS = ("구정보", "유형")
+ROLLUPS = ("week", "month", "weekday")   # week = Monday of the ISO week, weekday 0 = Monday
+
+
+def rollup_path(cube_path: str, freq: str) -> str:
+    p = Path(cube_path)
+    return str(p.with_name(f"{p.stem}_{freq}{p.suffix}"))
+
+
+def _time_key(dates: pd.Series, freq: str) -> pd.Series:
+    if freq == "week":
+        return (dates - pd.to_timedelta(dates.dt.weekday, unit="D")).dt.normalize()
+    if freq == "month":
+        return dates.dt.month.astype("int16")
+    if freq == "weekday":
+        return dates.dt.weekday.astype("int8")
+    raise ValueError(f"freq는 {ROLLUPS} 중 하나여야 합니다: {freq}")
+
+
+# after (lat/lon + 신고일/구정보/유형) -> daily event cube
+def build_event_cube(
+    after: pd.DataFrame,
+    cell_size_m: int = CELL_SIZE_M,
+    kind: str = "square",
+    boundary="seoul",
+) -> pd.DataFrame:
+    missing = [c for c in ("신고일", *DIMENSIONS) if c not in after.columns]
+    if missing:
+        raise KeyError(f"after에 {missing} 컬럼이 없습니다. geo 단계를 다시 실행하세요.")
+
+    df = after.dropna(subset=["신고일"])
+    if len(df) < len(after):
+        print(f"[INFO] 신고일 없음 제외: {len(after) - len(df)}건")
+
+    df_grid = add_grid_columns(df, cell_size_m=cell_size_m, kind=kind)
+    if boundary is not None:
+        df_grid = clip_to_boundary(df_grid, boundary)
+
+    cube = (
+        df_grid.rename(columns={"신고일": "date"})
+        .groupby(["date", CELL_COL, *DIMENSIONS], observed=True, sort=False)
+        .size()
+        .reset_index(name="count")
+    )
+    # Date-sorted rows: time windows are contiguous slices (and Parquet row groups)
+    return cube.sort_values(["date", CELL_COL], kind="stable").reset_index(drop=True)
+
+
+# Sum the daily cube up to week / month / weekday
+def rollup(cube: pd.DataFrame, freq: str) -> pd.DataFrame:
+    keyed = cube.assign(**{freq: _time_key(cube["date"], freq)})
+    out = (
+        keyed.groupby([freq, CELL_COL, *DIMENSIONS], observed=True, sort=False)["count"]
+        .sum()
+        .reset_index()
+    )
+    return out.sort_values([freq, CELL_COL], kind="stable").reset_index(drop=True)
+
+
+# In-memory cube with date-range slicing and precomputed rollups
+class EventCube:
+    def __init__(self, cube: pd.DataFrame, rollups: Optional[Dict[str, pd.DataFrame]] = None):
+        self.cube = cube
+        self._dates = cube["date"].to_numpy()
+        self.rollups = dict(rollups or {})
+
+    @classmethod
+    def load(cls, path: str = CUBE_PATH) -> "EventCube":
+        if not table_exists(path):
+            raise FileNotFoundError(f"{path} 파일이 없습니다.")
+        cube = read_table(path, schema="event_cube")
+        rollups = {f: read_table(rollup_path(path, f), schema="event_cube") for f in ROLLUPS if table_exists(rollup_path(path, f))}
+        return cls(cube, rollups)
+
+    def rollup(self, freq: str) -> pd.DataFrame:
+        if freq not in self.rollups:
+            self.rollups[freq] = rollup(self.cube, freq)
+        return self.rollups[freq]
+
+    # Rows with start <= date <= end (binary search on the sorted date column)
+    def window(self, start=None, end=None) -> pd.DataFrame:
+        lo = 0 if start is None else np.searchsorted(self._dates, np.datetime64(pd.Timestamp(start)), "left")
+        hi = len(self._dates) if end is None else np.searchsorted(self._dates, np.datetime64(pd.Timestamp(end)), "right")
+        return self.cube.iloc[lo:hi]
+
+    # Event counts per cell (or per 구정보 / 유형) for a time window and filters
+    def risk(
+        self,
+        start=None,
+        end=None,
+        gu: Optional[Sequence[str]] = None,
+        types: Optional[Sequence[str]] = None,
+        weekdays: Optional[Sequence[int]] = None,
+        by: str = CELL_COL,
+    ) -> pd.DataFrame:
+        df = self.window(start, end)
+        mask = np.ones(len(df), dtype=bool)
+        if gu is not None:
+            mask &= df["구정보"].isin(list(gu)).to_numpy()
+        if types is not None:
+            mask &= df["유형"].isin(list(types)).to_numpy()
+        if weekdays is not None:
+            mask &= np.isin(df["date"].dt.weekday.to_numpy(), list(weekdays))
+
+        out = df[mask].groupby(by, observed=True, sort=False)["count"].sum().sort_values(ascending=False).reset_index()
+        if by == CELL_COL:
+            out.insert(0, "grid_id", cell_to_grid_id(out[CELL_COL]))
+        return out
+
+
+# after -> data/event_cube (+ _week / _month / _weekday rollups)
+def make_event_cube(
+    input_path: str = "data/after.parquet",
+    cube_path: str = CUBE_PATH,
+    rollups: Sequence[str] = ROLLUPS,
+    cell_size_m: int = CELL_SIZE_M,
+    kind: str = "square",
+    boundary="seoul",
+    raw_dir: str = "original_data",
+    months: Sequence[int] = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11),
+    cache_path: str = "data/geocode_cache.sqlite",
+):
+    if not table_exists(input_path):
+        raise FileNotFoundError(f"{input_path} 파일이 없습니다.")
+
+    t0 = time.perf_counter()
+    after = read_table(input_path, schema="after")
+
+    # after from before the cube (month/lat/lon only): rebuild the rows from the
+    # raw month files, resolving addresses from the geocode cache without API calls
+    missing = [c for c in ("신고일", *DIMENSIONS) if c not in after.columns]
+    if missing:
+        from src.pipeline_geo import load_geocoded
+        print(f"[INFO] {input_path}에 {missing} 컬럼이 없어 원본 월 파일과 캐시로 다시 구성합니다.")
+        if not all(os.path.exists(os.path.join(raw_dir, f"{m}.csv")) for m in months):
+            raise FileNotFoundError(f"{raw_dir}에 월별 원본 CSV가 없습니다. geo 단계를 다시 실행하세요.")
+        after = load_geocoded(raw_dir, tuple(months), cache_path=cache_path, offline=True)
+    cube = build_event_cube(after, cell_size_m=cell_size_m, kind=kind, boundary=boundary)
+    write_table(cube, cube_path, schema="event_cube")
+    print(f"[INFO] event cube 저장 완료: {cube_path} (rows={len(cube)}, events={int(cube['count'].sum())})")
+
+    for freq in rollups:
+        out = rollup(cube, freq)
+        write_table(out, rollup_path(cube_path, freq), schema="event_cube")
+        print(f"[INFO] {freq} rollup 저장 완료: {rollup_path(cube_path, freq)} (rows={len(out)})")
+
+    print(f"[DONE] event cube: {time.perf_counter() - t0:.1f}s")
+    return cube
+
+
+def main():
+    make_event_cube()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# src/feature_store.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from src.cache_policy import now_iso
+from src.hashing import FileHasher, code_hash, jsonable
+from src.make_features import compute_features, make_lag_features
+from src.neighbor_features import add_neighbor_features
+from src.panel import CellPanel
+from src.storage import read_table, table_exists, write_table
+
+
+# Materialized feature tables named by a hash of (config, input data, feature code)
+STORE_DIR = "data/feature_store"
+MAX_BYTES = 512 * 2 ** 20   # evict least recently used tables above this total
+MAX_VERSIONS = 8
+
+
+def _feature_code() -> str:
+    h = hashlib.sha256()
+    for fn in (make_lag_features, CellPanel, add_neighbor_features):
+        h.update(code_hash(fn).encode("ascii"))
+    return h.hexdigest()
+
+
+class FeatureStore:
+    def __init__(self, root: str = STORE_DIR, max_bytes: int = MAX_BYTES, max_versions: int = MAX_VERSIONS):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_versions = max_versions
+        self.index_path = self.root / "index.json"
+        self.index = {"versions": {}, "files": {}}
+        if self.index_path.exists():
+            with open(self.index_path, encoding="utf-8") as f:
+                self.index.update(json.load(f))
+        self.hasher = FileHasher(self.index.get("files"))
+        self._lock = threading.Lock()
+
+    def _save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index["files"] = self.hasher.known
+        tmp = self.index_path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.index_path)
+
+    # Config (+ input content + feature code) -> short version id
+    def version_of_config(self, in_path: str, **config) -> tuple:
+        spec = {
+            "config": jsonable(config),
+            "input": self.hasher(in_path),
+            "code": _feature_code(),
+        }
+        key = json.dumps(spec, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16], spec
+
+    def path_for(self, version: str) -> str:
+        return str(self.root / f"features_{version}.parquet")
+
+    def get(self, version: str) -> Optional[dict]:
+        entry = self.index["versions"].get(version)
+        if entry and table_exists(entry["path"]):
+            return entry
+        return None
+
+    # Version of an existing table (store copy or any byte-identical copy of it)
+    def version_of_table(self, path: str) -> Optional[str]:
+        if not Path(path).exists():
+            return None
+        digest = self.hasher(path)
+        for version, entry in self.index["versions"].items():
+            if entry.get("sha256") == digest:
+                return version
+        return None
+
+    def touch(self, version: str):
+        with self._lock:
+            self.index["versions"][version]["last_used"] = now_iso()
+            self._save()
+
+    # Build the table for this config unless it is already stored
+    def materialize(self, in_path: str = "data/predata.parquet", **config) -> dict:
+        if not table_exists(in_path):
+            raise FileNotFoundError(f"입력 파일이 없습니다: {in_path}")
+
+        version, spec = self.version_of_config(in_path, **config)
+        entry = self.get(version)
+        if entry:
+            self.touch(version)
+            print(f"[INFO] feature store hit: {version} ({entry['rows']} rows)")
+            return entry
+
+        df_feat = compute_features(read_table(in_path, schema="predata"), **config)
+        path = self.path_for(version)
+        write_table(df_feat, path, schema="features")
+
+        with self._lock:
+            self.index["versions"][version] = {
+                "version": version,
+                "path": path,
+                "rows": len(df_feat),
+                "bytes": os.path.getsize(path),
+                "sha256": self.hasher(path),
+                "input_path": str(in_path),
+                **spec,
+                "created_at": now_iso(),
+                "last_used": now_iso(),
+            }
+            self._evict(keep=version)
+            self._save()
+        print(f"[INFO] feature store build: {version} ({len(df_feat)} rows)")
+        return self.index["versions"][version]
+
+    # Drop least recently used tables beyond the size / count budget
+    def _evict(self, keep: str):
+        versions = self.index["versions"]
+        for v in [v for v, e in versions.items() if not Path(e["path"]).exists()]:
+            del versions[v]
+
+        lru = sorted((v for v in versions if v != keep), key=lambda v: versions[v]["last_used"])
+        total = sum(e["bytes"] for e in versions.values())
+        while lru and (total > self.max_bytes or len(versions) > self.max_versions):
+            v = lru.pop(0)
+            total -= versions[v]["bytes"]
+            Path(versions.pop(v)["path"]).unlink(missing_ok=True)
+            print(f"[INFO] feature store evict: {v}")
+
+
+def main():
+    store = FeatureStore()
+    for v, e in sorted(store.index["versions"].items(), key=lambda kv: kv[1]["last_used"], reverse=True):
+        print(f"{v}  rows={e['rows']:>7}  {e['bytes'] / 2 ** 20:6.1f} MiB  last_used={e['last_used']}  {e['config']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+# src/geocode_cache.py
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+from typing import Iterable, List
+
+import pandas as pd
+
+from src.cache_journal import CacheJournal, compact_journal, journal_path_for, merge_rows, save_csv
+from src.preprocess import clean_address_series
+from src.road_memo import JUSO_COLUMNS, ROAD_COLUMNS, with_cache_roads
+
+# Store interface and backends. Row format and journal: src.cache_journal;
+# retry policy: src.cache_policy; roadAddr memo: src.road_memo;
+# grid-center reverse cache: src.reverse_cache
+
+DEFAULT_DB_PATH = "data/geocode_cache.sqlite"
+LEGACY_CSV_CACHES = ("data/geocode_cache.csv", "data/geocode_cache_result.csv")
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+
+
+# 1) Cache I/O (path-dispatching, works for CSV and SQLite)
+def load_cache(cache_path: str) -> pd.DataFrame:
+    store = open_cache(cache_path)
+    try:
+        return store.load()
+    finally:
+        store.close()
+
+
+def save_cache(cache: pd.DataFrame, cache_path: str):
+    store = open_cache(cache_path)
+    try:
+        store.save(cache)
+    finally:
+        store.close()
+
+
+# 2) Pluggable cache stores
+class CacheStore:
+    path: str
+
+    def load(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def lookup(self, keys: Iterable[str]) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def known_keys(self, keys: Iterable[str]) -> set:
+        return set(self.lookup(keys)["주소_clean"].astype(str))
+
+    def upsert(self, rows):
+        raise NotImplementedError
+
+    def save(self, cache: pd.DataFrame):
+        self.upsert(cache)
+
+    # Durable per-row writer used while geocoding
+    def writer(self, flush_every: int = 50):
+        raise NotImplementedError
+
+    # Finish a run (fold journals, etc.)
+    def finalize(self, new_rows: List[dict]):
+        pass
+
+    # (jibun -> roadAddr, roadAddr -> coordinates) memo tables
+    def load_road_layers(self):
+        return with_cache_roads(self.load(), pd.DataFrame(columns=JUSO_COLUMNS), pd.DataFrame(columns=ROAD_COLUMNS))
+
+    def save_road_layers(self, juso_rows, road_rows):
+        pass
+
+    def close(self):
+        pass
+
+
+# CSV file + JSONL journal
+class CsvCacheStore(CacheStore):
+    def __init__(self, path: str):
+        self.path = path
+        self._cache = None
+
+    def _frame(self) -> pd.DataFrame:
+        if self._cache is None:
+            # Recover rows journaled by an interrupted run
+            self._cache = compact_journal(self.path)
+        return self._cache
+
+    def load(self) -> pd.DataFrame:
+        return self._frame()
+
+    def lookup(self, keys: Iterable[str]) -> pd.DataFrame:
+        cache = self._frame()
+        keys = pd.Index([str(k) for k in keys])
+        return cache[cache["주소_clean"].astype(str).isin(keys)].reset_index(drop=True)
+
+    def upsert(self, rows):
+        self._cache = merge_rows(self._frame(), rows)
+        save_csv(self._cache, self.path)
+
+    def save(self, cache: pd.DataFrame):
+        self._cache = cache
+        save_csv(cache, self.path)
+
+    def writer(self, flush_every: int = 50):
+        return CacheJournal(journal_path_for(self.path), flush_every=flush_every)
+
+    def finalize(self, new_rows: List[dict]):
+        if new_rows:
+            self.upsert(new_rows)
+        jpath = journal_path_for(self.path)
+        if os.path.exists(jpath):
+            os.remove(jpath)
+
+    def _layer_path(self, name: str) -> str:
+        stem, ext = os.path.splitext(self.path)
+        return f"{stem}_{name}{ext or '.csv'}"
+
+    def load_road_layers(self):
+        juso_p, road_p = self._layer_path("juso"), self._layer_path("road")
+        juso = pd.read_csv(juso_p) if os.path.exists(juso_p) else pd.DataFrame(columns=JUSO_COLUMNS)
+        road = pd.read_csv(road_p) if os.path.exists(road_p) else pd.DataFrame(columns=ROAD_COLUMNS)
+        return with_cache_roads(self._frame(), juso, road)
+
+    def save_road_layers(self, juso_rows, road_rows):
+        for name, key, cols, rows in (
+            ("juso", "주소_clean", JUSO_COLUMNS, juso_rows),
+            ("road", "roadAddr", ROAD_COLUMNS, road_rows),
+        ):
+            new = pd.DataFrame(list(rows), columns=cols)
+            if new.empty:
+                continue
+            path = self._layer_path(name)
+            old = pd.read_csv(path) if os.path.exists(path) else pd.DataFrame(columns=cols)
+            merged = pd.concat([old, new], ignore_index=True).drop_duplicates(key, keep="last")
+            save_csv(merged, path)
+
+
+# Batched SQLite writer (commit every N rows)
+class _SqliteWriter:
+    def __init__(self, store: "SqliteCacheStore", flush_every: int = 50):
+        self.store = store
+        self.flush_every = max(1, int(flush_every))
+        self._buf = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def append(self, row: dict):
+        self._buf.append(row)
+        if len(self._buf) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self._buf:
+            self.store.upsert(self._buf)
+            self._buf = []
+
+    def close(self):
+        self.flush()
+
+
+# Indexed SQLite store (WAL mode, safe for concurrent readers)
+class SqliteCacheStore(CacheStore):
+    TABLE = "geocode_cache"
+    JUSO_TABLE = "juso_cache"
+    ROAD_TABLE = "road_geocode_cache"
+    LOOKUP_CHUNK = 900
+    COLUMN_TYPES = {
+        "roadAddr": "TEXT",
+        "lat": "REAL",
+        "lon": "REAL",
+        "status": "TEXT",
+        "attempts": "INTEGER",
+        "updated_at": "TEXT",
+        "confidence": "REAL",
+        "source": "TEXT",
+    }
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            f"""CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                "주소_clean" TEXT PRIMARY KEY,
+                {", ".join(f"{c} {t}" for c, t in self.COLUMN_TYPES.items())}
+            )"""
+        )
+
+        # Add columns introduced after the table was created
+        have = set(self._columns())
+        for col, typ in self.COLUMN_TYPES.items():
+            if col not in have:
+                self.conn.execute(f"ALTER TABLE {self.TABLE} ADD COLUMN {col} {typ}")
+
+        # Road-address layers: jibun -> roadAddr, roadAddr -> coordinates
+        self.conn.execute(
+            f"""CREATE TABLE IF NOT EXISTS {self.JUSO_TABLE} (
+                "주소_clean" TEXT PRIMARY KEY,
+                roadAddr TEXT,
+                updated_at TEXT
+            )"""
+        )
+        self.conn.execute(
+            f"""CREATE TABLE IF NOT EXISTS {self.ROAD_TABLE} (
+                roadAddr TEXT PRIMARY KEY,
+                lat REAL,
+                lon REAL,
+                status TEXT,
+                updated_at TEXT
+            )"""
+        )
+        self.conn.commit()
+
+    def load(self) -> pd.DataFrame:
+        return pd.read_sql_query(f"SELECT * FROM {self.TABLE}", self.conn)
+
+    def lookup(self, keys: Iterable[str]) -> pd.DataFrame:
+        keys = list(dict.fromkeys(str(k) for k in keys))
+        parts = []
+        for i in range(0, len(keys), self.LOOKUP_CHUNK):
+            chunk = keys[i:i + self.LOOKUP_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            parts.append(
+                pd.read_sql_query(f'SELECT * FROM {self.TABLE} WHERE "주소_clean" IN ({marks})', self.conn, params=chunk)
+            )
+        if not parts:
+            return pd.DataFrame(columns=self._columns())
+        return pd.concat(parts, ignore_index=True)
+
+    def _columns(self, table: str | None = None) -> List[str]:
+        return [r[1] for r in self.conn.execute(f"PRAGMA table_info({table or self.TABLE})")]
+
+    def _upsert(self, table: str, key: str, rows):
+        df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+        if df.empty:
+            return
+        cols = [c for c in self._columns(table) if c in df.columns]
+        df = df[cols].astype(object).where(df[cols].notna(), None)
+        quoted = ",".join(f'"{c}"' for c in cols)
+        marks = ",".join("?" * len(cols))
+        updates = ",".join(f'"{c}"=excluded."{c}"' for c in cols if c != key)
+        with self.conn:
+            self.conn.executemany(
+                f'INSERT INTO {table} ({quoted}) VALUES ({marks}) '
+                f'ON CONFLICT("{key}") DO UPDATE SET {updates}',
+                df.itertuples(index=False, name=None),
+            )
+
+    def upsert(self, rows):
+        self._upsert(self.TABLE, "주소_clean", rows)
+
+    def load_road_layers(self):
+        juso = pd.read_sql_query(f"SELECT * FROM {self.JUSO_TABLE}", self.conn)
+        road = pd.read_sql_query(f"SELECT * FROM {self.ROAD_TABLE}", self.conn)
+        return with_cache_roads(self.load(), juso, road)
+
+    def save_road_layers(self, juso_rows, road_rows):
+        self._upsert(self.JUSO_TABLE, "주소_clean", juso_rows)
+        self._upsert(self.ROAD_TABLE, "roadAddr", road_rows)
+
+    def writer(self, flush_every: int = 50):
+        return _SqliteWriter(self, flush_every=flush_every)
+
+    def replace_all(self, cache: pd.DataFrame):
+        with self.conn:
+            self.conn.execute(f"DELETE FROM {self.TABLE}")
+        self.upsert(cache)
+
+    def close(self):
+        self.conn.close()
+
+
+# Pick backend from the path suffix
+def open_cache(cache_path: str) -> CacheStore:
+    if Path(cache_path).suffix.lower() in SQLITE_SUFFIXES:
+        # Seed the shared default store from the legacy CSV caches
+        seed = not os.path.exists(cache_path) and os.path.abspath(cache_path) == os.path.abspath(DEFAULT_DB_PATH)
+        store = SqliteCacheStore(cache_path)
+        if seed:
+            legacy = [p for p in LEGACY_CSV_CACHES if os.path.exists(p)]
+            if legacy:
+                import_csv_caches(legacy, store=store)
+        return store
+    return CsvCacheStore(cache_path)
+
+
+# 3) One-shot importer: legacy CSV caches -> SQLite
+def import_csv_caches(
+    csv_paths: Iterable[str] = LEGACY_CSV_CACHES,
+    db_path: str = DEFAULT_DB_PATH,
+    store: SqliteCacheStore | None = None,
+) -> int:
+    frames = [compact_journal(p) for p in csv_paths if os.path.exists(p)]
+    if not frames:
+        return 0
+
+    merged = canonicalize_keys(pd.concat(frames, ignore_index=True))
+
+    own = store is None
+    store = store or SqliteCacheStore(db_path)
+    try:
+        store.upsert(merged)
+    finally:
+        if own:
+            store.close()
+
+    print(f"[DONE] SQLite 캐시 import: {len(merged)}건 -> {store.path}")
+    return len(merged)
+
+
+# Re-key cached rows with the current address normalizer
+def canonicalize_keys(cache: pd.DataFrame) -> pd.DataFrame:
+    cache = cache.copy()
+    cache["주소_clean"] = clean_address_series(cache["주소_clean"].astype(str))
+    cache = cache[cache["주소_clean"] != ""]
+
+    # Prefer resolved rows when several old keys collapse into one
+    cache["_ok"] = cache["lat"].notna()
+    cache = cache.sort_values("_ok", kind="stable").drop_duplicates("주소_clean", keep="last")
+    return cache.drop(columns="_ok").reset_index(drop=True)
+
+
+def rekey_cache(cache_path: str = DEFAULT_DB_PATH) -> int:
+    store = open_cache(cache_path)
+    try:
+        before = store.load()
+        after = canonicalize_keys(before)
+        if isinstance(store, SqliteCacheStore):
+            store.replace_all(after)
+        else:
+            store.save(after)
+    finally:
+        store.close()
+
+    print(f"[DONE] 캐시 key 정규화: {len(before)} -> {len(after)}건 ({cache_path})")
+    return len(after)
+
+
+def main():
+    import_csv_caches()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# src/geocode_engine.py
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Optional
+
+
+# Token bucket rate limiter (thread-safe)
+class TokenBucket:
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0):
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# Build per-provider limiters from requests-per-second settings
+def make_limiters(google_rps: Optional[float] = 40.0, juso_rps: Optional[float] = 20.0) -> dict:
+    limiters = {}
+    if google_rps:
+        limiters["google"] = TokenBucket(google_rps)
+    if juso_rps:
+        limiters["juso"] = TokenBucket(juso_rps)
+    return limiters
+
+
+# Run fn over items with a bounded number of in-flight calls.
+# A failing item goes to on_error(item, exc), whose return value (if not None)
+# is handed to on_result like a normal result; the batch keeps running
+def run_concurrent(
+    items: Iterable,
+    fn: Callable,
+    max_in_flight: int = 8,
+    on_result: Optional[Callable] = None,
+    print_every: int = 200,
+    label: str = "geocode",
+    on_error: Optional[Callable] = None,
+) -> dict:
+    items = list(items)
+    total = len(items)
+    done = 0
+    errors = 0
+    t0 = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, int(max_in_flight))) as ex:
+        pending = set()
+        it = iter(items)
+
+        def _submit_next() -> bool:
+            try:
+                item = next(it)
+            except StopIteration:
+                return False
+            fut = ex.submit(fn, item)
+            fut.item = item
+            pending.add(fut)
+            return True
+
+        # Keep at most max_in_flight futures outstanding
+        for _ in range(max(1, int(max_in_flight))):
+            if not _submit_next():
+                break
+
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                pending.discard(fut)
+                done += 1
+                try:
+                    result, failed = fut.result(), False
+                except Exception as e:
+                    errors += 1
+                    if on_error is None:
+                        print(f"[ERROR] {label} 실패: {fut.item!r}: {type(e).__name__}: {e}")
+                        result = None
+                    else:
+                        result = on_error(fut.item, e)
+                    failed = result is None
+                if on_result is not None and not failed:
+                    on_result(fut.item, result)
+                if print_every and done % print_every == 0:
+                    elapsed = time.perf_counter() - t0
+                    print(f"[INFO] {label} {done}/{total} ({done / elapsed if elapsed else 0:.1f}/s)")
+                _submit_next()
+
+    elapsed = time.perf_counter() - t0
+    rate = done / elapsed if elapsed > 0 else 0.0
+    print(f"[INFO] {label} 처리량: {done}건 / {elapsed:.1f}s = {rate:.1f} addr/s" + (f" (오류 {errors}건)" if errors else ""))
+    return {"count": done, "errors": errors, "elapsed_sec": elapsed, "per_sec": rate}
@@ -4,10 +4,24 @@ load_dotenv()
 
 import os
 import time
-import pandas as pd
 import requests
 from typing import Optional, Tuple
 
+from src.cache_policy import (
+    LOCAL_STATUS,
+    SOURCE_JIBUN,
+    SOURCE_LOCAL,
+    SOURCE_ROAD,
+    due_for_retry,
+    now_iso,
+    worse_failure,
+)
+from src.geocode_cache import DEFAULT_DB_PATH, open_cache
+from src.geocode_engine import make_limiters, run_concurrent
+from src.http_client import configure_clients, get_client, print_client_stats
+from src.local_geocoder import EXACT_CONFIDENCE, LocalGeocoder
+from src.road_memo import RoadAddrMemo
+
 
 # 0) Load API keys
 def _get_google_key() -> str:
@@ -21,12 +35,21 @@ def _get_juso_key() -> str:
     return os.getenv("JUSO_CONFM_KEY", "")
 
 
+# Endpoints (overridable, e.g. to point at src/mock_geocode_server.py)
+def _juso_url() -> str:
+    return os.getenv("JUSO_API_URL", "https://www.juso.go.kr/addrlink/addrLinkApi.do")
+
+
+def _google_url() -> str:
+    return os.getenv("GOOGLE_GEOCODE_URL", "https://maps.googleapis.com/maps/api/geocode/json")
+
+
 # 1) JUSO address lookup
 def jibun_to_roadaddr(keyword_addr: str, confm_key: str, timeout=20) -> Optional[str]:
     if not keyword_addr or not confm_key:
         return None
 
-    url = "https://www.juso.go.kr/addrlink/addrLinkApi.do"
+    url = _juso_url()
     params = {
         "confmKey": confm_key,
         "currentPage": 1,
@@ -37,7 +60,7 @@ def jibun_to_roadaddr(keyword_addr: str, confm_key: str, timeout=20) -> Optional
     }
 
     try:
-        r = requests.get(url, params=params, timeout=timeout)
+        r = get_client("juso").get(url, params=params, timeout=timeout)
     except Exception:
         return None
 
@@ -64,17 +87,25 @@ def jibun_to_roadaddr(keyword_addr: str, confm_key: str, timeout=20) -> Optional
 
 
 # 2) Google geocoding
-def google_geocode_one(
+_GOOGLE_STATUS_CLASS = {
+    "ZERO_RESULTS": "zero_results",
+    "INVALID_REQUEST": "invalid",
+    "OVER_QUERY_LIMIT": "quota",
+    "OVER_DAILY_LIMIT": "quota",
+}
+
+
+def google_geocode_status(
     address: str,
     api_key: str,
     timeout=20,
     region="kr",
     language="ko",
-) -> Tuple[Optional[float], Optional[float]]:
+) -> Tuple[Optional[float], Optional[float], str]:
     if not address:
-        return None, None
+        return None, None, "invalid"
 
-    url = "https://maps.googleapis.com/maps/api/geocode/json"
+    url = _google_url()
     params = {
         "address": address,
         "key": api_key,
@@ -83,127 +114,300 @@ def google_geocode_one(
     }
 
     try:
-        r = requests.get(url, params=params, timeout=timeout)
+        r = get_client("google").get(url, params=params, timeout=timeout)
+    except requests.exceptions.Timeout:
+        return None, None, "timeout"
     except Exception:
-        return None, None
+        return None, None, "http_error"
 
     if r.status_code != 200:
         print("[GOOGLE HTTP FAIL]", r.status_code, "| query =", address, "| body =", r.text[:200])
-        return None, None
+        return None, None, "quota" if r.status_code == 429 else "http_error"
 
     try:
         data = r.json()
     except Exception:
-        return None, None
+        return None, None, "http_error"
 
     status = data.get("status")
     if status != "OK":
         err = data.get("error_message")
         if status != "ZERO_RESULTS":
             print("[GOOGLE FAIL]", status, "| query =", address, "| err =", err)
-        return None, None
+        return None, None, _GOOGLE_STATUS_CLASS.get(status, "http_error")
 
     results = data.get("results", [])
     if not results:
-        return None, None
+        return None, None, "zero_results"
 
     try:
         loc = results[0]["geometry"]["location"]
-        return float(loc["lat"]), float(loc["lng"])
+        return float(loc["lat"]), float(loc["lng"]), "ok"
     except Exception:
-        return None, None
-
-
-# 3) Cache I/O
-def load_cache(cache_path: str) -> pd.DataFrame:
-    if os.path.exists(cache_path):
-        cache = pd.read_csv(cache_path)
-
-        # Backfill missing columns
-        if "roadAddr" not in cache.columns:
-            cache["roadAddr"] = pd.NA
-        for col in ["주소_clean", "lat", "lon"]:
-            if col not in cache.columns:
-                cache[col] = pd.NA
+        return None, None, "zero_results"
 
-        cache = cache.drop_duplicates("주소_clean", keep="last")
-    else:
-        cache = pd.DataFrame(columns=["주소_clean", "roadAddr", "lat", "lon"])
 
-    return cache
+def google_geocode_one(
+    address: str,
+    api_key: str,
+    timeout=20,
+    region="kr",
+    language="ko",
+) -> Tuple[Optional[float], Optional[float]]:
+    lat, lon, _ = google_geocode_status(address, api_key, timeout=timeout, region=region, language=language)
+    return lat, lon
 
 
-def save_cache(cache: pd.DataFrame, cache_path: str):
-    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
-    cache.to_csv(cache_path, index=False, encoding="utf-8-sig")
+# 3) Cache I/O (see src/geocode_cache.py, src/cache_journal.py, src/cache_policy.py)
 
 
 # 4) Geocode with road-address fallback
-def geocode_with_roadaddr_fallback(addr: str, api_key: str, confm_key: str):
-    road = jibun_to_roadaddr(addr, confm_key) if confm_key else None
+def _throttle(limiters: Optional[dict], provider: str):
+    if limiters and provider in limiters:
+        limiters[provider].acquire()
 
-    # Debug first few cases
-    if not hasattr(geocode_with_roadaddr_fallback, "_dbg"):
-        geocode_with_roadaddr_fallback._dbg = 0
-    if geocode_with_roadaddr_fallback._dbg < 5:
-        print("[DEBUG] raw  =", addr)
-        print("[DEBUG] road =", road)
-        geocode_with_roadaddr_fallback._dbg += 1
 
+# Also returns which query produced the coordinates (SOURCE_ROAD / SOURCE_JIBUN, None on failure)
+def _geocode_with_source(
+    addr: str,
+    api_key: str,
+    confm_key: str,
+    limiters: Optional[dict] = None,
+    memo: Optional[RoadAddrMemo] = None,
+):
+    road = None
+    hit = False
+    if memo is not None:
+        hit, road = memo.get_road(addr)
+    if not hit and confm_key:
+        _throttle(limiters, "juso")
+        road = jibun_to_roadaddr(addr, confm_key)
+        if memo is not None:
+            memo.put_road(addr, road)
+
+    def _fetch_road():
+        _throttle(limiters, "google")
+        return google_geocode_status(road, api_key)
+
+    road_status = None
     if road:
-        lat, lon = google_geocode_one(road, api_key)
+        # One Google call per distinct roadAddr
+        lat, lon, road_status = memo.coord_for(road, _fetch_road) if memo is not None else _fetch_road()
         if lat is not None:
-            return road, lat, lon
+            return road, lat, lon, road_status, SOURCE_ROAD
 
-    lat, lon = google_geocode_one(addr, api_key)
-    return road, lat, lon
+    _throttle(limiters, "google")
+    lat, lon, status = google_geocode_status(addr, api_key)
 
+    # A transient failure on either query makes the address worth retrying
+    if lat is None and road_status is not None:
+        status = worse_failure(status, road_status)
+    return road, lat, lon, status, (SOURCE_JIBUN if lat is not None else None)
 
-# 5) Fill geocode cache
-def fill_cache_for_addresses(
-    unique_addrs,
-    cache_path="data/geocode_cache.csv",
-    sleep_sec=0.05,
-    print_every=200,
-    retry_unknown_error=2,
+
+def geocode_with_roadaddr_fallback_status(
+    addr: str,
+    api_key: str,
+    confm_key: str,
+    limiters: Optional[dict] = None,
+    memo: Optional[RoadAddrMemo] = None,
 ):
-    api_key = _get_google_key()
-    confm_key = _get_juso_key()
+    return _geocode_with_source(addr, api_key, confm_key, limiters, memo)[:4]
+
+
+def geocode_with_roadaddr_fallback(addr: str, api_key: str, confm_key: str, limiters: Optional[dict] = None):
+    road, lat, lon, _ = geocode_with_roadaddr_fallback_status(addr, api_key, confm_key, limiters)
+    return road, lat, lon
+
+
+# Geocode one address into a cache row
+def _geocode_row(addr, api_key, confm_key, limiters=None, prev_attempts=0, memo=None):
+    road, lat, lon, status, source = _geocode_with_source(addr, api_key, confm_key, limiters, memo)
+    return {
+        "주소_clean": addr,
+        "roadAddr": road,
+        "lat": lat,
+        "lon": lon,
+        "status": status,
+        "attempts": int(prev_attempts) + 1,
+        "updated_at": now_iso(),
+        "confidence": 1.0 if lat is not None else None,
+        "source": source,
+    }
+
 
-    cache = load_cache(cache_path)
+# Row for an address whose lookup raised; the failure class keeps it retryable
+def _failed_row(addr, exc, prev_attempts=0):
+    status = "timeout" if isinstance(exc, requests.exceptions.Timeout) else (
+        "http_error" if isinstance(exc, requests.exceptions.RequestException) else "unknown"
+    )
+    print(f"[ERROR] geocode 실패: {addr}: {type(exc).__name__}: {exc}")
+    return {
+        "주소_clean": addr,
+        "roadAddr": None,
+        "lat": None,
+        "lon": None,
+        "status": status,
+        "attempts": int(prev_attempts) + 1,
+        "updated_at": now_iso(),
+        "confidence": None,
+        "source": None,
+    }
 
-    # Skip cached addresses
-    cache_map = set(cache["주소_clean"].astype(str).tolist())
 
-    need = [a for a in unique_addrs if str(a) not in cache_map]
-    print(f"[INFO] 새로 처리할 주소 수: {len(need)}")
+# Resolve addresses from the local index; return the ones still unresolved
+def _resolve_locally(need, store, min_confidence, prev_attempts, collect, refine_local=False):
+    local = LocalGeocoder.from_store(store).resolve_many(need)
+    hit = local["confidence"] >= min_confidence
+    if refine_local:
+        # Approximations being refined go to the network unless exact
+        hit &= local["confidence"] >= 1.0
 
-    new_rows = []
-    for i, addr in enumerate(need, 1):
-        addr = str(addr).strip()
+    stamp = now_iso()
+    for r in local[hit].itertuples(index=False):
+        collect({
+            "주소_clean": r.주소_clean,
+            "roadAddr": None,
+            "lat": r.lat,
+            "lon": r.lon,
+            "status": "ok" if r.confidence >= 1.0 else LOCAL_STATUS,
+            "attempts": int(prev_attempts.get(r.주소_clean, 0)),
+            "updated_at": stamp,
+            "confidence": r.confidence,
+            "source": SOURCE_LOCAL,
+        })
 
-        road = lat = lon = None
-        for t in range(retry_unknown_error + 1):
-            road, lat, lon = geocode_with_roadaddr_fallback(addr, api_key, confm_key)
-            if lat is not None:
-                break
-            time.sleep(min(1.0, sleep_sec * (2 ** t)))
+    print(f"[INFO] local geocoder: {int(hit.sum())}/{len(need)}건 해석 (min_confidence={min_confidence})")
+    return local.loc[~hit, "주소_clean"].tolist()
 
-        new_rows.append({"주소_clean": addr, "roadAddr": road, "lat": lat, "lon": lon})
 
-        if print_every and i % print_every == 0:
-            ok = sum(1 for r in new_rows if r["lat"] is not None)
-            print(f"[INFO] processing {i}/{len(need)} (ok so far: {ok})")
+OFFLINE_MIN_CONFIDENCE = 0.5   # local approximations accepted when no API is available
 
-        time.sleep(sleep_sec)
 
-    if new_rows:
-        cache = pd.concat([cache, pd.DataFrame(new_rows)], ignore_index=True)
-        cache = cache.drop_duplicates("주소_clean", keep="last")
-        save_cache(cache, cache_path)
+# 5) Fill geocode cache
+def fill_cache_for_addresses(
+    unique_addrs,
+    cache_path=DEFAULT_DB_PATH,
+    sleep_sec=0.05,
+    print_every=200,
+    retry_unknown_error=2,
+    engine="serial",
+    max_in_flight=8,
+    google_rps=40.0,
+    juso_rps=20.0,
+    checkpoint_every=50,
+    local_resolver=True,
+    local_min_confidence=None,
+    refine_local=False,
+    offline=False,
+):
+    if engine not in ("serial", "concurrent"):
+        raise ValueError(f"engine은 'serial' 또는 'concurrent'여야 합니다: {engine}")
+
+    # Online runs take only exact local hits: an interpolated lot would be cached
+    # as final and never reach the API. Approximations are offline-only unless
+    # the caller lowers local_min_confidence explicitly
+    if local_min_confidence is None:
+        local_min_confidence = OFFLINE_MIN_CONFIDENCE if offline else EXACT_CONFIDENCE
+
+    # Offline runs only use the local resolver, so no API keys are needed
+    api_key = None if offline else _get_google_key()
+    confm_key = None if offline else _get_juso_key()
+
+    # Pooled sessions retry 429/5xx and network errors with backoff
+    configure_clients(
+        retries=retry_unknown_error,
+        backoff_factor=max(sleep_sec, 0.1),
+        pool_maxsize=max(10, int(max_in_flight)) if engine == "concurrent" else 4,
+    )
+
+    store = open_cache(cache_path)
+    try:
+        # Skip cached addresses and unexpired negative entries
+        addrs = list(dict.fromkeys(str(a).strip() for a in unique_addrs))
+        known = store.lookup(addrs)
+        due = due_for_retry(known, refine_local=refine_local and not offline)
+        cache_map = set(known.loc[~due, "주소_clean"].astype(str))
+        prev_attempts = dict(zip(known.loc[due, "주소_clean"].astype(str), known.loc[due, "attempts"].fillna(0)))
+
+        need = [a for a in addrs if a not in cache_map]
+        print(f"[INFO] 새로 처리할 주소 수: {len(need)} (engine={engine})")
+        if len(known):
+            neg = int(known["lat"].isna().sum())
+            print(f"[INFO] negative cache: {neg}건 중 재시도 {int(due.sum())}건, skip {neg - int(due.sum())}건")
+
+        new_rows = []
+        t0 = time.perf_counter()
+
+        # Persist every result durably so paid API work survives crashes / Ctrl-C
+        writer = store.writer(flush_every=checkpoint_every)
+
+        def _collect(row):
+            new_rows.append(row)
+            writer.append(row)
+
+        memo = None
+        try:
+            # Local resolver first: exact / nearest-lot hits skip the network
+            if need and (local_resolver or offline):
+                need = _resolve_locally(need, store, local_min_confidence, prev_attempts, _collect, refine_local)
+                if offline:
+                    print(f"[INFO] offline: 로컬 해석 불가 {len(need)}건은 건너뜀")
+                    need = []
+
+            # jibun -> roadAddr -> 좌표 memo shared by all workers
+            memo = RoadAddrMemo.from_store(store) if need else None
+
+            if engine == "concurrent":
+                # Token buckets replace the fixed per-address sleep
+                limiters = make_limiters(google_rps=google_rps, juso_rps=juso_rps)
+                run_concurrent(
+                    need,
+                    lambda addr: _geocode_row(addr, api_key, confm_key, limiters, prev_attempts.get(addr, 0), memo),
+                    max_in_flight=max_in_flight,
+                    on_result=lambda addr, row: _collect(row),
+                    on_error=lambda addr, e: _failed_row(addr, e, prev_attempts.get(addr, 0)),
+                    print_every=print_every,
+                )
+            else:
+                for i, addr in enumerate(need, 1):
+                    try:
+                        row = _geocode_row(addr, api_key, confm_key, prev_attempts=prev_attempts.get(addr, 0), memo=memo)
+                    except Exception as e:
+                        row = _failed_row(addr, e, prev_attempts.get(addr, 0))
+                    _collect(row)
+
+                    if print_every and i % print_every == 0:
+                        ok = sum(1 for r in new_rows if r["lat"] is not None)
+                        print(f"[INFO] processing {i}/{len(need)} (ok so far: {ok})")
+
+                    time.sleep(sleep_sec)
+
+                elapsed = time.perf_counter() - t0
+                if need:
+                    print(f"[INFO] geocode 처리량: {len(need)}건 / {elapsed:.1f}s = {len(need) / elapsed if elapsed else 0:.1f} addr/s")
+        finally:
+            writer.close()
+            if memo is not None:
+                memo.save(store)
+
+        if memo is not None:
+            memo.report()
+        print_client_stats()
+
+        # Compact journal (CSV) / no-op (SQLite)
+        store.finalize(new_rows)
+
+        # Return only the rows callers merge against
+        cache = store.lookup(addrs)
+    finally:
+        store.close()
 
     fail = cache["lat"].isna().sum()
     total = len(cache)
     print(f"[INFO] 지오코딩 실패(unique 기준): {fail}/{total} ({(fail/total*100 if total else 0):.2f}%)")
+    if fail:
+        by_status = cache.loc[cache["lat"].isna(), "status"].fillna("unknown").value_counts()
+        print("[INFO] 실패 유형:", ", ".join(f"{k}={v}" for k, v in by_status.items()))
 
-    return cache
\ No newline at end of file
+    return cache
@@ -1,16 +1,21 @@
 # src/grid.py
 from __future__ import annotations
 
-import os
 import numpy as np
 import pandas as pd
 from pyproj import Transformer
 
+from src.cellkey import CELL_COL, cell_to_grid_id, encode_cell, with_cell
+from src.hexgrid import hex_axial, hex_center
+from src.storage import read_table, table_exists, write_table
+
 
 # Config
 CELL_SIZE_M = 200
 SRC_CRS = "EPSG:4326"   # WGS84 lat/lon
 DST_CRS = "EPSG:5179"   # Korea 2000 (meter)
+LEVEL_COL = "cell_size_m"   # set on multi-resolution (pyramid) tables
+GRID_KINDS = ("square", "hex")   # hex: grid_x/grid_y hold axial q/r
 
 
 def _get_transformer():
@@ -18,29 +23,62 @@ def _get_transformer():
     return Transformer.from_crs(SRC_CRS, DST_CRS, always_xy=True)
 
 
+def _check_kind(kind: str):
+    if kind not in GRID_KINDS:
+        raise ValueError(f"kind는 {GRID_KINDS} 중 하나여야 합니다: {kind}")
+
+
+# lat/lon arrays -> (x_m, y_m, grid_x, grid_y)
+def project_to_grid(lat, lon, transformer=None, cell_size_m: int = CELL_SIZE_M, kind: str = "square"):
+    _check_kind(kind)
+    transformer = transformer or _get_transformer()
+    x_m, y_m = transformer.transform(np.asarray(lon, dtype=float), np.asarray(lat, dtype=float))
+    if kind == "hex":
+        grid_x, grid_y = hex_axial(x_m, y_m, cell_size_m)
+    else:
+        grid_x = np.floor(x_m / cell_size_m).astype(np.int64)
+        grid_y = np.floor(y_m / cell_size_m).astype(np.int64)
+    return x_m, y_m, grid_x, grid_y
+
+
+# Cell centers in projected meters
+def cell_centers(grid_x, grid_y, cell_size_m: int = CELL_SIZE_M, kind: str = "square"):
+    _check_kind(kind)
+    if kind == "hex":
+        return hex_center(grid_x, grid_y, cell_size_m)
+    return (
+        (np.asarray(grid_x, dtype=float) + 0.5) * cell_size_m,
+        (np.asarray(grid_y, dtype=float) + 0.5) * cell_size_m,
+    )
+
+
+def make_grid_ids(grid_x, grid_y) -> pd.Series:
+    return pd.Series(cell_to_grid_id(encode_cell(grid_x, grid_y)))
+
+
 # 1) Add grid columns
 def add_grid_columns(
     df: pd.DataFrame,
     lat_col: str = "lat",
     lon_col: str = "lon",
+    cell_size_m: int = CELL_SIZE_M,
+    kind: str = "square",
 ) -> pd.DataFrame:
     if lat_col not in df.columns or lon_col not in df.columns:
         raise KeyError("입력 df에 lat/lon 컬럼이 필요합니다.")
 
-    out = df.copy()
-    out = out.dropna(subset=[lat_col, lon_col]).copy()
+    # One copy: dropna may hand back a view of the caller's frame on pandas < 3
+    out = df.dropna(subset=[lat_col, lon_col]).copy()
 
-    transformer = _get_transformer()
-    lon = out[lon_col].to_numpy(dtype=float)
-    lat = out[lat_col].to_numpy(dtype=float)
-
-    x_m, y_m = transformer.transform(lon, lat)
+    x_m, y_m, grid_x, grid_y = project_to_grid(out[lat_col], out[lon_col], cell_size_m=cell_size_m, kind=kind)
     out["x_m"] = x_m
     out["y_m"] = y_m
+    out["grid_x"] = grid_x
+    out["grid_y"] = grid_y
 
-    out["grid_x"] = np.floor(out["x_m"] / CELL_SIZE_M).astype(np.int64)
-    out["grid_y"] = np.floor(out["y_m"] / CELL_SIZE_M).astype(np.int64)
-    out["grid_id"] = out["grid_x"].astype(str) + "_" + out["grid_y"].astype(str)
+    # Packed int64 key for joins / groupby; grid_id strings built per unique cell
+    out[CELL_COL] = encode_cell(grid_x, grid_y)
+    out["grid_id"] = cell_to_grid_id(out[CELL_COL])
 
     return out
 
@@ -55,67 +93,100 @@ def build_predata(
         if c not in df_grid.columns:
             raise KeyError(f"입력 df에 '{c}' 컬럼이 필요합니다.")
 
+    df_grid = with_cell(df_grid)
     predata = (
         df_grid
-        .groupby([month_col, grid_id_col])
+        .groupby([month_col, CELL_COL])
         .size()
         .reset_index(name="count")
-        .sort_values([month_col, "count"], ascending=[True, False])
-        .reset_index(drop=True)
     )
-    return predata
+    predata[grid_id_col] = cell_to_grid_id(predata[CELL_COL])
+    predata = predata[[month_col, grid_id_col, "count", CELL_COL]]
+    return order_predata(predata, month_col)
+
+
+# month asc, count desc, then cell key (total order, independent of input order)
+def order_predata(predata: pd.DataFrame, month_col: str = "month") -> pd.DataFrame:
+    predata = with_cell(predata)
+    return predata.sort_values(
+        [month_col, "count", CELL_COL], ascending=[True, False, True], kind="stable"
+    ).reset_index(drop=True)
 
 
 # 3) Build grid metadata
 def build_grid_meta(
     df_grid: pd.DataFrame,
     grid_id_col: str = "grid_id",
+    cell_size_m: int = CELL_SIZE_M,
+    kind: str = "square",
 ) -> pd.DataFrame:
     for c in ["grid_x", "grid_y", grid_id_col]:
         if c not in df_grid.columns:
             raise KeyError(f"입력 df에 '{c}' 컬럼이 필요합니다.")
 
+    df_grid = with_cell(df_grid)
     meta = (
-        df_grid[[grid_id_col, "grid_x", "grid_y"]]
-        .drop_duplicates()
-        .copy()
+        df_grid[[grid_id_col, "grid_x", "grid_y", CELL_COL]]
+        .drop_duplicates(subset=[CELL_COL])
         .sort_values(["grid_x", "grid_y"])
         .reset_index(drop=True)
     )
 
-    meta["center_x_m"] = (meta["grid_x"].to_numpy(dtype=float) + 0.5) * CELL_SIZE_M
-    meta["center_y_m"] = (meta["grid_y"].to_numpy(dtype=float) + 0.5) * CELL_SIZE_M
+    meta["center_x_m"], meta["center_y_m"] = cell_centers(meta["grid_x"], meta["grid_y"], cell_size_m, kind)
 
     # Fix column order
-    meta = meta[[grid_id_col, "grid_x", "grid_y", "center_x_m", "center_y_m"]]
+    meta = meta[[grid_id_col, "grid_x", "grid_y", "center_x_m", "center_y_m", CELL_COL]]
     return meta
 
 
 # 4) Run full pipeline
 def make_predata_and_meta_csv(
-    input_csv: str = "data/after.csv",
-    predata_csv: str = "data/predata.csv",
-    meta_csv: str = "data/grid_meta.csv",
+    input_csv: str = "data/after.parquet",
+    predata_csv: str = "data/predata.parquet",
+    meta_csv: str = "data/grid_meta.parquet",
+    cell_size_m: int = CELL_SIZE_M,
+    kind: str = "square",
+    boundary="seoul",
 ):
-    if not os.path.exists(input_csv):
+    if not table_exists(input_csv):
         raise FileNotFoundError(f"{input_csv} 파일이 없습니다.")
 
-    # Ensure output directories
-    os.makedirs(os.path.dirname(predata_csv), exist_ok=True)
-    os.makedirs(os.path.dirname(meta_csv), exist_ok=True)
-
-    df = pd.read_csv(input_csv)
+    df = read_table(input_csv, schema="after")
 
     # Apply grid mapping
-    df_grid = add_grid_columns(df)
+    df_grid = add_grid_columns(df, cell_size_m=cell_size_m, kind=kind)
+
+    # Coordinate range filter: drop points outside the boundary (None keeps all)
+    if boundary is not None:
+        from src.boundary import clip_to_boundary
+        df_grid = clip_to_boundary(df_grid, boundary)
 
     # Save predata
     predata = build_predata(df_grid)
-    predata.to_csv(predata_csv, index=False)
+    write_table(predata, predata_csv, schema="predata")
 
     # Save grid metadata
-    meta = build_grid_meta(df_grid)
-    meta.to_csv(meta_csv, index=False)
+    meta = build_grid_meta(df_grid, cell_size_m=cell_size_m, kind=kind)
+    write_table(meta, meta_csv, schema="grid_meta")
 
     print(f"[INFO] predata 저장 완료: {predata_csv} (rows={len(predata)})")
-    print(f"[INFO] grid_meta 저장 완료: {meta_csv} (rows={len(meta)})")
\ No newline at end of file
+    print(f"[INFO] grid_meta 저장 완료: {meta_csv} (rows={len(meta)})")
+
+
+# Rows of one resolution from a level-aware (pyramid) table
+def select_level(df: pd.DataFrame, cell_size_m: int | None = None) -> pd.DataFrame:
+    if LEVEL_COL not in df.columns:
+        return df
+
+    levels = sorted(df[LEVEL_COL].unique().tolist())
+    if cell_size_m is None:
+        if len(levels) != 1:
+            raise ValueError(f"여러 해상도가 있는 테이블입니다. cell_size_m을 지정하세요: {levels}")
+        cell_size_m = levels[0]
+    if cell_size_m not in levels:
+        raise ValueError(f"cell_size_m={cell_size_m} 레벨이 없습니다: {levels}")
+
+    out = df[df[LEVEL_COL] == cell_size_m].drop(columns=LEVEL_COL)
+    if isinstance(out["grid_id"].dtype, pd.CategoricalDtype):
+        out["grid_id"] = out["grid_id"].cat.remove_unused_categories()
+    return out.reset_index(drop=True)
@@ -0,0 +1,69 @@
+# src/hashing.py
+from __future__ import annotations
+
+import hashlib
+import inspect
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+
+# Content / code / config hashes shared by the stage cache and the feature store
+
+
+# Params -> JSON-stable values (sorted dict keys, tuples as lists, repr for the rest)
+def jsonable(v):
+    if isinstance(v, (list, tuple, set)):
+        return [jsonable(x) for x in v]
+    if isinstance(v, dict):
+        return {str(k): jsonable(x) for k, x in sorted(v.items())}
+    if isinstance(v, (str, int, float, bool)) or v is None:
+        return v
+    return repr(v)
+
+
+# sha256 of file contents, memoized on (size, mtime_ns)
+class FileHasher:
+    def __init__(self, known: Optional[dict] = None):
+        self.known = dict(known or {})
+        self._lock = threading.Lock()
+
+    def __call__(self, path: str) -> str:
+        p = Path(path)
+        if p.is_dir():
+            h = hashlib.sha256()
+            for child in sorted(c for c in p.rglob("*") if c.is_file()):
+                h.update(str(child.relative_to(p)).encode("utf-8"))
+                h.update(self(str(child)).encode("ascii"))
+            return h.hexdigest()
+        if not p.exists():
+            return "missing"
+
+        st = p.stat()
+        with self._lock:
+            hit = self.known.get(str(p))
+        if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+            return hit[2]
+
+        h = hashlib.sha256()
+        with open(p, "rb") as f:
+            for buf in iter(lambda: f.read(1 << 20), b""):
+                h.update(buf)
+        digest = h.hexdigest()
+        with self._lock:
+            self.known[str(p)] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+
+# Source of fn plus its whole module: helpers it calls count as its code
+def code_hash(fn: Callable) -> str:
+    try:
+        src = inspect.getsource(fn)
+        path = inspect.getsourcefile(fn)
+    except (OSError, TypeError):
+        return repr(fn)
+    h = hashlib.sha256(src.encode("utf-8"))
+    if path and os.path.exists(path):
+        h.update(Path(path).read_bytes())
+    return h.hexdigest()
@@ -0,0 +1,63 @@
+# src/hexgrid.py
+from __future__ import annotations
+
+import numpy as np
+
+from src.cellkey import decode_cell, encode_cell
+
+
+# Pointy-top hexagons in axial (q, r) coordinates, pure NumPy
+# A hex "cell_size_m" has the same area as the square cell of that size,
+# so counts stay comparable between the two binning modes
+SQRT3 = np.sqrt(3.0)
+
+# Axial offsets of the six neighbors (all at distance sqrt(3) * radius)
+HEX_NEIGHBORS = ((1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1))
+
+
+# Circumradius (center -> corner) of the equal-area hexagon
+def hex_radius(cell_size_m: float) -> float:
+    return float(np.sqrt(2.0 * cell_size_m ** 2 / (3.0 * SQRT3)))
+
+
+# Projected meters -> axial (q, r) of the containing hexagon
+def hex_axial(x_m, y_m, cell_size_m: float):
+    size = hex_radius(cell_size_m)
+    x = np.asarray(x_m, dtype=float) / size
+    y = np.asarray(y_m, dtype=float) / size
+
+    # Fractional cube coordinates, then round to the nearest hex center
+    fq = (SQRT3 / 3.0) * x - (1.0 / 3.0) * y
+    fr = (2.0 / 3.0) * y
+    fs = -fq - fr
+    q, r, s = np.rint(fq), np.rint(fr), np.rint(fs)
+
+    dq, dr, ds = np.abs(q - fq), np.abs(r - fr), np.abs(s - fs)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    q = np.where(fix_q, -r - s, q)
+    r = np.where(fix_r, -q - s, r)
+    return q.astype(np.int64), r.astype(np.int64)
+
+
+# Axial (q, r) -> hex center in projected meters
+def hex_center(q, r, cell_size_m: float):
+    size = hex_radius(cell_size_m)
+    q = np.asarray(q, dtype=float)
+    r = np.asarray(r, dtype=float)
+    return size * SQRT3 * (q + r / 2.0), size * 1.5 * r
+
+
+# Hex center -> six corner points (x, y), counter-clockwise from the east-north-east corner
+def hex_corners(center_x_m: float, center_y_m: float, cell_size_m: float):
+    size = hex_radius(cell_size_m)
+    angles = np.deg2rad(30.0 + 60.0 * np.arange(6))
+    return center_x_m + size * np.cos(angles), center_y_m + size * np.sin(angles)
+
+
+# Packed hex keys -> packed keys of their six neighbors, shape (n, 6)
+def hex_neighbors(cell) -> np.ndarray:
+    q, r = decode_cell(cell)
+    dq = np.array([d[0] for d in HEX_NEIGHBORS], dtype=np.int64)
+    dr = np.array([d[1] for d in HEX_NEIGHBORS], dtype=np.int64)
+    return encode_cell(q[:, None] + dq, r[:, None] + dr)
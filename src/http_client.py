@@ -0,0 +1,137 @@
+# src/http_client.py
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+LATENCY_WINDOW = 10000
+
+
+# Pooled keep-alive session for one provider
+class ProviderClient:
+    def __init__(
+        self,
+        name: str,
+        pool_maxsize: int = 16,
+        retries: int = 2,
+        backoff_factor: float = 0.5,
+        timeout: float = 20,
+    ):
+        self.name = name
+        self.timeout = timeout
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            status_forcelist=RETRY_STATUS,
+            allowed_methods=frozenset(["GET"]),
+            backoff_factor=backoff_factor,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self.adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry, pool_block=False)
+
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._calls = 0
+        self._errors = 0
+
+    def get(self, url: str, params: Optional[dict] = None, timeout: Optional[float] = None) -> requests.Response:
+        t0 = time.perf_counter()
+        try:
+            return self.session.get(url, params=params, timeout=timeout or self.timeout)
+        except Exception:
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls += 1
+                self._latencies.append(time.perf_counter() - t0)
+
+    # Connection reuse and latency counters
+    def stats(self) -> dict:
+        pools = self.adapter.poolmanager.pools
+        new_conns = 0
+        http_requests = 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            new_conns += pool.num_connections
+            http_requests += pool.num_requests
+
+        with self._lock:
+            lat = np.asarray(self._latencies, dtype=float)
+            calls, errors = self._calls, self._errors
+
+        p50, p90, p99 = (np.percentile(lat, [50, 90, 99]) * 1000).tolist() if len(lat) else (0.0, 0.0, 0.0)
+        return {
+            "provider": self.name,
+            "calls": calls,
+            "errors": errors,
+            "http_requests": http_requests,
+            "new_connections": new_conns,
+            "reuse_ratio": (1 - new_conns / http_requests) if http_requests else 0.0,
+            "p50_ms": p50,
+            "p90_ms": p90,
+            "p99_ms": p99,
+        }
+
+    def close(self):
+        self.session.close()
+
+
+_clients: dict = {}
+_client_opts: dict = {}
+_clients_lock = threading.Lock()
+
+
+# Shared client per provider
+def get_client(provider: str) -> ProviderClient:
+    with _clients_lock:
+        client = _clients.get(provider)
+        if client is None:
+            client = ProviderClient(provider, **_client_opts)
+            _clients[provider] = client
+        return client
+
+
+# Reset clients with new pool/retry settings
+def configure_clients(**opts):
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+        _client_opts.clear()
+        _client_opts.update(opts)
+
+
+def client_stats() -> list:
+    with _clients_lock:
+        clients = list(_clients.values())
+    return [c.stats() for c in clients]
+
+
+def print_client_stats():
+    for s in client_stats():
+        print(
+            f"[INFO] http[{s['provider']}] calls={s['calls']} errors={s['errors']} "
+            f"conns={s['new_connections']} reuse={s['reuse_ratio']*100:.1f}% "
+            f"p50={s['p50_ms']:.0f}ms p90={s['p90_ms']:.0f}ms p99={s['p99_ms']:.0f}ms"
+        )
@@ -0,0 +1,269 @@
+# src/incremental.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.boundary import clip_to_boundary
+from src.cache_policy import now_iso
+from src.cellkey import CELL_COL, cell_to_grid_id
+from src.geocode_cache import DEFAULT_DB_PATH
+from src.google_geocode import fill_cache_for_addresses
+from src.grid import CELL_SIZE_M, add_grid_columns, build_grid_meta, build_predata, order_predata
+from src.io_loader import load_months
+from src.make_features import ROLLING_STATS, TARGET_COL, build_features, make_lag_features
+from src.neighbor_features import add_neighbor_features, neighbor_columns
+from src.preprocess import clean_address_series
+from src.storage import read_table, table_exists, write_table
+
+
+MANIFEST_PATH = "data/ingest_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path: str, block: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for buf in iter(lambda: f.read(block), b""):
+            h.update(buf)
+    return h.hexdigest()
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> dict:
+    if not os.path.exists(path):
+        return {"version": MANIFEST_VERSION, "months": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest: dict, path: str = MANIFEST_PATH):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+# Month files present in input_dir ("1.csv" ... "12.csv", "13.csv", ...)
+def discover_months(input_dir: str = "original_data") -> list:
+    return sorted(int(m.group(1)) for f in os.listdir(input_dir) if (m := re.fullmatch(r"(\d+)\.csv", f)))
+
+
+# Months whose file is new or whose content hash changed
+def pending_months(input_dir: str, months: Iterable[int], manifest: dict) -> dict:
+    pending = {}
+    for m in months:
+        path = os.path.join(input_dir, f"{m}.csv")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} 파일이 없습니다.")
+        digest = file_sha256(path)
+        if manifest["months"].get(str(m), {}).get("sha256") != digest:
+            pending[m] = digest
+    return pending
+
+
+# One raw month -> its predata rows and grid cells
+def _grid_month(input_dir: str, month: int, cache_path: str, geocode_opts: dict, boundary="seoul"):
+    df = load_months(input_dir, (month,), usecols=["주소"], verbose=False)
+    df["주소_clean"] = clean_address_series(df["주소"])
+
+    # Known addresses are served from the cache; only new ones reach the APIs
+    cache = fill_cache_for_addresses(df["주소_clean"].unique(), cache_path=cache_path, **geocode_opts)
+    merged = df.merge(cache[["주소_clean", "lat", "lon"]], on="주소_clean", how="left")
+
+    df_grid = add_grid_columns(merged)
+    if boundary is not None:
+        df_grid = clip_to_boundary(df_grid, boundary)
+    cells = df_grid[["grid_id", "grid_x", "grid_y", CELL_COL]].drop_duplicates(subset=[CELL_COL])
+    return build_predata(df_grid), cells, len(df)
+
+
+# Recompute only the feature rows a changed month can affect
+def refresh_features(
+    features: Optional[pd.DataFrame],
+    predata: pd.DataFrame,
+    cells: Iterable[int],
+    month: int,
+    lags: Sequence[int] = (1, 2),
+    windows: Sequence[int] = (),
+    stats: Sequence[str] = ROLLING_STATS,
+    ewm_spans: Sequence[float] = (),
+    since_last: bool = False,
+    neighbor_rings: Sequence[int] = (),
+    kde_sigma_m: Optional[float] = None,
+    cell_size_m: int = CELL_SIZE_M,
+    kind: str = "square",
+    rows: str = "observed",
+) -> pd.DataFrame:
+    temporal = {"lags": lags, "windows": windows, "stats": stats, "ewm_spans": ewm_spans, "since_last": since_last}
+    spatial = {"rings": neighbor_rings, "kde_sigma_m": kde_sigma_m, "cell_size_m": cell_size_m, "kind": kind}
+
+    def rebuild(reason: str) -> pd.DataFrame:
+        print(f"[INFO] features 전체 재계산: {reason}")
+        return build_features(predata, neighbor_rings=neighbor_rings, kde_sigma_m=kde_sigma_m,
+                              cell_size_m=cell_size_m, kind=kind, rows=rows, **temporal)
+
+    if features is None or features.empty or predata.empty:
+        return rebuild("기존 features 없음")
+
+    # Rows start max(lags) months into the axis; a new first month moves that for every grid
+    first, last = int(predata["month"].min()), int(predata["month"].max())
+    if int(features["month"].min()) != first + max(lags, default=0):
+        return rebuild("월 축 시작이 바뀜")
+
+    cells = np.fromiter(cells, dtype=np.int64)
+    old_last = int(features["month"].max())
+
+    # Touched grids: rows from month-1 (its target reads `month`) onward. A zero-filled
+    # rows="all" table also gains a row per grid for every month the axis grew by
+    since = month - 1 if rows == "observed" else min(month - 1, old_last + 1)
+
+    # Lags / windows need the last max(lags, window-1) months before that;
+    # EWM and months-since-last read the grid's whole history
+    history = max(max(lags, default=0), max(windows, default=1) - 1)
+    start = first if (ewm_spans or since_last) else max(first, since - history)
+
+    def lag_rows(ids: np.ndarray, lo: int) -> pd.DataFrame:
+        sub = predata[predata[CELL_COL].isin(ids) & (predata["month"] >= lo)]
+        if rows == "all":
+            # Zero rows keep grids without counts in [lo, last] on the panel
+            pad = pd.DataFrame({"month": lo, "grid_id": cell_to_grid_id(ids), "count": 0, CELL_COL: ids})
+            sub = pd.concat([sub[["month", "grid_id", "count", CELL_COL]], pad], ignore_index=True)
+        return make_lag_features(sub, months=np.arange(lo, last + 1), rows=rows, **temporal)
+
+    drop = features[CELL_COL].isin(cells) & (features["month"] >= since)
+    if rows == "all":
+        present = predata[CELL_COL].unique()
+        new = np.setdiff1d(present, features[CELL_COL].unique())
+        redo = present if last > old_last else np.intersect1d(cells, present)
+        fresh = lag_rows(np.setdiff1d(redo, new), start)
+        fresh = fresh[(fresh["month"] >= since) & (fresh[CELL_COL].isin(cells) | (fresh["month"] > old_last))]
+        if len(new):
+            # First-seen grids get their whole zero-filled history
+            fresh = pd.concat([fresh, lag_rows(new, first)], ignore_index=True)
+        # Grids gone from predata have no rows at all
+        drop |= ~features[CELL_COL].isin(present)
+    else:
+        fresh = lag_rows(cells, start)
+        fresh = fresh[fresh["month"] >= since]
+
+    kept = features[~drop].copy()
+    # Untouched grids count 0 at `month` and at months the axis grew by, so targets
+    # reading those are 0 (NaN before when they lay past the old axis end)
+    if TARGET_COL in kept.columns:
+        nxt = kept["month"] + 1
+        kept.loc[(nxt == month) | ((nxt > old_last) & (nxt <= last)), TARGET_COL] = 0.0
+
+    nbr_cols = neighbor_columns(neighbor_rings, kde_sigma_m) if (neighbor_rings or kde_sigma_m) else []
+    if nbr_cols:
+        # Rasters only for the months the refreshed rows sit in
+        fresh = add_neighbor_features(fresh, predata, months=sorted(fresh["month"].unique().tolist()), **spatial)
+
+        # A row's neighbor columns read only its own month's raster: untouched rows at `month`
+        # (zero-filled rows="all" tables; observed rows there are all touched) are redone from it
+        redo = kept["month"] == month
+        if redo.any():
+            redone = add_neighbor_features(kept.loc[redo, [CELL_COL, "month"]], predata, months=[month], **spatial)
+            kept.loc[redo, nbr_cols] = redone[nbr_cols].to_numpy()
+
+    if set(fresh.columns) != set(kept.columns):
+        return rebuild("feature 구성이 기존 테이블과 다름")
+
+    out = pd.concat([kept, fresh[kept.columns]], ignore_index=True)
+    order = np.lexsort((out["month"].to_numpy(), out[CELL_COL].to_numpy()))
+    return out.iloc[order].reset_index(drop=True)
+
+
+# Ingest new / changed month files into predata, grid_meta and features
+def ingest_months(
+    input_dir: str = "original_data",
+    months: Optional[Sequence[int]] = None,
+    manifest_path: str = MANIFEST_PATH,
+    cache_path: str = DEFAULT_DB_PATH,
+    predata_path: str = "data/predata.parquet",
+    meta_path: str = "data/grid_meta.parquet",
+    features_path: str = "data/features.parquet",
+    lags: Sequence[int] = (1, 2),
+    windows: Sequence[int] = (),
+    stats: Sequence[str] = ROLLING_STATS,
+    ewm_spans: Sequence[float] = (),
+    since_last: bool = False,
+    neighbor_rings: Sequence[int] = (),
+    kde_sigma_m: Optional[float] = None,
+    rows: str = "observed",
+    boundary="seoul",
+    **geocode_opts,
+) -> list:
+    months = discover_months(input_dir) if months is None else list(months)
+
+    # Without the stage tables the manifest says nothing
+    have_tables = all(table_exists(p) for p in (predata_path, meta_path))
+    manifest = load_manifest(manifest_path) if have_tables else {"version": MANIFEST_VERSION, "months": {}}
+
+    pending = pending_months(input_dir, months, manifest)
+    if not pending:
+        print("[INFO] 새로 처리할 월 파일이 없습니다.")
+        return []
+
+    predata = read_table(predata_path, schema="predata") if have_tables else None
+    meta = read_table(meta_path, schema="grid_meta") if have_tables else None
+    features = read_table(features_path, schema="features") if have_tables and table_exists(features_path) else None
+
+    for m in sorted(pending):
+        t0 = time.perf_counter()
+        new_pre, new_cells, rows = _grid_month(input_dir, m, cache_path, geocode_opts, boundary)
+
+        # Grids that appear in the old or the new version of this month
+        touched = set(new_pre[CELL_COL].tolist())
+        if predata is not None:
+            old = predata["month"] == m
+            touched |= set(predata.loc[old, CELL_COL].tolist())
+            predata = pd.concat([predata[~old], new_pre], ignore_index=True)
+        else:
+            predata = new_pre
+        predata = order_predata(predata.astype({"grid_id": str}))
+
+        # Keep only cells still referenced by predata
+        cells = new_cells if meta is None else pd.concat([meta[["grid_id", "grid_x", "grid_y", CELL_COL]], new_cells])
+        cells = cells.astype({"grid_id": str})
+        meta = build_grid_meta(cells[cells[CELL_COL].isin(predata[CELL_COL].unique())])
+
+        if features is not None:
+            features = features.astype({"grid_id": str})
+        features = refresh_features(
+            features, predata, touched, m, lags=lags, windows=windows, stats=stats, ewm_spans=ewm_spans,
+            since_last=since_last, neighbor_rings=neighbor_rings, kde_sigma_m=kde_sigma_m, rows=rows,
+        )
+
+        manifest["months"][str(m)] = {
+            "file": f"{m}.csv",
+            "sha256": pending[m],
+            "rows": rows,
+            "cells": int(new_pre["grid_id"].nunique()),
+            "updated_at": now_iso(),
+        }
+        print(f"[INFO] {m}월 반영: rows={rows}, 영향 격자={len(touched)} ({time.perf_counter() - t0:.1f}s)")
+
+    write_table(predata, predata_path, schema="predata")
+    write_table(meta, meta_path, schema="grid_meta")
+    write_table(features, features_path, schema="features")
+    save_manifest(manifest, manifest_path)
+
+    print(f"[DONE] 증분 반영 완료: {sorted(pending)}월 -> {predata_path}, {meta_path}, {features_path}")
+    return sorted(pending)
+
+
+def main():
+    ingest_months()
+
+
+if __name__ == "__main__":
+    main()
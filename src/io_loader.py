@@ -1,21 +1,125 @@
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Sequence
+
 import pandas as pd
 
 
+# Raw schema; some months carry trailing blank header cells, which are skipped
+RAW_COLUMNS = ("번호", "신고일", "구정보", "주소", "유형", "조치일")
+
+# Raw column types (dates are parsed separately: files mix 2025.1.2 and 2025-10-01)
+RAW_DTYPES = {
+    "신고일": "str",
+    "구정보": "str",
+    "주소": "str",
+    "유형": "str",
+    "조치일": "str",
+}
+DATE_COLUMNS = ("신고일", "조치일")
+CATEGORICAL_COLUMNS = ("구정보", "유형")
+
+
+def _csv_engine() -> str:
+    try:
+        import pyarrow  # noqa: F401
+        return "pyarrow"
+    except ImportError:
+        return "c"
+
+
+# Parse 2025.1.2 / 2025-01-02 style dates
+def parse_report_dates(s: pd.Series) -> pd.Series:
+    s = s.astype("string").str.strip().str.replace(".", "-", regex=False)
+    return pd.to_datetime(s, format="%Y-%m-%d", errors="coerce")
+
+
+# Read one monthly file -> (df, seconds)
+def read_month(
+    path: str,
+    usecols: Optional[Sequence[str]] = None,
+    dtype: Optional[dict] = None,
+    engine: Optional[str] = None,
+):
+    t0 = time.perf_counter()
+    cols = list(usecols) if usecols is not None else list(RAW_COLUMNS)
+    types = {c: t for c, t in RAW_DTYPES.items() if c in cols}
+    types.update(dtype or {})
+
+    df = pd.read_csv(path, usecols=cols, dtype=types, engine=engine or _csv_engine())
+    return df, time.perf_counter() - t0
+
+
+# Column names of one monthly file (header only)
+def month_columns(path: str) -> list:
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
 # Load monthly CSV files
 def load_months(
     input_dir="original_data",
     months=(1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11),
+    usecols: Optional[Sequence[str]] = None,
+    dtype: Optional[dict] = None,
+    parse_dates: Sequence[str] = (),
+    categorical: Sequence[str] = CATEGORICAL_COLUMNS,
+    max_workers: Optional[int] = None,
+    engine: Optional[str] = None,
+    verbose: bool = True,
 ) -> pd.DataFrame:
-    dfs = []
-
+    paths = []
     for m in months:
         path = os.path.join(input_dir, f"{m}.csv")
         if not os.path.exists(path):
             raise FileNotFoundError(f"{path} 파일이 없습니다.")
+        paths.append(path)
 
-        df = pd.read_csv(path)
+    if usecols is not None:
+        # Columns needed for post-processing must be read as well
+        usecols = list(dict.fromkeys([*usecols, *parse_dates]))
+
+    # Files are independent; the pyarrow engine releases the GIL while parsing
+    t0 = time.perf_counter()
+    workers = max_workers or min(len(paths), os.cpu_count() or 1) or 1
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        results = list(ex.map(lambda p: read_month(p, usecols, dtype, engine), paths))
+
+    dfs = []
+    for m, path, (df, sec) in zip(months, paths, results):
+        if verbose:
+            print(f"[INFO] {os.path.basename(path)}: rows={len(df)} parse={sec * 1000:.1f} ms")
         df["month"] = m
         dfs.append(df)
 
-    return pd.concat(dfs, ignore_index=True)
+    out = pd.concat(dfs, ignore_index=True)
+    out["month"] = out["month"].astype("int16")
+
+    for col in parse_dates:
+        out[col] = parse_report_dates(out[col])
+    for col in categorical:
+        if col in out.columns:
+            out[col] = out[col].astype("category")
+
+    if verbose:
+        print(f"[INFO] load_months: files={len(paths)} rows={len(out)} "
+              f"total={(time.perf_counter() - t0) * 1000:.1f} ms (workers={workers})")
+    return out
+
+
+# Stream monthly files as (month, chunk) without loading whole months
+def iter_month_chunks(
+    input_dir="original_data",
+    months=(1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11),
+    usecols: Sequence[str] = ("주소",),
+    chunksize: int = 50_000,
+):
+    for m in months:
+        path = os.path.join(input_dir, f"{m}.csv")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} 파일이 없습니다.")
+
+        types = {c: t for c, t in RAW_DTYPES.items() if c in usecols}
+        with pd.read_csv(path, usecols=list(usecols), dtype=types, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield m, chunk
@@ -0,0 +1,122 @@
+# src/local_geocoder.py
+from __future__ import annotations
+
+import math
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# "서울특별시 <구> <동|도로명> [산]<본번>[-<부번>]"
+JIBUN_PATTERN = r"^서울특별시 (?P<gu>\S+구) (?P<dong>\S+) (?P<san>산)?(?P<main>\d+)(?:-(?P<sub>\d+))?$"
+
+EXACT_CONFIDENCE = 1.0
+SAME_MAIN_CONFIDENCE = 0.9
+NEAR_LOT_CONFIDENCE = 0.8
+NEAR_LOT_DECAY = 10.0   # 본번 gap at which confidence falls by 1/e
+MAX_MAIN_GAP = 30
+
+
+# Split addresses into (구, 동, 산, 본번, 부번)
+def parse_jibun(addrs: pd.Series) -> pd.DataFrame:
+    parts = addrs.astype(str).str.extract(JIBUN_PATTERN)
+    parts["san"] = parts["san"].notna()
+    parts["main"] = pd.to_numeric(parts["main"], errors="coerce")
+    parts["sub"] = pd.to_numeric(parts["sub"], errors="coerce").fillna(0)
+    return parts
+
+
+# Offline resolver backed by already-geocoded cache rows
+class LocalGeocoder:
+    def __init__(self, cache: pd.DataFrame):
+        ok = cache[cache["lat"].notna() & cache["lon"].notna()]
+        if "status" in ok.columns:
+            # Never learn from earlier approximations
+            ok = ok[ok["status"].isna() | (ok["status"] == "ok")]
+
+        parts = parse_jibun(ok["주소_clean"])
+        parts["lat"] = ok["lat"].astype(float).to_numpy()
+        parts["lon"] = ok["lon"].astype(float).to_numpy()
+        parts = parts.dropna(subset=["gu", "dong", "main"])
+        parts["main"] = parts["main"].astype(np.int64)
+        parts["sub"] = parts["sub"].astype(np.int64)
+
+        self._exact = {
+            (g, d, s, m, b): (la, lo)
+            for g, d, s, m, b, la, lo in parts[["gu", "dong", "san", "main", "sub", "lat", "lon"]].itertuples(index=False)
+        }
+
+        # Per (구, 동, 산) block: lots sorted by (본번, 부번)
+        self._blocks = {}
+        for key, grp in parts.sort_values(["main", "sub"]).groupby(["gu", "dong", "san"], sort=False):
+            self._blocks[key] = (
+                grp["main"].to_numpy(),
+                grp["sub"].to_numpy(),
+                grp["lat"].to_numpy(),
+                grp["lon"].to_numpy(),
+            )
+
+        print(f"[INFO] local geocoder: {len(self._exact)} lots / {len(self._blocks)} blocks")
+
+    @classmethod
+    def from_store(cls, store) -> "LocalGeocoder":
+        return cls(store.load())
+
+    def _resolve_parts(self, gu, dong, san, main, sub) -> Optional[Tuple[float, float, float]]:
+        hit = self._exact.get((gu, dong, san, main, sub))
+        if hit is not None:
+            return hit[0], hit[1], EXACT_CONFIDENCE
+
+        block = self._blocks.get((gu, dong, san))
+        if block is None:
+            return None
+        mains, subs, lats, lons = block
+
+        # Same 본번: nearest 부번
+        lo, hi = np.searchsorted(mains, main, "left"), np.searchsorted(mains, main, "right")
+        if hi > lo:
+            j = lo + int(np.argmin(np.abs(subs[lo:hi] - sub)))
+            return float(lats[j]), float(lons[j]), SAME_MAIN_CONFIDENCE
+
+        # Nearest 본번 on either side, interpolated when both exist
+        left, right = lo - 1, lo
+        cands = [i for i in (left, right) if 0 <= i < len(mains)]
+        gaps = [abs(int(mains[i]) - main) for i in cands]
+        if not cands or min(gaps) > MAX_MAIN_GAP:
+            return None
+
+        if len(cands) == 2 and max(gaps) <= MAX_MAIN_GAP:
+            w = gaps[1] / (gaps[0] + gaps[1])
+            lat = w * lats[left] + (1 - w) * lats[right]
+            lon = w * lons[left] + (1 - w) * lons[right]
+            gap = min(gaps)
+        else:
+            j = cands[int(np.argmin(gaps))]
+            lat, lon, gap = lats[j], lons[j], min(gaps)
+
+        conf = NEAR_LOT_CONFIDENCE * math.exp(-gap / NEAR_LOT_DECAY)
+        return float(lat), float(lon), conf
+
+    # Resolve one address -> (lat, lon, confidence) or None
+    def resolve(self, addr: str) -> Optional[Tuple[float, float, float]]:
+        r = self.resolve_many([addr]).iloc[0]
+        if pd.isna(r["lat"]):
+            return None
+        return float(r["lat"]), float(r["lon"]), float(r["confidence"])
+
+    def resolve_many(self, addrs: Iterable[str]) -> pd.DataFrame:
+        addrs = pd.Series(list(addrs), dtype=object)
+        parts = parse_jibun(addrs)
+
+        out = np.full((len(addrs), 3), np.nan)
+        valid = parts["gu"].notna() & parts["dong"].notna() & parts["main"].notna()
+        for i, (g, d, s, m, b) in zip(
+            np.flatnonzero(valid.to_numpy()),
+            parts.loc[valid, ["gu", "dong", "san", "main", "sub"]].itertuples(index=False),
+        ):
+            hit = self._resolve_parts(g, d, s, int(m), int(b))
+            if hit is not None:
+                out[i] = hit
+
+        return pd.DataFrame({"주소_clean": addrs, "lat": out[:, 0], "lon": out[:, 1], "confidence": out[:, 2]})
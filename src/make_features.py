@@ -1,43 +1,161 @@
+import shutil
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import List, Optional, Sequence
 
+from src.cellkey import CELL_COL, cell_to_grid_id, with_cell
+from src.grid import CELL_SIZE_M, LEVEL_COL, select_level
+from src.neighbor_features import add_neighbor_features
+from src.panel import CellPanel
+from src.storage import read_table, table_exists, write_table
 
-# Create lag features per grid and month
-def make_lag_features(df: pd.DataFrame, lags: Sequence[int] = (1, 2)) -> pd.DataFrame:
+
+TARGET_COL = "count_t+1"   # next calendar month's count (0 when the cell is absent)
+
+# Trailing-window features (window includes month t); names: count_<stat><window>, count_ewm<span>
+# Opt-in: the defaults keep the 3 lag inputs, pass windows=ROLLING_WINDOWS etc. to add them
+ROLLING_WINDOWS = (3,)
+ROLLING_STATS = ("mean", "std", "max", "slope")
+EWM_SPANS = (3,)
+
+# Columns that are keys, labels or bookkeeping rather than model inputs
+NON_FEATURE_COLS = ("month", "grid_id", "count", CELL_COL, LEVEL_COL, TARGET_COL, "y")
+
+
+# Model inputs of a features table, in table order
+def feature_columns(df: pd.DataFrame) -> List[str]:
+    return [c for c in df.columns if c not in NON_FEATURE_COLS]
+
+
+# Create lag features per grid and month on a zero-filled cell x month panel
+def make_lag_features(
+    df: pd.DataFrame,
+    lags: Sequence[int] = (1, 2),
+    months: Optional[Sequence[int]] = None,
+    rows: str = "observed",
+    windows: Sequence[int] = (),
+    stats: Sequence[str] = ROLLING_STATS,
+    ewm_spans: Sequence[float] = (),
+    since_last: bool = False,
+) -> pd.DataFrame:
     required = {"month", "grid_id", "count"}
     missing = required - set(df.columns)
     if missing:
         raise KeyError(f"make_lag_features() 입력 df에 필요한 컬럼이 없습니다: {sorted(missing)}")
+    if rows not in ("observed", "all"):
+        raise ValueError(f"rows는 'observed' 또는 'all'이어야 합니다: {rows}")
 
-    df = df.sort_values(["grid_id", "month"]).copy()
-    df["count_t"] = df["count"].astype(float)
+    df = with_cell(df)
+    panel = CellPanel.from_predata(df, months=months)
 
-    for lag in lags:
-        df[f"count_t-{lag}"] = df.groupby("grid_id")["count_t"].shift(lag)
+    # observed: rows of the input; all: every (cell, month) of the panel
+    if rows == "all":
+        ci, ti = panel.all_index()
+        df = pd.DataFrame({
+            "month": panel.months[ti],
+            "grid_id": cell_to_grid_id(panel.cells[ci]),
+            "count": panel.values[ci, ti].astype(np.int64),
+            CELL_COL: panel.cells[ci],
+        })
+    else:
+        ci, ti = panel.source_index
 
-    # Drop rows without full lag history
-    lag_cols = [f"count_t-{lag}" for lag in lags]
-    df = df.dropna(subset=["count_t", *lag_cols]).copy()
+    # Rows inside `months` with a full lag window (gaps inside it are zeros), cell-major then month
+    keep = np.flatnonzero((ti >= max(lags, default=0)) & (ti < len(panel.months)))
+    order = keep[panel.cell_major_order(ci[keep], ti[keep])]
+    ci, ti = ci[order], ti[order]
+    df = df.iloc[order].reset_index(drop=True)
+
+    df["count_t"] = panel.at(ci, ti).astype(float)
+    for lag in lags:
+        df[f"count_t-{lag}"] = panel.at(ci, ti, lag)
+    for w in windows:
+        for stat in stats:
+            df[f"count_{stat}{w}"] = panel.at(ci, ti, values=panel.rolling(w, stat))
+    for span in ewm_spans:
+        df[f"count_ewm{span:g}"] = panel.at(ci, ti, values=panel.ewm(span))
+    if since_last:
+        df["months_since_last"] = panel.at(ci, ti, values=panel.months_since_last())
+    df[TARGET_COL] = panel.at(ci, ti, -1)
     return df
 
 
+# Temporal lags / windows + spatial neighbor aggregates for one resolution
+def build_features(
+    predata: pd.DataFrame,
+    lags: Sequence[int] = (1, 2),
+    windows: Sequence[int] = (),
+    stats: Sequence[str] = ROLLING_STATS,
+    ewm_spans: Sequence[float] = (),
+    since_last: bool = False,
+    neighbor_rings: Sequence[int] = (),
+    kde_sigma_m: Optional[float] = None,
+    cell_size_m: int = CELL_SIZE_M,
+    kind: str = "square",
+    rows: str = "observed",
+) -> pd.DataFrame:
+    df_feat = make_lag_features(
+        predata, lags=lags, rows=rows, windows=windows, stats=stats, ewm_spans=ewm_spans, since_last=since_last,
+    )
+    if neighbor_rings or kde_sigma_m:
+        df_feat = add_neighbor_features(
+            df_feat, predata, rings=neighbor_rings, kde_sigma_m=kde_sigma_m, cell_size_m=cell_size_m, kind=kind,
+        )
+    return df_feat
+
+
+# Feature table for one resolution, or for every level of a pyramid input
+def compute_features(df: pd.DataFrame, cell_size_m: Optional[int] = None, **opts) -> pd.DataFrame:
+    if LEVEL_COL in df.columns and cell_size_m is None:
+        # Pyramid input: features for every level, tagged with the level
+        return pd.concat(
+            [build_features(select_level(df, s), cell_size_m=s, **opts).assign(**{LEVEL_COL: s})
+             for s in sorted(df[LEVEL_COL].unique().tolist())],
+            ignore_index=True,
+        )
+    return build_features(select_level(df, cell_size_m), cell_size_m=cell_size_m or CELL_SIZE_M, **opts)
+
+
 # Generate features CSV
 def make_features(
-    in_path: str = "data/predata.csv",
-    out_path: str = "data/features.csv",
+    in_path: str = "data/predata.parquet",
+    out_path: str = "data/features.parquet",
     lags: Sequence[int] = (1, 2),
+    cell_size_m: Optional[int] = None,
+    windows: Sequence[int] = (),
+    stats: Sequence[str] = ROLLING_STATS,
+    ewm_spans: Sequence[float] = (),
+    since_last: bool = False,
+    neighbor_rings: Sequence[int] = (),
+    kde_sigma_m: Optional[float] = None,
+    kind: str = "square",
+    rows: str = "observed",
+    store_dir: Optional[str] = None,
 ) -> Path:
-    in_p = Path(in_path)
-    if not in_p.exists():
+    if not table_exists(in_path):
         raise FileNotFoundError(f"입력 파일이 없습니다: {in_path}")
 
-    df = pd.read_csv(in_p)
-    df_feat = make_lag_features(df, lags=lags)
+    opts = {
+        "lags": lags, "windows": windows, "stats": stats, "ewm_spans": ewm_spans, "since_last": since_last,
+        "neighbor_rings": neighbor_rings, "kde_sigma_m": kde_sigma_m, "kind": kind, "rows": rows,
+    }
+
+    # Versioned store: reuse a table built from the same config and input, then copy it out
+    if store_dir:
+        from src.feature_store import FeatureStore
+        entry = FeatureStore(store_dir).materialize(in_path, cell_size_m=cell_size_m, **opts)
+        out_p = Path(out_path)
+        if out_p.suffix == Path(entry["path"]).suffix:
+            out_p.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(entry["path"], out_p)
+        else:
+            write_table(read_table(entry["path"], schema="features"), out_path, schema="features")
+        print(f"[DONE] features 저장: {out_p} (version={entry['version']}, rows={entry['rows']})")
+        return out_p
 
-    out_p = Path(out_path)
-    out_p.parent.mkdir(parents=True, exist_ok=True)
-    df_feat.to_csv(out_p, index=False)
+    df_feat = compute_features(read_table(in_path, schema="predata"), cell_size_m=cell_size_m, **opts)
+    out_p = write_table(df_feat, out_path, schema="features")
 
     print(f"[DONE] features 저장: {out_p} (rows={len(df_feat)})")
     return out_p
@@ -0,0 +1,198 @@
+# src/mock_geocode_server.py
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import parse_qs, urlparse
+
+from src.geocode_engine import TokenBucket
+
+
+JUSO_PATH = "/addrlink/addrLinkApi.do"
+GOOGLE_PATH = "/maps/api/geocode/json"
+
+# Seoul bounding box used for fake coordinates
+SEOUL_LAT = (37.43, 37.69)
+SEOUL_LON = (126.80, 127.17)
+
+_JIBUN = re.compile(r"^서울특별시 (\S+구) (\S+) 산?(\d+)")
+
+
+def _h(text: str, salt: str = "") -> float:
+    d = hashlib.md5((salt + text).encode("utf-8")).digest()
+    return int.from_bytes(d[:8], "big") / 2 ** 64
+
+
+# Stand-in for the real providers (same response shapes)
+class MockConfig:
+    def __init__(
+        self,
+        latency_ms: float = 30.0,
+        jitter_ms: float = 10.0,
+        error_rate: float = 0.0,
+        zero_rate: float = 0.02,
+        juso_miss_rate: float = 0.05,
+        rps_limit: float = 0.0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.zero_rate = zero_rate
+        self.juso_miss_rate = juso_miss_rate
+        self.bucket = TokenBucket(rps_limit) if rps_limit else None
+        self.counts = {"juso": 0, "google": 0, "reverse": 0, "http_500": 0, "http_429": 0}
+        self.lock = threading.Lock()
+
+    def count(self, key: str):
+        with self.lock:
+            self.counts[key] += 1
+
+
+# Deterministic roadAddr: lots sharing 본번 share one road address
+def fake_road_addr(keyword: str):
+    m = _JIBUN.match(keyword)
+    if not m:
+        return None
+    gu, dong, main = m.group(1), m.group(2), int(m.group(3))
+    road_no = int(_h(gu + dong) * 90) + 1
+    return f"서울특별시 {gu} 모의로{road_no}길 {main} ({dong})"
+
+
+def fake_latlon(address: str) -> Tuple[float, float]:
+    # Stable per 구/동 block with a small per-address offset
+    m = _JIBUN.match(address)
+    block = f"{m.group(1)} {m.group(2)}" if m else address
+    lat = SEOUL_LAT[0] + _h(block, "lat") * (SEOUL_LAT[1] - SEOUL_LAT[0])
+    lon = SEOUL_LON[0] + _h(block, "lon") * (SEOUL_LON[1] - SEOUL_LON[0])
+    return lat + (_h(address, "dy") - 0.5) * 0.004, lon + (_h(address, "dx") - 0.5) * 0.005
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config: MockConfig = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code: int, body: dict, headers: dict | None = None):
+        raw = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(raw)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self):
+        cfg = self.config
+        url = urlparse(self.path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        # Simulated network latency
+        delay = max(0.0, random.gauss(cfg.latency_ms, cfg.jitter_ms)) / 1000
+        time.sleep(delay)
+
+        if cfg.bucket is not None and not cfg.bucket.try_acquire():
+            cfg.count("http_429")
+            return self._send(429, {"error": "throttled"}, {"Retry-After": "1"})
+        if cfg.error_rate and random.random() < cfg.error_rate:
+            cfg.count("http_500")
+            return self._send(500, {"error": "mock failure"})
+
+        if url.path.endswith(JUSO_PATH):
+            cfg.count("juso")
+            return self._juso(q)
+        if url.path.endswith(GOOGLE_PATH):
+            if "latlng" in q:
+                cfg.count("reverse")
+                return self._reverse(q)
+            cfg.count("google")
+            return self._geocode(q)
+        return self._send(404, {"error": "not found"})
+
+    def _juso(self, q):
+        keyword = q.get("keyword", "")
+        road = fake_road_addr(keyword)
+        if road is None or _h(keyword, "juso") < self.config.juso_miss_rate:
+            juso = []
+        else:
+            juso = [{"roadAddr": road, "jibunAddr": keyword}]
+        self._send(200, {"results": {"common": {"errorCode": "0", "errorMessage": "정상"}, "juso": juso}})
+
+    def _geocode(self, q):
+        address = q.get("address", "")
+        if not address:
+            return self._send(200, {"status": "INVALID_REQUEST", "results": []})
+        if _h(address, "zero") < self.config.zero_rate:
+            return self._send(200, {"status": "ZERO_RESULTS", "results": []})
+        lat, lng = fake_latlon(address)
+        self._send(200, {
+            "status": "OK",
+            "results": [{"formatted_address": address, "geometry": {"location": {"lat": lat, "lng": lng}}}],
+        })
+
+    def _reverse(self, q):
+        lat, lon = (float(v) for v in q["latlng"].split(","))
+        gu_no = int(_h(f"{lat:.3f},{lon:.3f}") * 25) + 1
+        self._send(200, {
+            "status": "OK",
+            "results": [{"formatted_address": f"대한민국 서울특별시 모의{gu_no}구 {lat:.5f},{lon:.5f}"}],
+        })
+
+
+# Start server on a daemon thread -> (server, base_url)
+def start_mock_server(host: str = "127.0.0.1", port: int = 0, **config):
+    handler = type("MockHandler", (_Handler,), {"config": MockConfig(**config)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://{host}:{server.server_port}"
+    print(f"[INFO] mock geocode server: {base}")
+    return server, base
+
+
+# Environment that points the pipeline at the mock server
+def mock_env(base_url: str) -> dict:
+    return {
+        "GOOGLE_GEOCODE_URL": base_url + GOOGLE_PATH,
+        "JUSO_API_URL": base_url + JUSO_PATH,
+        "GOOGLE_MAPS_API_KEY": "mock-key",
+        "JUSO_CONFM_KEY": "mock-key",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="local stand-in for Google/JUSO geocoding APIs")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--zero-rate", type=float, default=0.02)
+    parser.add_argument("--rps-limit", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, base = start_mock_server(
+        port=args.port,
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        zero_rate=args.zero_rate,
+        rps_limit=args.rps_limit,
+    )
+    for k, v in mock_env(base).items():
+        print(f"{k}={v}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# src/neighbor_features.py
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.cell_tensor import MAX_DENSE_CELLS, CellTensor, seoul_bounds
+from src.cellkey import CELL_COL, decode_cell, with_cell
+from src.grid import CELL_SIZE_M
+from src.hexgrid import hex_center
+
+
+# Ring-k neighbor sums / maxima and a Gaussian density, from one raster per month
+# Opt-in for make_features: pass neighbor_rings=NEIGHBOR_RINGS, kde_sigma_m=KDE_SIGMA_M
+NEIGHBOR_RINGS = (1, 2)
+KDE_SIGMA_M = 200.0
+
+
+def neighbor_columns(rings: Sequence[int] = NEIGHBOR_RINGS, kde_sigma_m: Optional[float] = KDE_SIGMA_M) -> List[str]:
+    cols = [c for r in rings for c in (f"nbr{r}_sum", f"nbr{r}_max")]
+    return cols + (["nbr_kde"] if kde_sigma_m else [])
+
+
+def _offsets(radius: int):
+    d = np.arange(-radius, radius + 1)
+    dy, dx = np.meshgrid(d, d, indexing="ij")
+    return dx, dy
+
+
+# Lattice distance of each kernel offset (square: Chebyshev, hex: axial hex distance)
+def _ring_distance(radius: int, kind: str) -> np.ndarray:
+    dx, dy = _offsets(radius)
+    if kind == "hex":
+        return (np.abs(dx) + np.abs(dy) + np.abs(dx + dy)) // 2
+    return np.maximum(np.abs(dx), np.abs(dy))
+
+
+# Normalized Gaussian weights over metric offsets, truncated at 3 sigma
+def _gaussian_kernel(sigma_m: float, cell_size_m: int, kind: str) -> np.ndarray:
+    radius = max(1, int(np.ceil(3 * sigma_m / cell_size_m)))
+    dx, dy = _offsets(radius)
+    if kind == "hex":
+        ox, oy = hex_center(dx, dy, cell_size_m)
+    else:
+        ox, oy = dx * float(cell_size_m), dy * float(cell_size_m)
+    w = np.exp(-(ox ** 2 + oy ** 2) / (2 * sigma_m ** 2))
+    return w / w.sum()
+
+
+def _ndimage():
+    try:
+        from scipy import ndimage
+    except ImportError as e:
+        raise ImportError("이웃 feature 계산에는 scipy가 필요합니다.") from e
+    return ndimage
+
+
+# Raster extent: data extent, or the Seoul box when stray cells make it too large.
+# Decided on all of predata, so a raster over a few `months` matches the full build
+def _tensor(predata: pd.DataFrame, cell_size_m: int, kind: str, value_col: str, months=None) -> CellTensor:
+    gx, gy = decode_cell(predata[CELL_COL].to_numpy())
+    n_months = predata["month"].nunique()
+    size = n_months * (int(gx.max() - gx.min()) + 1) * (int(gy.max() - gy.min()) + 1) if len(predata) else 0
+    if size <= MAX_DENSE_CELLS:
+        bounds = (int(gx.min()), int(gy.min()), int(gx.max()), int(gy.max())) if len(predata) else None
+    elif kind == "hex":
+        raise ValueError("hex 격자의 좌표 범위가 너무 넓습니다. boundary 필터를 적용한 predata를 사용하세요.")
+    else:
+        bounds = seoul_bounds(cell_size_m)
+    return CellTensor.from_predata(predata, months=months, value_col=value_col, bounds=bounds, sparse=False)
+
+
+# Neighbor aggregates of `value_col` for every (month, cell) row of `df`
+def add_neighbor_features(
+    df: pd.DataFrame,
+    predata: pd.DataFrame,
+    rings: Sequence[int] = NEIGHBOR_RINGS,
+    kde_sigma_m: Optional[float] = KDE_SIGMA_M,
+    cell_size_m: int = CELL_SIZE_M,
+    kind: str = "square",
+    value_col: str = "count",
+    months: Optional[Sequence[int]] = None,
+) -> pd.DataFrame:
+    ndimage = _ndimage()
+    df = with_cell(df).copy()
+    predata = with_cell(predata)
+
+    # Rasters only for `months` (default: every predata month); rows in other months get zeros
+    tensor = _tensor(predata, cell_size_m, kind, value_col, months=months)
+    grid = tensor.data
+
+    # Feature rows -> raster positions; rows outside the raster get zeros
+    iy, ix, ok = tensor.positions(df[CELL_COL].to_numpy())
+    t = pd.Index(tensor.months).get_indexer(df["month"].to_numpy(dtype=np.int64))
+    ok &= t >= 0
+    t, iy, ix = t[ok], iy[ok], ix[ok]
+
+    def scatter(name: str, plane: np.ndarray):
+        out = np.zeros(len(df), dtype=np.float32)
+        out[ok] = plane[t, iy, ix]
+        df[name] = out
+
+    # Kernels have no time extent: (1, k, k) filters each month independently
+    for r in rings:
+        dist = _ring_distance(r, kind)
+        ring = (dist >= 1) & (dist <= r)
+        scatter(f"nbr{r}_sum", ndimage.correlate(grid, ring[None].astype(np.float32), mode="constant", cval=0.0))
+        scatter(f"nbr{r}_max", ndimage.maximum_filter(grid, footprint=ring[None], mode="constant", cval=0.0))
+
+    if kde_sigma_m:
+        kernel = _gaussian_kernel(kde_sigma_m, cell_size_m, kind).astype(np.float32)
+        scatter("nbr_kde", ndimage.correlate(grid, kernel[None], mode="constant", cval=0.0))
+
+    return df
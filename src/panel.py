@@ -0,0 +1,152 @@
+# src/panel.py
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.cellkey import CELL_COL, with_cell
+
+
+# Prefix sums along the last axis with a leading zero: window sums are two lookups
+def _trailing_sums(x: np.ndarray, window: int) -> np.ndarray:
+    c = np.zeros(x.shape[:-1] + (x.shape[-1] + 1,))
+    np.cumsum(x, axis=-1, out=c[..., 1:])
+    end = np.arange(1, x.shape[-1] + 1)
+    return c[..., end] - c[..., np.maximum(end - window, 0)]
+
+
+# Dense zero-filled (cells x months) counts; a cell absent in a month counts 0
+class CellPanel:
+    def __init__(self, cells: np.ndarray, months: np.ndarray, values: np.ndarray, source_index=None):
+        self.cells = cells
+        self.months = months
+        self.values = values
+        # (cell index, month index) of the rows the panel was built from
+        self.source_index = source_index
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    # Long (month, cell, count) -> panel over a contiguous month axis
+    @classmethod
+    def from_predata(
+        cls,
+        predata: pd.DataFrame,
+        months: Optional[Sequence[int]] = None,
+        value_col: str = "count",
+        dtype=np.float32,
+    ) -> "CellPanel":
+        df = with_cell(predata)
+        month = df["month"].to_numpy(dtype=np.int64)
+        # Hash factorize; only the unique keys get sorted
+        ci, cells = pd.factorize(df[CELL_COL].to_numpy(dtype=np.int64), sort=True)
+
+        if months is None:
+            months = np.arange(month.min(), month.max() + 1) if len(month) else np.array([], dtype=np.int64)
+        months = np.asarray(months, dtype=np.int64)
+        if len(months) and not np.array_equal(months, np.arange(months[0], months[0] + len(months))):
+            raise ValueError("panel의 months는 연속된 월이어야 합니다.")
+
+        ti = month - (months[0] if len(months) else 0)
+        ok = (ti >= 0) & (ti < len(months))
+        flat = np.bincount(
+            ci[ok] * len(months) + ti[ok],
+            weights=df[value_col].to_numpy(dtype=float)[ok],
+            minlength=len(cells) * len(months),
+        )
+        return cls(cells, months, flat.reshape(len(cells), len(months)).astype(dtype), (ci, ti))
+
+    # Values k months before (cell index, month index) positions, without a full shifted copy
+    # `values` defaults to the counts; any (cells x months) array derived from them works
+    def at(self, ci: np.ndarray, ti: np.ndarray, k: int = 0, values: Optional[np.ndarray] = None) -> np.ndarray:
+        values = self.values if values is None else values
+        n_months = len(self.months)
+        src = ti - k
+        out = values.ravel().take(ci * n_months + np.clip(src, 0, n_months - 1))
+        out[(src < 0) | (src >= n_months)] = np.nan
+        return out
+
+    def _window_sums(self, window: int, weights: Optional[np.ndarray] = None):
+        x = self.values.astype(np.float64)
+        if weights is not None:
+            x = x * weights
+        return _trailing_sums(x, window)
+
+    # Months in the trailing window of each month (partial at the start of the axis)
+    def _window_len(self, window: int) -> np.ndarray:
+        return np.minimum(np.arange(1, len(self.months) + 1), window).astype(np.float64)
+
+    # Trailing window (t-window+1 .. t) statistics, O(cells x months) for any window
+    def rolling(self, window: int, stat: str) -> np.ndarray:
+        if window < 1:
+            raise ValueError(f"window는 1 이상이어야 합니다: {window}")
+        n = self._window_len(window)
+        if stat == "mean":
+            out = self._window_sums(window) / n
+        elif stat == "std":
+            mean = self._window_sums(window) / n
+            out = np.sqrt(np.maximum(self._window_sums(window, self.values) / n - mean ** 2, 0.0))
+        elif stat == "max":
+            out = self._rolling_max(window)
+        elif stat == "slope":
+            # OLS slope of count on month: (n*Sxy - Sx*Sy) / (n*Sxx - Sx^2), with x = month index
+            t = np.arange(len(self.months), dtype=np.float64)
+            sy = self._window_sums(window)
+            sxy = self._window_sums(window, t)
+            sx = _trailing_sums(t, window)
+            sxx = _trailing_sums(t ** 2, window)
+            den = n * sxx - sx ** 2
+            out = np.divide(n * sxy - sx * sy, den, out=np.zeros_like(sy), where=den > 0)
+        else:
+            raise ValueError(f"지원하지 않는 rolling 통계입니다: {stat} (mean/std/max/slope)")
+        return out.astype(self.values.dtype)
+
+    # van Herk / Gil-Werman: block prefix / suffix maxima, two lookups per month
+    def _rolling_max(self, window: int) -> np.ndarray:
+        n_cells, n_months = self.values.shape
+        if n_cells == 0 or n_months == 0:
+            return np.empty((n_cells, n_months), dtype=self.values.dtype)
+        pad = window - 1
+        blocks = -(-(n_months + pad) // window)
+        x = np.full((n_cells, blocks * window), -np.inf)
+        x[:, pad:pad + n_months] = self.values
+
+        b = x.reshape(n_cells, blocks, window)
+        prefix = np.maximum.accumulate(b, axis=2).reshape(n_cells, -1)
+        suffix = np.maximum.accumulate(b[:, :, ::-1], axis=2)[:, :, ::-1].reshape(n_cells, -1)
+
+        end = np.arange(pad, pad + n_months)
+        return np.maximum(suffix[:, end - pad], prefix[:, end])
+
+    # Exponentially weighted mean (adjust=False): one vectorized step per month
+    def ewm(self, span: float) -> np.ndarray:
+        alpha = 2.0 / (span + 1.0)
+        out = np.empty_like(self.values)
+        if out.shape[1]:
+            out[:, 0] = self.values[:, 0]
+        for t in range(1, out.shape[1]):
+            out[:, t] = alpha * self.values[:, t] + (1 - alpha) * out[:, t - 1]
+        return out
+
+    # Months since the latest earlier month with a tow; t + 1 when there is none on the axis
+    def months_since_last(self) -> np.ndarray:
+        t = np.arange(len(self.months))
+        seen = np.where(self.values > 0, t, -1)
+        last = np.maximum.accumulate(seen, axis=1)
+        prev = np.full_like(last, -1)
+        prev[:, 1:] = last[:, :-1]
+        return (t - prev).astype(self.values.dtype)
+
+    # Row order of unique (ci, ti) positions: cell-major, month-minor (no sort)
+    def cell_major_order(self, ci: np.ndarray, ti: np.ndarray) -> np.ndarray:
+        slot = np.full(self.values.size, -1, dtype=np.int64)
+        slot[ci * len(self.months) + ti] = np.arange(len(ci))
+        return slot[slot >= 0]
+
+    # Every (cell, month) position in cell-major order
+    def all_index(self):
+        ci, ti = np.divmod(np.arange(self.values.size), self.values.shape[1])
+        return ci, ti
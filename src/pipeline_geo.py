@@ -1,44 +1,85 @@
 import os
-from src.io_loader import load_months
-from src.preprocess import clean_address
+from src.io_loader import load_months, month_columns
+from src.preprocess import clean_address_series
 from src.google_geocode import fill_cache_for_addresses
+from src.storage import write_table
 
 
-# Run full geocoding pipeline
-def geo(
+# Columns kept for src.event_cube when the month files carry them
+CUBE_COLUMNS = ["신고일", "구정보", "유형"]
+
+
+# Raw month files -> report rows with lat/lon (new addresses geocoded into the cache)
+def load_geocoded(
     input_dir="original_data",
     months=(1,2,3,4,5,6,7,8,9,10,11),
-    out_path="data/after.csv",
-    cache_path="data/geocode_cache.csv",
-    sleep_sec=0.05,
+    cache_path="data/geocode_cache.sqlite",
+    cube_columns=None,
+    **fill_opts,
 ):
-    # Ensure output directory exists
-    os.makedirs("data", exist_ok=True)
+    # Cube columns: the ones every month file has, unless the caller names them
+    if cube_columns is None:
+        paths = [os.path.join(input_dir, f"{m}.csv") for m in months]
+        have = [set(month_columns(p)) for p in paths if os.path.exists(p)]
+        cube_columns = [c for c in CUBE_COLUMNS if have and all(c in h for h in have)]
 
-    # Load raw monthly data
-    df = load_months(input_dir, months)
+    # Load raw monthly data (report date / district / type are kept for the event cube)
+    dates = [c for c in cube_columns if c == "신고일"]
+    usecols = ["주소", *[c for c in cube_columns if c != "신고일"]]
+    df = load_months(input_dir, months, usecols=usecols, parse_dates=dates)
     if "주소" not in df.columns:
         raise KeyError("입력 CSV에 '주소' 컬럼이 없습니다.")
 
     print(f"[INFO] 전체 행 수: {len(df)}")
 
     # Normalize address strings
-    df["주소_clean"] = df["주소"].apply(clean_address)
+    df["주소_clean"] = clean_address_series(df["주소"])
 
     # Extract unique addresses
     unique_addrs = df["주소_clean"].unique()
     print(f"[INFO] unique 주소 수: {len(unique_addrs)}")
 
     # Geocode and update cache
-    cache = fill_cache_for_addresses(unique_addrs, cache_path=cache_path, sleep_sec=sleep_sec)
+    cache = fill_cache_for_addresses(unique_addrs, cache_path=cache_path, **fill_opts)
 
     # Merge geocoding results
     merged = df.merge(cache, on="주소_clean", how="left")
+    return merged[["month", "lat", "lon", *[c for c in CUBE_COLUMNS if c in cube_columns]]]
+
+
+# Run full geocoding pipeline
+def geo(
+    input_dir="original_data",
+    months=(1,2,3,4,5,6,7,8,9,10,11),
+    out_path="data/after.parquet",
+    cache_path="data/geocode_cache.sqlite",
+    sleep_sec=0.05,
+    engine="serial",
+    max_in_flight=8,
+    google_rps=40.0,
+    juso_rps=20.0,
+    offline=False,
+    local_resolver=True,
+):
+    # Ensure output directory exists
+    os.makedirs("data", exist_ok=True)
+
+    out = load_geocoded(
+        input_dir,
+        months,
+        cache_path=cache_path,
+        sleep_sec=sleep_sec,
+        engine=engine,
+        max_in_flight=max_in_flight,
+        google_rps=google_rps,
+        juso_rps=juso_rps,
+        offline=offline,
+        local_resolver=local_resolver,
+    )
 
     # Export final output
-    out = merged[["month", "lat", "lon"]]
-    out.to_csv(out_path, index=False, encoding="utf-8-sig")
+    write_table(out, out_path, schema="after")
 
     fail = out["lat"].isna().sum()
-    print(f"[DONE] after.csv 저장 완료: {out_path}")
+    print(f"[DONE] after 저장 완료: {out_path}")
     print(f"[INFO] 지오코딩 실패: {fail}/{len(out)} ({fail/len(out)*100:.2f}%)")
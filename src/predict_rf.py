@@ -1,22 +1,48 @@
-import pandas as pd
 import joblib
 from pathlib import Path
-from typing import Sequence
+from typing import Optional, Sequence
+
+from src.feature_store import STORE_DIR, FeatureStore
+from src.grid import select_level
+from src.storage import read_table, write_table
 
 
 # Predict next month counts using trained RF model
 def predict_rf(
-    data_path: str = "data/features.csv",
+    data_path: Optional[str] = None,
     model_path: str = "model_rf.pkl",
     out_path: str = "data/pred_12.csv",
     pred_month: int = 11,
-    feature_cols: Sequence[str] = ("count_t", "count_t-1", "count_t-2"),
+    feature_cols: Optional[Sequence[str]] = None,
     out_col: str = "count",
+    cell_size_m: Optional[int] = None,
+    store_dir: str = STORE_DIR,
 ) -> Path:
-    df = pd.read_csv(data_path)
     bundle = joblib.load(model_path)
     model = bundle["model"] if isinstance(bundle, dict) else bundle  # Handle wrapped model
 
+    # Default input: the stored feature version the model was trained on
+    version = bundle.get("feature_version") if isinstance(bundle, dict) else None
+    if data_path is None and version:
+        store = FeatureStore(store_dir)
+        entry = store.get(version)
+        if entry is None:
+            raise FileNotFoundError(f"학습에 쓰인 feature 버전이 store에 없습니다: {version}")
+        data_path = entry["path"]
+        store.touch(version)
+        print(f"[INFO] feature version: {version} ({data_path})")
+    df = read_table(data_path or "data/features.parquet", schema="features")
+
+    # Default to the resolution and inputs the model was trained on
+    if cell_size_m is None and isinstance(bundle, dict):
+        cell_size_m = bundle.get("cell_size_m")
+    if feature_cols is None:
+        feature_cols = bundle.get("feature_cols") if isinstance(bundle, dict) else None
+    if feature_cols is None:
+        # Bundles saved before feature_cols was recorded
+        feature_cols = getattr(model, "feature_names_in_", ("count_t", "count_t-1", "count_t-2"))
+    df = select_level(df, cell_size_m)
+
     pred_df = df[df["month"] == pred_month].copy()
     if pred_df.empty:
         raise ValueError(f"pred_month={pred_month}에 해당하는 행이 없습니다. features 생성/월 선택을 확인하세요.")
@@ -30,9 +56,7 @@ def predict_rf(
 
     pred_df[out_col] = model.predict(X_pred)
 
-    out_p = Path(out_path)
-    out_p.parent.mkdir(parents=True, exist_ok=True)
-    pred_df[["grid_id", out_col]].to_csv(out_p, index=False)
+    out_p = write_table(pred_df[["grid_id", out_col]], out_path)
     print(f"[DONE] 예측 결과 저장: {out_p}")
     return out_p
 
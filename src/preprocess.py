@@ -1,12 +1,65 @@
 import re
+import unicodedata
+import numpy as np
 import pandas as pd
 
 
+# Canonicalization rules (applied in order); RE2-compatible so the Series path
+# runs them as Arrow string kernels
+_PARENS = r"\(.*?\)"
+_SEOUL_PREFIX = r"^서울(?:특별시|시)?(\s|$)"
+_BUNJI = r"(\d)\s*번지"
+_SAN = r"(\s)산\s+(\d)"
+_FLOOR_UNIT = r"\s+(?:지하\s*)?[Bb]?\d+\s*(?:층|호|[Ff])(?:\s.*)?$"
+# Building name after a jibun lot ("...동/가/리 [산]본번[-부번] 건물명"); road addresses keep theirs
+_TRAILING_TEXT = r"^(.*?[동가리]\s*산?\d+(?:-\d+)?)\s+\D.*$"
+_SPACES = r"\s+"
+
+# Already-canonical jibun address ("서울특별시 구 동 [산]본번[-부번]")
+_CANONICAL = re.compile(r"서울특별시 [^\s()]+ [^\s()]+ 산?[0-9]+(?:-[0-9]+)?")
+# Same shape in Hangul syllables / ASCII digits only, which NFKC leaves unchanged
+_CANONICAL_NFKC = r"서울특별시 [가-힣0-9]+ [가-힣0-9]+ 산?[0-9]+(?:-[0-9]+)?"
+
+_RULES = [
+    (_PARENS, ""),                    # Remove parentheses
+    (_SPACES, " "),                   # Normalize whitespace
+    (_SEOUL_PREFIX, r"서울특별시\1"),
+    (_BUNJI, r"\1"),                  # 205-9번지 -> 205-9
+    (_SAN, r"\1산\2"),                # 산 12 -> 산12
+    (_FLOOR_UNIT, ""),                # Drop floor / unit suffix
+    (_TRAILING_TEXT, r"\1"),          # Drop building name after a jibun lot number
+]
+_COMPILED = [(re.compile(pat), repl) for pat, repl in _RULES]
+
+
 # Normalize address string
 def clean_address(addr) -> str:
     if pd.isna(addr):
         return ""
-    addr = str(addr).strip()
-    addr = re.sub(r"\(.*?\)", "", addr)   # Remove parentheses
-    addr = re.sub(r"\s+", " ", addr)      # Normalize whitespace
+    addr = str(addr)
+    if _CANONICAL.fullmatch(addr) and unicodedata.is_normalized("NFKC", addr):
+        return addr
+
+    addr = unicodedata.normalize("NFKC", addr).strip()
+    for pat, repl in _COMPILED:
+        addr = pat.sub(repl, addr)
     return addr.strip()
+
+
+# Normalize a whole address Series: one str.replace pass per rule over the
+# unique values that are not canonical yet
+def clean_address_series(s: pd.Series) -> pd.Series:
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+
+    u = pd.Series(uniques, dtype=object).astype(str)
+    todo = ~u.str.fullmatch(_CANONICAL_NFKC).to_numpy(dtype=bool)
+    if todo.any():
+        v = u[todo].str.normalize("NFKC").str.strip()
+        for pat, repl in _RULES:
+            v = v.str.replace(pat, repl, regex=True)
+        u[todo] = v.str.strip()
+    cleaned = u.to_numpy(dtype=object)
+
+    out = cleaned.take(codes) if len(cleaned) else np.full(len(codes), "", dtype=object)
+    out[codes < 0] = ""
+    return pd.Series(out, index=s.index, name=s.name, dtype=object)
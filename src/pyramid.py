@@ -0,0 +1,98 @@
+# src/pyramid.py
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.boundary import clip_to_boundary
+from src.cellkey import CELL_COL, cell_to_grid_id, decode_cell, encode_cell
+from src.grid import LEVEL_COL, add_grid_columns, build_grid_meta, build_predata, order_predata
+from src.storage import read_table, table_exists, write_table
+
+
+# Cell sizes (m); every level must be an integer multiple of the finest one
+PYRAMID_LEVELS = (100, 200, 400, 800)
+
+
+def _check_levels(levels: Sequence[int]) -> list:
+    levels = sorted(set(int(s) for s in levels))
+    base = levels[0]
+    bad = [s for s in levels if s % base]
+    if bad:
+        raise ValueError(f"상위 레벨은 최소 셀 크기({base}m)의 정수배여야 합니다: {bad}")
+    return levels
+
+
+# Finest-level predata -> coarser predata by summing child cells
+def coarsen_predata(predata: pd.DataFrame, factor: int) -> pd.DataFrame:
+    gx, gy = decode_cell(predata[CELL_COL].to_numpy())
+    # Floor division == floor(x / (base * factor)) for integer factors
+    parent = encode_cell(gx // factor, gy // factor)
+    out = (
+        pd.DataFrame({"month": predata["month"].to_numpy(), CELL_COL: parent, "count": predata["count"].to_numpy()})
+        .groupby(["month", CELL_COL], sort=False)["count"]
+        .sum()
+        .reset_index()
+    )
+    out["grid_id"] = cell_to_grid_id(out[CELL_COL])
+    return order_predata(out[["month", "grid_id", "count", CELL_COL]])
+
+
+def _meta_from_cells(cells: np.ndarray, cell_size_m: int) -> pd.DataFrame:
+    gx, gy = decode_cell(cells)
+    df = pd.DataFrame({"grid_id": cell_to_grid_id(cells), "grid_x": gx, "grid_y": gy, CELL_COL: cells})
+    return build_grid_meta(df, cell_size_m=cell_size_m)
+
+
+# One projection pass -> level-aware predata / grid_meta for every cell size
+def build_pyramid(df: pd.DataFrame, levels: Sequence[int] = PYRAMID_LEVELS, boundary="seoul"):
+    levels = _check_levels(levels)
+    base = levels[0]
+
+    df_grid = add_grid_columns(df, cell_size_m=base)
+    if boundary is not None:
+        df_grid = clip_to_boundary(df_grid, boundary)
+    base_pre = build_predata(df_grid)
+
+    pres, metas = [], []
+    for size in levels:
+        pre = base_pre if size == base else coarsen_predata(base_pre, size // base)
+        meta = _meta_from_cells(pre[CELL_COL].unique(), size)
+        pres.append(pre.assign(**{LEVEL_COL: size}))
+        metas.append(meta.assign(**{LEVEL_COL: size}))
+        print(f"[INFO] pyramid {size}m: predata={len(pre)} cells={len(meta)}")
+
+    predata = pd.concat(pres, ignore_index=True)
+    meta = pd.concat(metas, ignore_index=True)
+    return predata[[LEVEL_COL, *pres[0].columns.drop(LEVEL_COL)]], meta[[LEVEL_COL, *metas[0].columns.drop(LEVEL_COL)]]
+
+
+# after -> data/predata_pyramid / data/grid_meta_pyramid
+def make_pyramid(
+    input_path: str = "data/after.parquet",
+    predata_path: str = "data/predata_pyramid.parquet",
+    meta_path: str = "data/grid_meta_pyramid.parquet",
+    levels: Sequence[int] = PYRAMID_LEVELS,
+    boundary="seoul",
+):
+    if not table_exists(input_path):
+        raise FileNotFoundError(f"{input_path} 파일이 없습니다.")
+
+    df = read_table(input_path, schema="after")
+    predata, meta = build_pyramid(df, levels, boundary)
+    write_table(predata, predata_path, schema="predata")
+    write_table(meta, meta_path, schema="grid_meta")
+
+    print(f"[INFO] predata 저장 완료: {predata_path} (rows={len(predata)})")
+    print(f"[INFO] grid_meta 저장 완료: {meta_path} (rows={len(meta)})")
+    return predata, meta
+
+
+def main():
+    make_pyramid()
+
+
+if __name__ == "__main__":
+    main()
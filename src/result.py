@@ -3,11 +3,12 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-import pandas as pd
 
-from src.preprocess import clean_address
+from src.io_loader import read_month
+from src.preprocess import clean_address_series
 from src.google_geocode import fill_cache_for_addresses
 from src.grid import make_predata_and_meta_csv
+from src.storage import read_table, write_table
 from src.viz_grid_map import make_grid_heatmap_html
 
 
@@ -17,8 +18,13 @@ def make_result(
     filename: str = "12.csv",
     out_data_dir: str = "data",
     out_map_dir: str = "map",
-    cache_path: str = "data/geocode_cache_result.csv",
+    cache_path: str = "data/geocode_cache.sqlite",
     sleep_sec: float = 0.05,
+    engine: str = "serial",
+    max_in_flight: int = 8,
+    google_rps: float = 40.0,
+    juso_rps: float = 20.0,
+    offline: bool = False,
     opacity: float = 0.5,
     max_cells: int | None = 20000,
 ):
@@ -33,12 +39,12 @@ def make_result(
     month = int(stem) if stem.isdigit() else 12
 
     # Load CSV and assign month
-    df = pd.read_csv(in_path)
+    df, _ = read_month(str(in_path))
     if "주소" not in df.columns:
         raise KeyError("입력 CSV에 '주소' 컬럼이 없습니다.")
 
     df["month"] = month
-    df["주소_clean"] = df["주소"].apply(clean_address)
+    df["주소_clean"] = clean_address_series(df["주소"])
 
     unique_addrs = df["주소_clean"].dropna().astype(str).unique()
     print(f"[INFO] input rows: {len(df)}")
@@ -49,21 +55,26 @@ def make_result(
         unique_addrs,
         cache_path=cache_path,
         sleep_sec=sleep_sec,
+        engine=engine,
+        max_in_flight=max_in_flight,
+        google_rps=google_rps,
+        juso_rps=juso_rps,
+        offline=offline,
     )
 
     merged = df.merge(cache, on="주소_clean", how="left")
     out_geo = merged[["month", "lat", "lon"]].copy()
 
-    geo_out_path = Path(out_data_dir) / f"{stem}_result.csv"
-    out_geo.to_csv(geo_out_path, index=False, encoding="utf-8-sig")
+    geo_out_path = Path(out_data_dir) / f"{stem}_result.parquet"
+    write_table(out_geo, str(geo_out_path), schema="after")
 
     fail = out_geo["lat"].isna().sum()
     print(f"[DONE] geocoded saved: {geo_out_path}")
     print(f"[INFO] geocode fail: {fail}/{len(out_geo)} ({(fail/len(out_geo)*100 if len(out_geo) else 0):.2f}%)")
 
     # Build grid predata and metadata
-    predata_path = Path(out_data_dir) / f"{stem}_result_predata.csv"
-    meta_path = Path(out_data_dir) / f"{stem}_result_grid_meta.csv"
+    predata_path = Path(out_data_dir) / f"{stem}_result_predata.parquet"
+    meta_path = Path(out_data_dir) / f"{stem}_result_grid_meta.parquet"
 
     make_predata_and_meta_csv(
         input_csv=str(geo_out_path),
@@ -74,10 +85,9 @@ def make_result(
     # Save simplified predata
     simple_predata_path = Path(out_data_dir) / f"predata_{month}.csv"
 
-    df_pre = pd.read_csv(predata_path)
-    df_pre = df_pre[["month", "grid_id", "count"]]
+    df_pre = read_table(str(predata_path), columns=["month", "grid_id", "count"])
 
-    df_pre.to_csv(simple_predata_path, index=False, encoding="utf-8-sig")
+    write_table(df_pre, str(simple_predata_path))
 
     print(f"[DONE] simple predata saved: {simple_predata_path}")
 
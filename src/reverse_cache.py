@@ -0,0 +1,92 @@
+# src/reverse_cache.py
+from __future__ import annotations
+
+import os
+import sqlite3
+from typing import Iterable
+
+import pandas as pd
+
+from src.geocode_cache import DEFAULT_DB_PATH
+
+
+REVERSE_COLUMNS = ["grid_id", "cell_size_m", "kind", "lat", "lon", "address", "updated_at"]
+
+
+# Reverse geocoding of grid centers, in the shared SQLite cache file.
+# A center is fixed per (grid_id, cell size, grid kind): square "gx_gy" and
+# hex "q_r" ids share one namespace, so kind is part of the key
+class ReverseGeocodeCache:
+    TABLE = "reverse_geocode_cache"
+    LOOKUP_CHUNK = 900
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+
+        have = [r[1] for r in self.conn.execute(f"PRAGMA table_info({self.TABLE})")]
+        legacy = bool(have) and "kind" not in have
+        if legacy:
+            # Tables from before the kind column hold square-grid ids
+            self.conn.execute(f"ALTER TABLE {self.TABLE} RENAME TO {self.TABLE}_old")
+        self.conn.execute(
+            f"""CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                grid_id TEXT NOT NULL,
+                cell_size_m INTEGER NOT NULL,
+                kind TEXT NOT NULL DEFAULT 'square',
+                lat REAL,
+                lon REAL,
+                address TEXT,
+                updated_at TEXT,
+                PRIMARY KEY (grid_id, cell_size_m, kind)
+            )"""
+        )
+        if legacy:
+            self.conn.execute(
+                f"INSERT INTO {self.TABLE} ({','.join(REVERSE_COLUMNS)}) "
+                f"SELECT grid_id, cell_size_m, 'square', lat, lon, address, updated_at FROM {self.TABLE}_old"
+            )
+            self.conn.execute(f"DROP TABLE {self.TABLE}_old")
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def lookup(self, grid_ids: Iterable[str], cell_size_m: int, kind: str = "square") -> pd.DataFrame:
+        keys = list(dict.fromkeys(str(k) for k in grid_ids))
+        parts = []
+        for i in range(0, len(keys), self.LOOKUP_CHUNK):
+            chunk = keys[i:i + self.LOOKUP_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            parts.append(pd.read_sql_query(
+                f"SELECT grid_id, address FROM {self.TABLE} "
+                f"WHERE cell_size_m = ? AND kind = ? AND grid_id IN ({marks})",
+                self.conn,
+                params=[int(cell_size_m), str(kind), *chunk],
+            ))
+        if not parts:
+            return pd.DataFrame(columns=["grid_id", "address"])
+        return pd.concat(parts, ignore_index=True)
+
+    def upsert(self, rows):
+        df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+        if df.empty:
+            return
+        if "kind" not in df.columns:
+            df = df.assign(kind="square")
+        df = df[REVERSE_COLUMNS].astype(object).where(df[REVERSE_COLUMNS].notna(), None)
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO {self.TABLE} ({','.join(REVERSE_COLUMNS)}) VALUES ({','.join('?' * len(REVERSE_COLUMNS))}) "
+                f"ON CONFLICT(grid_id, cell_size_m, kind) DO UPDATE SET "
+                f"lat=excluded.lat, lon=excluded.lon, address=excluded.address, updated_at=excluded.updated_at",
+                df.itertuples(index=False, name=None),
+            )
+
+    def close(self):
+        self.conn.close()
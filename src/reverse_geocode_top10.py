@@ -1,10 +1,19 @@
 import os
+import numpy as np
 import pandas as pd
-import requests
 from pyproj import Transformer
 from dotenv import load_dotenv
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple
+
+from src.cache_policy import now_iso
+from src.cellkey import CELL_COL, with_cell
+from src.geocode_cache import DEFAULT_DB_PATH
+from src.geocode_engine import make_limiters, run_concurrent
+from src.grid import CELL_SIZE_M, select_level
+from src.http_client import get_client, print_client_stats
+from src.reverse_cache import ReverseGeocodeCache
+from src.storage import read_table
 
 
 # Load .env from project root
@@ -13,9 +22,10 @@ ENV_PATH = BASE_DIR / ".env"
 load_dotenv(dotenv_path=ENV_PATH)
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
+GOOGLE_GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
 
 PRED_PATH = "data/pred_12.csv"
-META_PATH = "data/grid_meta.csv"
+META_PATH = "data/grid_meta.parquet"
 OUT_PATH = "data/top10_with_address.csv"
 
 
@@ -24,10 +34,10 @@ transformer = Transformer.from_crs("EPSG:5179", "EPSG:4326", always_xy=True)
 
 
 # Load prediction and grid metadata
-def load_and_merge(pred_path: str = PRED_PATH, meta_path: str = META_PATH) -> pd.DataFrame:
-    pred = pd.read_csv(pred_path)
-    meta = pd.read_csv(meta_path)
-    df = pred.merge(meta, on="grid_id", how="left")
+def load_and_merge(pred_path: str = PRED_PATH, meta_path: str = META_PATH, cell_size_m: int = CELL_SIZE_M) -> pd.DataFrame:
+    pred = read_table(pred_path)
+    meta = select_level(read_table(meta_path, schema="grid_meta"), cell_size_m)
+    df = with_cell(pred).merge(meta.drop(columns="grid_id"), on=CELL_COL, how="left")
     df = df.dropna(subset=["center_x_m", "center_y_m", "count"]).copy()
     return df
 
@@ -38,12 +48,18 @@ def to_latlon(x_m: float, y_m: float) -> Tuple[float, float]:
     return float(lat), float(lon)
 
 
+# Batch conversion of grid centers to lat/lon
+def to_latlon_many(x_m, y_m) -> Tuple[np.ndarray, np.ndarray]:
+    lon, lat = transformer.transform(np.asarray(x_m, dtype=float), np.asarray(y_m, dtype=float))
+    return np.asarray(lat), np.asarray(lon)
+
+
 # Reverse geocode coordinates to address
 def reverse_geocode(lat: float, lon: float, api_key: str, timeout: float = 8.0) -> Optional[str]:
-    url = "https://maps.googleapis.com/maps/api/geocode/json"
+    url = os.getenv("GOOGLE_GEOCODE_URL", GOOGLE_GEOCODE_URL)
     params = {"latlng": f"{lat},{lon}", "key": api_key, "language": "ko"}
     try:
-        r = requests.get(url, params=params, timeout=timeout)
+        r = get_client("google").get(url, params=params, timeout=timeout)
         r.raise_for_status()
         data = r.json()
         if data.get("status") != "OK":
@@ -62,37 +78,77 @@ def reverse_geocode_top10(
     meta_path: str = META_PATH,
     out_path: str = OUT_PATH,
     topn: int = 10,
+    cache_path: str = DEFAULT_DB_PATH,
+    cell_size_m: int = CELL_SIZE_M,
+    kind: str = "square",
+    max_in_flight: int = 8,
+    google_rps: float = 40.0,
 ) -> Path:
-    df = load_and_merge(pred_path, meta_path)
+    df = load_and_merge(pred_path, meta_path, cell_size_m)
 
     top = df.sort_values("count", ascending=False).head(topn).copy()
     top = top.reset_index(drop=True)
+    top["grid_id"] = top["grid_id"].astype(str)
 
-    if not GOOGLE_API_KEY:
-        raise RuntimeError(
-            "GOOGLE_MAPS_API_KEY 환경변수가 필요합니다. (.env 또는 환경변수에 설정)"
-        )
+    # Grid centers are fixed per cell size and kind, so project them in one call
+    lat, lon = to_latlon_many(top["center_x_m"], top["center_y_m"])
+    top["lat"] = lat
+    top["lon"] = lon
 
-    lats: List[float] = []
-    lons: List[float] = []
-    addrs: List[Optional[str]] = []
-
-    for _, row in top.iterrows():
-        lat, lon = to_latlon(float(row["center_x_m"]), float(row["center_y_m"]))
-        lats.append(lat)
-        lons.append(lon)
-        addrs.append(reverse_geocode(lat, lon, GOOGLE_API_KEY))
-
-    top["lat"] = lats
-    top["lon"] = lons
-    top["address"] = addrs
+    store = ReverseGeocodeCache(cache_path)
+    try:
+        cached = store.lookup(top["grid_id"], cell_size_m, kind)
+        addr_of = dict(zip(cached["grid_id"], cached["address"]))
+        miss = top[~top["grid_id"].isin(addr_of.keys())]
+        print(f"[INFO] reverse cache hit: {len(top) - len(miss)}/{len(top)}")
+
+        if len(miss):
+            api_key = os.getenv("GOOGLE_MAPS_API_KEY") or GOOGLE_API_KEY
+            if not api_key:
+                raise RuntimeError(
+                    "GOOGLE_MAPS_API_KEY 환경변수가 필요합니다. (.env 또는 환경변수에 설정)"
+                )
+
+            limiters = make_limiters(google_rps=google_rps, juso_rps=None)
+            new_rows = []
+
+            def _fetch(row):
+                limiters["google"].acquire()
+                return reverse_geocode(row[1], row[2], api_key)
+
+            def _collect(row, address):
+                addr_of[row[0]] = address
+                if address is not None:
+                    new_rows.append({
+                        "grid_id": row[0],
+                        "cell_size_m": int(cell_size_m),
+                        "kind": kind,
+                        "lat": row[1],
+                        "lon": row[2],
+                        "address": address,
+                        "updated_at": now_iso(),
+                    })
+
+            run_concurrent(
+                list(miss[["grid_id", "lat", "lon"]].itertuples(index=False, name=None)),
+                _fetch,
+                max_in_flight=max_in_flight,
+                on_result=_collect,
+                label="reverse geocode",
+            )
+            store.upsert(new_rows)
+            print_client_stats()
+    finally:
+        store.close()
+
+    top["address"] = top["grid_id"].map(addr_of)
 
     out_p = Path(out_path)
     out_p.parent.mkdir(parents=True, exist_ok=True)
     top[["grid_id", "count", "lat", "lon", "address"]].to_csv(out_p, index=False)
 
     print("\n[TOP GRID ADDRESS SAVED]")
-    print(top[["grid_id", "count", "address"]])
+    print(top[["grid_id", "count", "address"]].head(20))
 
     print(f"[DONE] top{topn} 주소 결과 저장: {out_p}")
     return out_p
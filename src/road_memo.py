@@ -0,0 +1,123 @@
+# src/road_memo.py
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from src.cache_policy import SOURCE_ROAD, now_iso
+
+if TYPE_CHECKING:
+    from src.geocode_cache import CacheStore
+
+
+# Road-address layers: jibun -> roadAddr (JUSO) and roadAddr -> coordinates (Google)
+JUSO_COLUMNS = ["주소_clean", "roadAddr", "updated_at"]
+ROAD_COLUMNS = ["roadAddr", "lat", "lon", "status", "updated_at"]
+
+
+# Fold roadAddr/coordinates already held by the main cache into the layers.
+# Only rows geocoded from the roadAddr itself seed roadAddr -> coordinates; a raw-jibun
+# fallback point (or a legacy row without a source) only seeds jibun -> roadAddr
+def with_cache_roads(cache: pd.DataFrame, juso: pd.DataFrame, road: pd.DataFrame):
+    has_road = cache[cache["roadAddr"].notna()]
+    juso = pd.concat([has_road[["주소_clean", "roadAddr"]], juso[["주소_clean", "roadAddr"]]], ignore_index=True)
+
+    status = has_road["status"] if "status" in has_road.columns else pd.Series(pd.NA, index=has_road.index)
+    source = has_road["source"] if "source" in has_road.columns else pd.Series(pd.NA, index=has_road.index)
+    resolved = has_road[has_road["lat"].notna() & (status.isna() | (status == "ok")) & (source == SOURCE_ROAD)]
+    road = pd.concat(
+        [resolved[["roadAddr", "lat", "lon"]].assign(status="ok"), road[["roadAddr", "lat", "lon", "status"]]],
+        ignore_index=True,
+    )
+    return (
+        juso.drop_duplicates("주소_clean", keep="last").reset_index(drop=True),
+        road.drop_duplicates("roadAddr", keep="last").reset_index(drop=True),
+    )
+
+
+# Thread-safe two-level memo: jibun -> roadAddr -> (lat, lon)
+class RoadAddrMemo:
+    # Road lookups worth remembering (transient failures are retried)
+    MEMO_STATUSES = ("ok", "zero_results", "invalid")
+
+    def __init__(self, juso: pd.DataFrame, road: pd.DataFrame):
+        self._road_of = dict(zip(juso["주소_clean"].astype(str), juso["roadAddr"]))
+        self._coord_of = {
+            r: (la if pd.notna(la) else None, lo if pd.notna(lo) else None, st)
+            for r, la, lo, st in road[["roadAddr", "lat", "lon", "status"]].itertuples(index=False)
+        }
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.new_juso = []
+        self.new_road = []
+        self.stats = {"juso_hit": 0, "juso_miss": 0, "road_hit": 0, "road_miss": 0}
+
+    @classmethod
+    def from_store(cls, store: "CacheStore") -> "RoadAddrMemo":
+        juso, road = store.load_road_layers()
+        return cls(juso, road)
+
+    # Returns (hit, roadAddr)
+    def get_road(self, addr: str):
+        with self._lock:
+            if addr in self._road_of:
+                self.stats["juso_hit"] += 1
+                return True, self._road_of[addr]
+            self.stats["juso_miss"] += 1
+            return False, None
+
+    def put_road(self, addr: str, road):
+        if not road:
+            return
+        with self._lock:
+            self._road_of[addr] = road
+            self.new_juso.append({"주소_clean": addr, "roadAddr": road, "updated_at": now_iso()})
+
+    # Coordinates for a roadAddr; fetch() runs at most once per road
+    def coord_for(self, road: str, fetch):
+        with self._lock:
+            hit = self._coord_of.get(road)
+            if hit is not None:
+                self.stats["road_hit"] += 1
+                return hit
+            event = self._inflight.get(road)
+            owner = event is None
+            if owner:
+                event = self._inflight[road] = threading.Event()
+                self.stats["road_miss"] += 1
+
+        if not owner:
+            event.wait()
+            with self._lock:
+                hit = self._coord_of.get(road)
+                if hit is not None:
+                    self.stats["road_hit"] += 1
+                    return hit
+            return fetch()
+
+        try:
+            lat, lon, status = fetch()
+            if status in self.MEMO_STATUSES:
+                with self._lock:
+                    self._coord_of[road] = (lat, lon, status)
+                    self.new_road.append({"roadAddr": road, "lat": lat, "lon": lon, "status": status, "updated_at": now_iso()})
+            return lat, lon, status
+        finally:
+            with self._lock:
+                self._inflight.pop(road, None)
+            event.set()
+
+    def save(self, store: "CacheStore"):
+        store.save_road_layers(self.new_juso, self.new_road)
+
+    def report(self):
+        s = self.stats
+        juso_n, road_n = s["juso_hit"] + s["juso_miss"], s["road_hit"] + s["road_miss"]
+        print(
+            f"[INFO] road memo: jibun->roadAddr hit {s['juso_hit']}/{juso_n}"
+            f" ({s['juso_hit'] / juso_n * 100 if juso_n else 0:.1f}%),"
+            f" roadAddr->좌표 hit {s['road_hit']}/{road_n}"
+            f" ({s['road_hit'] / road_n * 100 if road_n else 0:.1f}%)"
+        )
@@ -0,0 +1,139 @@
+# src/storage.py
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Sequence
+
+import pandas as pd
+
+from src.cellkey import with_cell
+
+
+# Explicit schemas for intermediate tables (compact dtypes)
+# lat/lon stay float64: float32 rounding (~0.4 m) can move points across cell edges
+SCHEMAS = {
+    "after": {
+        "month": "int16",
+        "lat": "float64",
+        "lon": "float64",
+        "신고일": "datetime64[us]",
+        "구정보": "category",
+        "유형": "category",
+    },
+    "predata": {
+        "cell_size_m": "int16",
+        "month": "int16",
+        "grid_id": "category",
+        "count": "int32",
+        "cell": "int64",
+    },
+    "grid_meta": {
+        "cell_size_m": "int16",
+        "grid_id": "category",
+        "grid_x": "int32",
+        "grid_y": "int32",
+        "center_x_m": "float32",
+        "center_y_m": "float32",
+        "cell": "int64",
+    },
+    "features": {
+        "cell_size_m": "int16",
+        "month": "int16",
+        "grid_id": "category",
+        "count": "int32",
+        "cell": "int64",
+    },
+    # Daily event cube and its rollups (one time key per table)
+    "event_cube": {
+        "date": "datetime64[us]",
+        "week": "datetime64[us]",
+        "month": "int16",
+        "weekday": "int8",
+        "cell": "int64",
+        "구정보": "category",
+        "유형": "category",
+        "count": "int32",
+    },
+}
+
+COLUMNAR_SUFFIXES = (".parquet", ".feather")
+
+
+def apply_schema(df: pd.DataFrame, schema: Optional[str]) -> pd.DataFrame:
+    if not schema:
+        return df
+    if "cell" in SCHEMAS[schema]:
+        # Tables written before packed keys only carry grid_id
+        df = with_cell(df)
+    dtypes = {c: t for c, t in SCHEMAS[schema].items() if c in df.columns}
+    if schema == "features":
+        # Lag / window / neighbor features are counts or averages of counts
+        dtypes.update({c: "float32" for c in df.columns if c.startswith(("count_", "nbr", "months_since"))})
+    return df.astype(dtypes)
+
+
+# Parquet path that is missing falls back to its legacy CSV sibling
+def _resolve(path: str) -> Path:
+    p = Path(path)
+    if not p.exists() and p.suffix in COLUMNAR_SUFFIXES:
+        legacy = p.with_suffix(".csv")
+        if legacy.exists():
+            return legacy
+    return p
+
+
+def table_exists(path: str) -> bool:
+    return _resolve(path).exists()
+
+
+# Read a stage table (Parquet / Feather / CSV by suffix)
+def read_table(
+    path: str,
+    schema: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    memory_map: bool = True,
+) -> pd.DataFrame:
+    p = _resolve(path)
+    if not p.exists():
+        raise FileNotFoundError(f"{path} 파일이 없습니다.")
+
+    cols = list(columns) if columns is not None else None
+    if p.suffix == ".parquet":
+        df = pd.read_parquet(p, columns=cols, memory_map=memory_map)
+    elif p.suffix == ".feather":
+        df = pd.read_feather(p, columns=cols, memory_map=memory_map)
+    else:
+        df = pd.read_csv(p, usecols=cols)
+    return apply_schema(df, schema)
+
+
+@lru_cache(maxsize=16)
+def _read_cached(path: str, mtime_ns: int, schema: Optional[str], columns: Optional[tuple]) -> pd.DataFrame:
+    return read_table(path, schema=schema, columns=columns)
+
+
+# Memoized read for tables re-used many times in one process (e.g. grid_meta)
+def read_table_cached(path: str, schema: Optional[str] = None, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    p = _resolve(path)
+    if not p.exists():
+        raise FileNotFoundError(f"{path} 파일이 없습니다.")
+    df = _read_cached(str(p), p.stat().st_mtime_ns, schema, tuple(columns) if columns is not None else None)
+    return df.copy(deep=False)
+
+
+# Write a stage table; CSV only for human-facing outputs
+def write_table(df: pd.DataFrame, path: str, schema: Optional[str] = None) -> Path:
+    p = Path(path)
+    if str(p.parent):
+        os.makedirs(p.parent, exist_ok=True)
+
+    df = apply_schema(df.reset_index(drop=True), schema)
+    if p.suffix == ".parquet":
+        df.to_parquet(p, index=False, compression="zstd")
+    elif p.suffix == ".feather":
+        df.to_feather(p, compression="zstd")
+    else:
+        df.to_csv(p, index=False, encoding="utf-8-sig")
+    return p
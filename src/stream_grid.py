@@ -0,0 +1,114 @@
+# src/stream_grid.py
+from __future__ import annotations
+
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from src.boundary import get_boundary, print_rejections, rejection_report
+from src.cellkey import CELL_COL, cell_to_grid_id, decode_cell, encode_cell
+from src.geocode_cache import DEFAULT_DB_PATH, open_cache
+from src.grid import _get_transformer, build_grid_meta, order_predata, project_to_grid
+from src.io_loader import iter_month_chunks
+from src.preprocess import clean_address_series
+from src.storage import write_table
+
+
+# Running (month, cell) -> count; size is bounded by occupied cells
+class GridAccumulator:
+    def __init__(self):
+        self.counts = Counter()
+        self.rows = 0
+
+    def add(self, month: int, grid_x: np.ndarray, grid_y: np.ndarray):
+        if len(grid_x) == 0:
+            return
+        cells, n = np.unique(encode_cell(grid_x, grid_y), return_counts=True)
+        for cell, c in zip(cells.tolist(), n.tolist()):
+            self.counts[(month, cell)] += c
+        self.rows += len(grid_x)
+
+    def _cells(self) -> pd.DataFrame:
+        keys = np.array(list(self.counts.keys()), dtype=np.int64).reshape(-1, 2)
+        grid_x, grid_y = decode_cell(keys[:, 1])
+        return pd.DataFrame({
+            "month": keys[:, 0],
+            "grid_id": cell_to_grid_id(keys[:, 1]),
+            "count": np.fromiter(self.counts.values(), dtype=np.int64, count=len(self.counts)),
+            CELL_COL: keys[:, 1],
+            "grid_x": grid_x,
+            "grid_y": grid_y,
+        })
+
+    # Same layout as grid.build_predata / build_grid_meta
+    def to_frames(self):
+        cells = self._cells()
+        predata = order_predata(cells[["month", "grid_id", "count", CELL_COL]])
+        return predata, build_grid_meta(cells)
+
+
+# Raw CSV -> cached coordinates -> grid counts, one chunk at a time
+def stream_predata_and_meta(
+    input_dir: str = "original_data",
+    months=(1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11),
+    cache_path: str = DEFAULT_DB_PATH,
+    predata_path: str = "data/predata.parquet",
+    meta_path: str = "data/grid_meta.parquet",
+    chunksize: int = 50_000,
+    boundary="seoul",
+):
+    t0 = time.perf_counter()
+    store = open_cache(cache_path)
+    transformer = _get_transformer()
+    index = get_boundary(boundary)
+    acc = GridAccumulator()
+    total = missing = 0
+    reports = []
+
+    try:
+        for month, chunk in iter_month_chunks(input_dir, months, usecols=("주소",), chunksize=chunksize):
+            keys = clean_address_series(chunk["주소"])
+            uniq = keys.unique()
+
+            # Cache lookup only (no API calls); misses count as geocoding failures
+            hit = store.lookup(uniq)[["주소_clean", "lat", "lon"]].dropna(subset=["lat", "lon"])
+            coords = hit.drop_duplicates("주소_clean").set_index("주소_clean")
+            lat = keys.map(coords["lat"]).to_numpy(dtype=float)
+            lon = keys.map(coords["lon"]).to_numpy(dtype=float)
+
+            ok = ~(np.isnan(lat) | np.isnan(lon))
+            x_m, y_m, grid_x, grid_y = project_to_grid(lat[ok], lon[ok], transformer)
+            if index is not None:
+                inside = index.contains_xy(x_m, y_m)
+                reports.append(rejection_report(np.full(len(inside), int(month)), inside))
+                grid_x, grid_y = grid_x[inside], grid_y[inside]
+            acc.add(int(month), grid_x, grid_y)
+
+            total += len(chunk)
+            missing += int((~ok).sum())
+    finally:
+        store.close()
+
+    if reports:
+        rep = pd.concat(reports).groupby("month", as_index=False)[["total", "rejected"]].sum()
+        print_rejections(rep.assign(ratio=rep["rejected"] / rep["total"]))
+
+    predata, meta = acc.to_frames()
+    write_table(predata, predata_path, schema="predata")
+    write_table(meta, meta_path, schema="grid_meta")
+
+    print(f"[INFO] streamed rows: {total} (좌표 없음 {missing}), cells={len(acc.counts)}")
+    print(f"[INFO] predata 저장 완료: {predata_path} (rows={len(predata)})")
+    print(f"[INFO] grid_meta 저장 완료: {meta_path} (rows={len(meta)})")
+    print(f"[DONE] streaming grid aggregation: {time.perf_counter() - t0:.1f}s")
+    return predata, meta
+
+
+def main():
+    stream_predata_and_meta()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,43 @@
-import pandas as pd
 import joblib
 from pathlib import Path
 from sklearn.ensemble import RandomForestRegressor
-from typing import Sequence
+from typing import Optional, Sequence
+
+from src.cellkey import CELL_COL
+from src.feature_store import STORE_DIR, FeatureStore
+from src.grid import CELL_SIZE_M, select_level
+from src.make_features import TARGET_COL, feature_columns
+from src.storage import read_table
 
 
 # Train RandomForest model with OOB evaluation
 def train_rf(
-    data_path: str = "data/features.csv",
+    data_path: str = "data/features.parquet",
     model_path: str = "model_rf.pkl",
     train_months: Sequence[int] = (3,4,5,6,7,8,9,10),
-    feature_cols: Sequence[str] = ("count_t", "count_t-1", "count_t-2"),
+    feature_cols: Optional[Sequence[str]] = None,
     n_estimators: int = 1000,
     max_depth: int = 6,
     random_state: int = 42,
-    max_features: int = 2
+    max_features: int = 2,
+    cell_size_m: Optional[int] = None,
+    feature_version: Optional[str] = None,
+    store_dir: str = STORE_DIR,
 ) -> Path:
-    df = pd.read_csv(data_path)
-
+    # Train on a stored feature version instead of data_path
+    store = FeatureStore(store_dir)
+    if feature_version is not None:
+        entry = store.get(feature_version)
+        if entry is None:
+            raise FileNotFoundError(f"feature store에 없는 버전입니다: {feature_version}")
+        data_path = entry["path"]
+        store.touch(feature_version)
+
+    # Pyramid features hold several resolutions; train on one
+    df = select_level(read_table(data_path, schema="features"), cell_size_m)
+
+    # Default: every feature column the table carries
+    feature_cols = list(feature_cols) if feature_cols is not None else feature_columns(df)
     missing = set(["month", "grid_id", "count_t", *feature_cols]) - set(df.columns)
     if missing:
         raise KeyError(f"features.csv에 필요한 컬럼이 없습니다: {sorted(missing)}")
@@ -26,8 +46,11 @@ def train_rf(
     if train.empty:
         raise ValueError(f"train_months={list(train_months)}에 해당하는 학습 데이터가 없습니다.")
 
-    # Use next-month count as target
-    train["y"] = train.groupby("grid_id")["count_t"].shift(-1)
+    # Use next-month count as target (zero-filled panel target when present)
+    if TARGET_COL in train.columns:
+        train["y"] = train[TARGET_COL]
+    else:
+        train["y"] = train.groupby(CELL_COL, sort=False)["count_t"].shift(-1)
     train = train.dropna(subset=["y", *feature_cols]).copy()
 
     X = train[list(feature_cols)]
@@ -50,18 +73,27 @@ def train_rf(
     # Extract OOB R2 score
     oob_r2 = float(model.oob_score_)
 
+    # Feature version the table came from (None outside the feature store)
+    version = feature_version or store.version_of_table(data_path)
+
     # Save model and OOB score
     out_p = Path(model_path)
     joblib.dump(
         {
             "model": model,
             "oob_r2": oob_r2,
+            "feature_cols": list(feature_cols),
+            "cell_size_m": cell_size_m if cell_size_m is not None else CELL_SIZE_M,
+            "feature_version": version,
         },
         out_p,
     )
 
     print(f"[DONE] 모델 저장: {out_p}")
     print(f"[INFO] OOB R2 score: {oob_r2:.4f}")
+    print(f"[INFO] features ({len(feature_cols)}): {', '.join(feature_cols)}")
+    if version:
+        print(f"[INFO] feature version: {version}")
 
     return out_p
 
@@ -5,16 +5,20 @@ import numpy as np
 from pathlib import Path
 from typing import Optional
 
+from src.cellkey import CELL_COL, with_cell
+from src.grid import CELL_SIZE_M, select_level
+from src.storage import read_table
+
 PRED_PATH = "data/pred_12.csv"
-META_PATH = "data/grid_meta.csv"
-GRID_SIZE_M = 200  # Grid size in meters
+META_PATH = "data/grid_meta.parquet"
+GRID_SIZE_M = CELL_SIZE_M  # Grid size in meters
 
 
 # Load prediction and grid metadata
-def load_and_merge(pred_path: str = PRED_PATH, meta_path: str = META_PATH) -> pd.DataFrame:
-    pred = pd.read_csv(pred_path)
-    meta = pd.read_csv(meta_path)
-    df = pred.merge(meta, on="grid_id", how="left")
+def load_and_merge(pred_path: str = PRED_PATH, meta_path: str = META_PATH, cell_size_m: int = GRID_SIZE_M) -> pd.DataFrame:
+    pred = read_table(pred_path)
+    meta = select_level(read_table(meta_path, schema="grid_meta"), cell_size_m)
+    df = with_cell(pred).merge(meta.drop(columns="grid_id"), on=CELL_COL, how="left")
     df = df.dropna(subset=["center_x_m", "center_y_m", "pred_12"]).copy()
     return df
 
@@ -103,7 +107,7 @@ def visualize_pred(
     save_path: Optional[str] = None,
     show: bool = True,
 ):
-    df = load_and_merge(pred_path, meta_path)
+    df = load_and_merge(pred_path, meta_path, grid_size)
     plot_grid_heatmap(df, grid_size=grid_size, alpha=alpha, save_path=save_path, show=show)
     print_top10(df)
 
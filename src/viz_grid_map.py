@@ -1,14 +1,14 @@
 # src/viz_grid_map.py
 import os
 import math
-import pandas as pd
 import folium
 from typing import Optional
 from pyproj import Transformer
 
-CELL_SIZE_M = 200
-SRC_CRS = "EPSG:4326"
-DST_CRS = "EPSG:5179"
+from src.cellkey import CELL_COL, with_cell
+from src.grid import CELL_SIZE_M, DST_CRS, SRC_CRS, select_level
+from src.hexgrid import hex_corners
+from src.storage import read_table, read_table_cached
 
 
 # Map value to red intensity (log-scaled)
@@ -40,14 +40,27 @@ def _diverging_color_from_residual(residual: float, vabsmax: float) -> str:
         return f"#{fade:02x}{fade:02x}{255:02x}"
 
 
+# One grid cell as a folium shape (square -> Rectangle, hex -> Polygon)
+def _cell_shape(center_x_m: float, center_y_m: float, cell_size_m: int, kind: str, to_latlon, **style):
+    if kind == "hex":
+        xs, ys = hex_corners(center_x_m, center_y_m, cell_size_m)
+        lons, lats = to_latlon.transform(xs, ys)
+        return folium.Polygon(locations=[[la, lo] for la, lo in zip(lats, lons)], **style)
+
+    half = cell_size_m / 2
+    sw_lon, sw_lat = to_latlon.transform(center_x_m - half, center_y_m - half)
+    ne_lon, ne_lat = to_latlon.transform(center_x_m + half, center_y_m + half)
+    return folium.Rectangle(bounds=[[sw_lat, sw_lon], [ne_lat, ne_lon]], **style)
+
+
 # Render grid heatmap HTML
 def make_grid_heatmap_html(
     *,
     month: Optional[int] = None,
-    predata_csv: str = "data/predata.csv",
+    predata_csv: str = "data/predata.parquet",
     value_csv: Optional[str] = None,
     value_col: str = "count",
-    meta_csv: str = "data/grid_meta.csv",
+    meta_csv: str = "data/grid_meta.parquet",
     out_html: Optional[str] = None,
     title: Optional[str] = None,
     opacity: float = 0.4,
@@ -55,28 +68,29 @@ def make_grid_heatmap_html(
     show_top10: bool = True,
     scale_vmin: Optional[float] = None,
     scale_vmax: Optional[float] = None,
+    cell_size_m: Optional[int] = None,
+    kind: str = "square",
 ):
     if value_csv is None and month is None:
         raise ValueError("month 또는 value_csv 중 하나는 반드시 필요합니다.")
     if out_html is None:
         raise ValueError("out_html은 반드시 필요합니다.")
 
-    meta = pd.read_csv(meta_csv)
+    cell_size_m = cell_size_m or CELL_SIZE_M
+    meta = select_level(read_table_cached(meta_csv, schema="grid_meta"), cell_size_m)
 
     # Load value data
     if value_csv:
-        df_val = pd.read_csv(value_csv)
-        df = df_val[["grid_id", value_col]].copy()
+        df = read_table(value_csv, columns=["grid_id", value_col])
         df.rename(columns={value_col: "value"}, inplace=True)
         map_title = title or f"{value_col} 기반 시각화"
     else:
-        pre = pd.read_csv(predata_csv)
-        df_m = pre[pre["month"] == month]
-        df = df_m[["grid_id", "count"]].copy()
+        pre = select_level(read_table_cached(predata_csv, schema="predata"), cell_size_m)
+        df = pre.loc[pre["month"] == month, ["grid_id", "count", CELL_COL]].copy()
         df.rename(columns={"count": "value"}, inplace=True)
         map_title = title or f"{month}월 실제 견인 발생"
 
-    df = df.merge(meta, on="grid_id", how="left")
+    df = with_cell(df).merge(meta.drop(columns="grid_id"), on=CELL_COL, how="left")
     df = df.dropna(subset=["center_x_m", "center_y_m", "value"])
 
     if max_cells and len(df) > max_cells:
@@ -133,17 +147,11 @@ def make_grid_heatmap_html(
         m.get_root().html.add_child(folium.Element(top10_html))
 
     # Draw grid cells
-    half = CELL_SIZE_M / 2
     for r in df.itertuples():
         color = _red_color_from_value(r.value, vmin, vmax)
 
-        minx, maxx = r.center_x_m - half, r.center_x_m + half
-        miny, maxy = r.center_y_m - half, r.center_y_m + half
-        sw_lon, sw_lat = to_latlon.transform(minx, miny)
-        ne_lon, ne_lat = to_latlon.transform(maxx, maxy)
-
-        folium.Rectangle(
-            bounds=[[sw_lat, sw_lon], [ne_lat, ne_lon]],
+        _cell_shape(
+            r.center_x_m, r.center_y_m, cell_size_m, kind, to_latlon,
             fill=True,
             fill_color=color,
             fill_opacity=opacity,
@@ -165,23 +173,26 @@ def make_grid_error_heatmap_html(
     real_csv: str,
     pred_csv: str,
     value_col: str = "count",
-    meta_csv: str = "data/grid_meta.csv",
+    meta_csv: str = "data/grid_meta.parquet",
     out_html: str,
     title: str = "오차지도 (예측 - 실제)",
     opacity: float = 0.45,
     max_cells: Optional[int] = 20000,
     scale_absmax: Optional[float] = None,
     show_top10: bool = True,
+    cell_size_m: Optional[int] = None,
+    kind: str = "square",
 ):
-    meta = pd.read_csv(meta_csv)
+    cell_size_m = cell_size_m or CELL_SIZE_M
+    meta = select_level(read_table_cached(meta_csv, schema="grid_meta"), cell_size_m)
 
-    df_real = pd.read_csv(real_csv)[["grid_id", value_col]].rename(columns={value_col: "real"})
-    df_pred = pd.read_csv(pred_csv)[["grid_id", value_col]].rename(columns={value_col: "pred"})
+    df_real = read_table(real_csv, columns=["grid_id", value_col]).rename(columns={value_col: "real"})
+    df_pred = read_table(pred_csv, columns=["grid_id", value_col]).rename(columns={value_col: "pred"})
 
-    df = df_real.merge(df_pred, on="grid_id", how="inner").dropna()
+    df = with_cell(df_real).merge(with_cell(df_pred).drop(columns="grid_id"), on=CELL_COL, how="inner").dropna()
     df["residual"] = df["pred"].astype(float) - df["real"].astype(float)
 
-    df = df.merge(meta, on="grid_id", how="left")
+    df = df.merge(meta.drop(columns="grid_id"), on=CELL_COL, how="left")
     df = df.dropna(subset=["center_x_m", "center_y_m", "residual"])
 
     if max_cells and len(df) > max_cells:
@@ -235,17 +246,11 @@ def make_grid_error_heatmap_html(
         m.get_root().html.add_child(folium.Element(top10_html))
 
     # Draw grid cells
-    half = CELL_SIZE_M / 2
     for r in df.itertuples():
         color = _diverging_color_from_residual(r.residual, absmax)
 
-        minx, maxx = r.center_x_m - half, r.center_x_m + half
-        miny, maxy = r.center_y_m - half, r.center_y_m + half
-        sw_lon, sw_lat = to_latlon.transform(minx, miny)
-        ne_lon, ne_lat = to_latlon.transform(maxx, maxy)
-
-        folium.Rectangle(
-            bounds=[[sw_lat, sw_lon], [ne_lat, ne_lon]],
+        _cell_shape(
+            r.center_x_m, r.center_y_m, cell_size_m, kind, to_latlon,
             fill=True,
             fill_color=color,
             fill_opacity=opacity,
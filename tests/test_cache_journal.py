@@ -0,0 +1,41 @@
+import os
+
+import pandas as pd
+
+from src.cache_journal import CACHE_COLUMNS, journal_path_for, save_csv
+from src.geocode_cache import open_cache
+
+
+def _row(addr, lat):
+    return {"주소_clean": addr, "roadAddr": None, "lat": lat, "lon": 127.0, "status": "ok",
+            "attempts": 1, "updated_at": "2025-01-01T00:00:00Z", "confidence": 1.0, "source": "jibun"}
+
+
+def test_journal_is_replayed_after_a_crash(tmp_path):
+    path = str(tmp_path / "cache.csv")
+    save_csv(pd.DataFrame([_row("a", 37.0)], columns=CACHE_COLUMNS), path)
+
+    # A run that journals rows and dies before finalize()
+    writer = open_cache(path).writer(flush_every=1)
+    writer.append(_row("b", 37.1))
+    writer.append(_row("a", 37.2))
+    writer.close()
+    with open(journal_path_for(path), "a", encoding="utf-8") as f:
+        f.write('{"주소_clean": "c", "la')   # torn final line
+
+    cache = open_cache(path).load().set_index("주소_clean")
+    assert sorted(cache.index) == ["a", "b"]
+    assert cache.loc["a", "lat"] == 37.2
+    assert not os.path.exists(journal_path_for(path))
+    assert sorted(pd.read_csv(path)["주소_clean"]) == ["a", "b"]
+
+
+def test_finalize_folds_rows_and_removes_the_journal(tmp_path):
+    path = str(tmp_path / "cache.csv")
+    store = open_cache(path)
+    with store.writer(flush_every=1) as w:
+        w.append(_row("a", 37.0))
+    store.finalize([_row("a", 37.0)])
+
+    assert not os.path.exists(journal_path_for(path))
+    assert open_cache(path).load()["주소_clean"].tolist() == ["a"]
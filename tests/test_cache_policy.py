@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from src.cache_policy import EXHAUSTED_TTL_DAYS, MAX_TRANSIENT_ATTEMPTS, due_for_retry, worse_failure
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def _cache(rows):
+    return pd.DataFrame(rows, columns=["주소_clean", "lat", "status", "attempts", "updated_at", "confidence"])
+
+
+def _ago(days):
+    return (pd.Timestamp(NOW) - pd.Timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@pytest.mark.parametrize("status,age,due", [
+    ("zero_results", 10, False),
+    ("zero_results", 181, True),
+    ("invalid", 200, False),
+    ("invalid", 366, True),
+    ("quota", 0, True),
+    ("timeout", 0, True),
+    ("http_error", 0, True),
+    (None, 0, True),        # legacy row without a reason counts as unknown
+])
+def test_failure_ttl_per_class(status, age, due):
+    cache = _cache([("a", None, status, 1, _ago(age), None)])
+    assert bool(due_for_retry(cache, now=NOW).iloc[0]) is due
+
+
+def test_exhausted_transient_failures_back_off():
+    n = MAX_TRANSIENT_ATTEMPTS
+    cache = _cache([
+        ("a", None, "timeout", n, _ago(1), None),
+        ("b", None, "timeout", n, _ago(EXHAUSTED_TTL_DAYS), None),
+        ("c", None, "timeout", n - 1, _ago(1), None),
+    ])
+    assert due_for_retry(cache, now=NOW).tolist() == [False, True, True]
+
+
+def test_resolved_rows_are_never_due_unless_refining_local():
+    cache = _cache([
+        ("a", 37.5, "ok", 1, _ago(1000), 1.0),
+        ("b", 37.5, "local", 0, _ago(1), 0.6),
+        ("c", 37.5, "ok", 0, _ago(1), 1.0),
+    ])
+    assert due_for_retry(cache, now=NOW).tolist() == [False, False, False]
+    assert due_for_retry(cache, now=NOW, refine_local=True).tolist() == [False, True, False]
+
+
+def test_worse_failure_prefers_retryable_classes():
+    assert worse_failure("zero_results", "timeout") == "timeout"
+    assert worse_failure("invalid", "zero_results") == "zero_results"
+    assert worse_failure("quota", "http_error") == "quota"
@@ -0,0 +1,63 @@
+import pytest
+
+from src.dag import Stage, run_dag
+
+
+def _write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def make_a(out, value=1):
+    _write(out, f"a={value}")
+
+
+def make_b(src, out):
+    with open(src, encoding="utf-8") as f:
+        _write(out, f.read() + "|b")
+
+
+def fail(out):
+    raise RuntimeError("boom")
+
+
+def _stages(tmp_path, value=1, broken=False):
+    a, b = str(tmp_path / "a.txt"), str(tmp_path / "b.txt")
+    first = Stage("a", fail, outputs=[a], params={"out": a}) if broken else \
+        Stage("a", make_a, outputs=[a], params={"out": a, "value": value})
+    return [first, Stage("b", make_b, inputs=[a], outputs=[b], params={"src": a, "out": b})]
+
+
+def _run(tmp_path, **kw):
+    return run_dag(_stages(tmp_path, **kw), cache_dir=str(tmp_path / "cache"), max_workers=2)
+
+
+def test_unchanged_stages_are_skipped(tmp_path):
+    assert _run(tmp_path) == {"a": "ran", "b": "ran"}
+    assert _run(tmp_path) == {"a": "skipped", "b": "skipped"}
+    assert (tmp_path / "b.txt").read_text(encoding="utf-8") == "a=1|b"
+
+
+def test_reverted_params_restore_cached_outputs(tmp_path):
+    _run(tmp_path, value=1)
+    assert _run(tmp_path, value=2) == {"a": "ran", "b": "ran"}
+    assert (tmp_path / "b.txt").read_text(encoding="utf-8") == "a=2|b"
+
+    assert _run(tmp_path, value=1) == {"a": "restored", "b": "restored"}
+    assert (tmp_path / "b.txt").read_text(encoding="utf-8") == "a=1|b"
+
+
+def test_edited_output_reruns_its_stage(tmp_path):
+    _run(tmp_path)
+    _write(tmp_path / "b.txt", "edited")
+    assert _run(tmp_path) == {"a": "skipped", "b": "restored"}
+    assert (tmp_path / "b.txt").read_text(encoding="utf-8") == "a=1|b"
+
+
+def test_failure_blocks_downstream_stages(tmp_path, capsys):
+    with pytest.raises(RuntimeError, match="a"):
+        _run(tmp_path, broken=True)
+    out = capsys.readouterr().out
+    assert "a            failed" in out
+    assert "b            blocked" in out
+    assert not (tmp_path / "b.txt").exists()
@@ -0,0 +1,50 @@
+import pandas as pd
+
+import src.feature_store as fs
+from src.feature_store import FeatureStore
+from src.storage import write_table
+
+
+def _write_predata(path, bump=0):
+    rows = [(m, g, m + i + bump) for m in range(1, 6) for i, g in enumerate(("1_1", "2_2", "3_3"))]
+    write_table(pd.DataFrame(rows, columns=["month", "grid_id", "count"]), path, schema="predata")
+
+
+def test_same_config_and_input_hit_the_store(tmp_path):
+    pre = str(tmp_path / "predata.parquet")
+    _write_predata(pre)
+    store = FeatureStore(str(tmp_path / "store"))
+
+    first = store.materialize(pre, lags=(1, 2))
+    again = FeatureStore(str(tmp_path / "store")).materialize(pre, lags=(1, 2))
+    assert again["version"] == first["version"]
+    assert again["created_at"] == first["created_at"]
+
+
+def test_config_input_and_code_changes_make_new_versions(tmp_path, monkeypatch):
+    pre = str(tmp_path / "predata.parquet")
+    _write_predata(pre)
+    store = FeatureStore(str(tmp_path / "store"))
+    base = store.materialize(pre, lags=(1, 2))["version"]
+
+    assert store.materialize(pre, lags=(1,))["version"] != base
+
+    _write_predata(pre, bump=1)
+    changed_input = store.materialize(pre, lags=(1, 2))["version"]
+    assert changed_input != base
+
+    monkeypatch.setattr(fs, "_feature_code", lambda: "edited")
+    assert store.materialize(pre, lags=(1, 2))["version"] not in (base, changed_input)
+
+
+def test_least_recently_used_versions_are_evicted(tmp_path):
+    pre = str(tmp_path / "predata.parquet")
+    _write_predata(pre)
+    store = FeatureStore(str(tmp_path / "store"), max_versions=2)
+
+    old = store.materialize(pre, lags=(1,))
+    store.materialize(pre, lags=(2,))
+    store.materialize(pre, lags=(1, 2))
+    assert old["version"] not in store.index["versions"]
+    assert not (tmp_path / "store" / f"features_{old['version']}.parquet").exists()
+    assert len(store.index["versions"]) == 2
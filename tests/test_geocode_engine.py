@@ -0,0 +1,22 @@
+from src.geocode_engine import run_concurrent
+
+
+def _fn(x):
+    if x == 3:
+        raise RuntimeError("boom")
+    return x * 10
+
+
+def test_run_concurrent_keeps_going_after_a_failure():
+    got = {}
+    stats = run_concurrent(range(8), _fn, max_in_flight=3, on_result=got.__setitem__,
+                           on_error=lambda x, e: f"failed:{type(e).__name__}")
+    assert stats["count"] == 8 and stats["errors"] == 1
+    assert got[3] == "failed:RuntimeError"
+    assert {k: v for k, v in got.items() if k != 3} == {x: x * 10 for x in range(8) if x != 3}
+
+
+def test_run_concurrent_skips_failed_items_without_handler():
+    got = {}
+    stats = run_concurrent(range(5), _fn, on_result=got.__setitem__)
+    assert stats["errors"] == 1 and sorted(got) == [0, 1, 2, 4]
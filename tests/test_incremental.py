@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cellkey import CELL_COL, with_cell
+from src.grid import order_predata
+from src.incremental import refresh_features
+from src.make_features import build_features
+
+
+def _predata(seed=0, months=range(1, 9), n_cells=40):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for m in months:
+        for i in rng.choice(n_cells, size=n_cells // 2, replace=False):
+            rows.append((m, f"{100 + i % 8}_{200 + i // 8}", int(rng.integers(1, 6))))
+    return order_predata(with_cell(pd.DataFrame(rows, columns=["month", "grid_id", "count"])))
+
+
+def _refresh_vs_full(old, new, month, **opts):
+    touched = set(old.loc[old["month"] == month, CELL_COL]) | set(new.loc[new["month"] == month, CELL_COL])
+    got = refresh_features(build_features(old, **opts), new, touched, month, **opts)
+    want = build_features(new, **opts).sort_values([CELL_COL, "month"]).reset_index(drop=True)
+    pd.testing.assert_frame_equal(got[want.columns], want, check_dtype=False, atol=1e-5)
+
+
+PRE = _predata()
+# Month 5 rewritten: some grids vanish from it, one appears for the first time
+M5 = PRE[PRE["month"] == 5]
+CHANGED = order_predata(with_cell(pd.concat([
+    PRE[PRE["month"] != 5],
+    M5.iloc[::2].assign(count=lambda d: d["count"] + 2)[["month", "grid_id", "count"]],
+    pd.DataFrame({"month": [5], "grid_id": ["150_250"], "count": [3]}),
+], ignore_index=True)[["month", "grid_id", "count"]]))
+
+OPTS = [
+    {},
+    {"windows": (3,), "ewm_spans": (2,), "since_last": True},
+    {"windows": (3,), "neighbor_rings": (1,)},
+]
+
+
+@pytest.mark.parametrize("rows", ["observed", "all"])
+@pytest.mark.parametrize("opts", OPTS)
+def test_refresh_matches_full_rebuild(rows, opts):
+    opts = dict(opts, rows=rows)
+    _refresh_vs_full(PRE[PRE["month"] <= 7], PRE, 8, **opts)            # append a month
+    _refresh_vs_full(PRE, CHANGED, 5, **opts)                           # rewrite a month, new grid
+    _refresh_vs_full(CHANGED, PRE, 5, **opts)                           # ... and back, grid gone
+    _refresh_vs_full(PRE[PRE["month"] <= 6], PRE[PRE["month"] != 7], 8, **opts)   # skip a month
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.make_features import TARGET_COL, make_lag_features
+from src.panel import CellPanel
+
+
+def _predata(rows):
+    return pd.DataFrame(rows, columns=["month", "grid_id", "count"])
+
+
+EMPTY = pd.DataFrame({
+    "month": pd.Series([], dtype="int64"),
+    "grid_id": pd.Series([], dtype=str),
+    "count": pd.Series([], dtype="int64"),
+})
+
+
+@pytest.mark.parametrize("stat", ["mean", "std", "max", "slope"])
+def test_rolling_empty_panel(stat):
+    panel = CellPanel.from_predata(EMPTY)
+    assert panel.rolling(3, stat).shape == (0, 0)
+
+
+def test_make_lag_features_empty_predata():
+    for rows in ("observed", "all"):
+        out = make_lag_features(EMPTY, rows=rows, windows=(3,), ewm_spans=(3,), since_last=True)
+        assert len(out) == 0
+        assert {"count_t", "count_max3", "count_slope3", "months_since_last"} <= set(out.columns)
+
+
+def test_rolling_matches_pandas():
+    predata = _predata([(1, "0_0", 2), (2, "0_0", 5), (4, "0_0", 1), (2, "1_0", 3), (3, "1_0", 4)])
+    panel = CellPanel.from_predata(predata)
+    wide = pd.DataFrame(panel.values.astype(float))
+    roll = wide.T.rolling(3, min_periods=1)
+    np.testing.assert_allclose(panel.rolling(3, "mean"), roll.mean().T.to_numpy(), rtol=1e-6)
+    np.testing.assert_allclose(panel.rolling(3, "max"), roll.max().T.to_numpy(), rtol=1e-6)
+    np.testing.assert_allclose(panel.rolling(3, "std"), roll.std(ddof=0).T.fillna(0).to_numpy(), rtol=1e-5, atol=1e-6)
+
+
+def test_lag_features_ignore_rows_outside_months():
+    df = _predata([(m, g, m) for m in range(1, 6) for g in ("1_1", "2_2")])
+    narrow = make_lag_features(df, lags=(1,), months=[1, 2, 3])
+    assert sorted(narrow["month"].unique()) == [2, 3]
+
+    full = make_lag_features(df, lags=(1,))
+    expect = full[full["month"] <= 3].drop(columns=TARGET_COL).reset_index(drop=True)
+    pd.testing.assert_frame_equal(narrow.drop(columns=TARGET_COL).reset_index(drop=True), expect)
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from src.geocode_cache import SqliteCacheStore
+from src.grid import make_predata_and_meta_csv
+from src.pipeline_geo import geo
+from src.preprocess import clean_address_series
+from src.storage import read_table
+from src.stream_grid import stream_predata_and_meta
+
+
+def _write_inputs(tmp_path, months=(1, 2, 3)):
+    rng = np.random.default_rng(0)
+    addrs = [f"서울특별시 중구 명동{i % 3 + 1}가 {i + 1}" for i in range(60)]
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    for m in months:
+        picked = rng.choice(addrs, size=300)
+        pd.DataFrame({"주소": picked}).to_csv(raw / f"{m}.csv", index=False)
+
+    # Cached coordinates: most inside Seoul, one outside the boundary, a few missing
+    keys = clean_address_series(pd.Series(addrs))
+    lat = 37.50 + rng.random(len(addrs)) * 0.1
+    lon = 126.95 + rng.random(len(addrs)) * 0.1
+    lat[0], lon[0] = 35.10, 129.04
+    cache = pd.DataFrame({"주소_clean": keys, "lat": lat, "lon": lon, "status": "ok", "attempts": 1,
+                          "updated_at": "2025-01-01T00:00:00Z", "confidence": 1.0, "source": "jibun"}).iloc[:-5]
+    store = SqliteCacheStore(str(tmp_path / "cache.sqlite"))
+    store.upsert(cache)
+    store.close()
+    return str(raw), str(tmp_path / "cache.sqlite")
+
+
+def test_streaming_matches_materialized(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    raw, cache = _write_inputs(tmp_path)
+    months = (1, 2, 3)
+
+    geo(raw, months, out_path="after.parquet", cache_path=cache, offline=True, local_resolver=False)
+    make_predata_and_meta_csv("after.parquet", "a_pre.parquet", "a_meta.parquet")
+    stream_predata_and_meta(raw, months, cache, "b_pre.parquet", "b_meta.parquet", chunksize=97)
+
+    for a, b, schema in (("a_pre.parquet", "b_pre.parquet", "predata"), ("a_meta.parquet", "b_meta.parquet", "grid_meta")):
+        want = read_table(a, schema=schema)
+        got = read_table(b, schema=schema)
+        assert len(want) > 0
+        pd.testing.assert_frame_equal(got[want.columns].reset_index(drop=True), want.reset_index(drop=True),
+                                      check_dtype=False)